@@ -10,6 +10,9 @@ import shutil
 import subprocess
 from pathlib import Path
 
+# @pytest.mark.data_file(...) + data_row fixture for data-driven tests
+pytest_plugins = ["framework.init.data_driven"]
+
 # @pytest_wrapper.hookimpl(hookwrapper=True)
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_makereport(item, call):
@@ -19,24 +22,43 @@ def pytest_runtest_makereport(item, call):
     if report.when == "call" and report.failed:
         driver = item.funcargs.get("driver")
         if driver:
+            from framework.mobile.artifacts import get_artifact_pipeline
+
             # ✅ Create test name and timestamp
             test_name = item.name  # like test_verify_login_functionality
             timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
             screenshot_filename = f"{test_name}_{timestamp}.png"
 
-            # ✅ Save screenshot
-            screenshot = driver.get_screenshot_as_png()
-            
-            # ✅ Attach to Allure
-            allure.attach(
-                screenshot,
-                name=screenshot_filename,
-                attachment_type=allure.attachment_type.PNG
-            )
+            # ✅ Take screenshot; decoding and the Allure attachment are written in the background
+            get_artifact_pipeline().attach_screenshot(driver, screenshot_filename)
+
+    if report.when == "call":
+        # Waterfall of the WebDriver commands sent during setup and the test body
+        command_executor = sys.modules.get("framework.init.command_executor")
+        if command_executor is not None:
+            from framework.readers.jsonReader import get_config_reader
+            if get_config_reader().command_timeline["attach_to_allure"]:
+                command_executor.get_command_timeline().attach_to_allure()
+
+def pytest_runtest_setup(item):
+    # Each test's command timeline starts empty
+    command_executor = sys.modules.get("framework.init.command_executor")
+    if command_executor is not None:
+        command_executor.get_command_timeline().start(item.name)
+
+def pytest_runtest_teardown(item, nextitem):
+    # Excel writes are buffered per test and saved in one pass here
+    file_reader = sys.modules.get("framework.readers.fileReader")
+    if file_reader is not None:
+        file_reader.FileReader.flush_writes()
 
 SCREENSHOT_DIR = "screenshots"
 RESULTS_DIR = "results"
 def pytest_sessionstart(session):
+    # Farm workers share these folders; the farm runner clears them once before starting
+    if os.environ.get("FARM_DEVICE"):
+        os.makedirs(SCREENSHOT_DIR, exist_ok=True)
+        return
     if os.path.exists(SCREENSHOT_DIR):
         shutil.rmtree(SCREENSHOT_DIR)
         print(f"🧹 Cleared existing screenshots in '{SCREENSHOT_DIR}'")
@@ -46,6 +68,22 @@ def pytest_sessionstart(session):
     os.makedirs(SCREENSHOT_DIR, exist_ok=True)
     os.makedirs(RESULTS_DIR, exist_ok=True)
 
+def pytest_sessionfinish(session, exitstatus):
+    # Wait for screenshots, recordings and logs still being written
+    artifacts = sys.modules.get("framework.mobile.artifacts")
+    if artifacts is not None:
+        artifacts.shutdown_artifact_pipeline()
+    # Only touch the driver layer if a test actually imported it
+    base = sys.modules.get("framework.init.base")
+    if base is not None:
+        base.shutdown_driver_services()
+    # Locator timings for `python -m framework.mobile.profiler`
+    profiler = sys.modules.get("framework.mobile.profiler")
+    if profiler is not None:
+        stats_path = profiler.dump_stats()
+        if stats_path:
+            print(f"⏱️ Locator timings written to '{stats_path}'")
+
 def pytest_cmdline_main(config):
     """
     This hook is called *instead* of pytest's normal main entry
@@ -1,36 +1,206 @@
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
 import cv2
+import numpy as np
 import pytesseract
 
-# Load the image
+# Point TESSERACT_CMD at tesseract.exe when it is not on PATH (e.g. C:\Program Files\Tesseract-OCR\tesseract.exe)
+if os.environ.get("TESSERACT_CMD"):
+    pytesseract.pytesseract.tesseract_cmd = os.environ["TESSERACT_CMD"]
 
-pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
-def test_cv():
-    image_path = "C:\\Users\\UNITY_105\\PycharmProjects\\PythonProject1\\images\\Actual_image\\full_screenshot.png"  # Change this to your image path
-    image = cv2.imread(image_path)
+# oem 3: default engine, psm 11: sparse text, which suits game and canvas screens
+TESSERACT_CONFIG = "--oem 3 --psm 11"
+# Words below this confidence (0-100) are ignored
+MIN_CONFIDENCE = 40
+# Regions shorter than this (in pixels) are upscaled before OCR; small UI text reads much better
+MIN_OCR_HEIGHT = 600
+# OCR results kept per process, keyed by screenshot hash and region
+CACHE_SIZE = 64
 
-    # Convert to grayscale (improves OCR accuracy)
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
 
-    # Use Tesseract OCR with bounding box data
-    custom_config = r'--oem 3 --psm 6'  # Use page segmentation mode 6 (Assumes a uniform block of text)
-    data = pytesseract.image_to_data(gray, config=custom_config, output_type=pytesseract.Output.DICT)
+class TextMatch(NamedTuple):
+    """Text found on screen; coordinates are device (tap) coordinates"""
+    text: str
+    x: int
+    y: int
+    width: int
+    height: int
+    confidence: float
 
-    # Extract word-level information
-    found = False
-    for i in range(len(data["text"])):
-        word = data["text"][i].strip()
-        if word.upper() == "POKER":  # Check for "POKER"
-            x, y, w, h = data["left"][i], data["top"][i], data["width"][i], data["height"][i]
-            print(f"✅ 'POKER' found at coordinates: (x={x}, y={y}, width={w}, height={h})")
-            found = True
+    @property
+    def center(self):
+        return self.x + self.width // 2, self.y + self.height // 2
 
-            # Draw a bounding box around the detected text
-            cv2.rectangle(image, (x, y), (x + w, y + h), (0, 255, 0), 2)
 
-    if not found:
-        print("❌ 'POKER' not found in the image.")
+class _Word(NamedTuple):
+    text: str
+    left: int
+    top: int
+    width: int
+    height: int
+    confidence: float
+    line: tuple
 
-    # Save the output image with bounding boxes
-    output_path = "output_with_poker_box.png"
-    cv2.imwrite(output_path, image)
-    print(f"🔍 Result saved as: {output_path}")
+
+_ocr_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def preprocess(image):
+    """
+    Greyscale, upscale small regions, binarize with Otsu and make the text dark on light,
+    all as whole-array OpenCV operations. Returns (binary image, scale factor applied).
+    """
+    gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    scale = 1.0
+    if gray.shape[0] < MIN_OCR_HEIGHT:
+        scale = min(3.0, MIN_OCR_HEIGHT / max(gray.shape[0], 1))
+        gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    # Tesseract expects dark text; light-on-dark UIs (most game screens) are inverted
+    if np.count_nonzero(binary) < binary.size / 2:
+        binary = cv2.bitwise_not(binary)
+    return binary, scale
+
+
+def _ocr_region(image, region, screenshot_hash, config):
+    """Words of one region in screenshot pixels, served from the cache when the screen was seen before"""
+    key = (screenshot_hash, region, config)
+    with _cache_lock:
+        cached = _ocr_cache.get(key)
+        if cached is not None:
+            _ocr_cache.move_to_end(key)
+            return cached
+
+    x, y, width, height = region
+    binary, scale = preprocess(image[y:y + height, x:x + width])
+    data = pytesseract.image_to_data(binary, config=config, output_type=pytesseract.Output.DICT)
+
+    words = []
+    for i, text in enumerate(data["text"]):
+        text = text.strip()
+        if not text or float(data["conf"][i]) < MIN_CONFIDENCE:
+            continue
+        words.append(_Word(
+            text=text,
+            left=x + int(data["left"][i] / scale),
+            top=y + int(data["top"][i] / scale),
+            width=int(data["width"][i] / scale),
+            height=int(data["height"][i] / scale),
+            confidence=float(data["conf"][i]),
+            line=(data["block_num"][i], data["par_num"][i], data["line_num"][i]),
+        ))
+
+    with _cache_lock:
+        _ocr_cache[key] = words
+        while len(_ocr_cache) > CACHE_SIZE:
+            _ocr_cache.popitem(last=False)
+    return words
+
+
+def _normalize(text):
+    return re.sub(r"[^\w]", "", text).lower()
+
+
+def _match_words(words, text, exact):
+    """Finds text (one or more words) among consecutive OCR words of the same line"""
+    wanted = [_normalize(part) for part in text.split() if _normalize(part)]
+    if not wanted:
+        return []
+    lines = OrderedDict()
+    for word in words:
+        lines.setdefault(word.line, []).append(word)
+
+    matches = []
+    for line_words in lines.values():
+        tokens = [_normalize(word.text) for word in line_words]
+        for start in range(len(tokens) - len(wanted) + 1):
+            window = tokens[start:start + len(wanted)]
+            if exact:
+                found = window == wanted
+            else:
+                # Partial first/last word, whole words in between ("POKER" matches "POKER!")
+                found = (len(wanted) == 1 and wanted[0] in window[0]) or (
+                    len(wanted) > 1 and window[0].endswith(wanted[0]) and window[-1].startswith(wanted[-1])
+                    and window[1:-1] == wanted[1:-1])
+            if found:
+                matched = line_words[start:start + len(wanted)]
+                left = min(word.left for word in matched)
+                top = min(word.top for word in matched)
+                right = max(word.left + word.width for word in matched)
+                bottom = max(word.top + word.height for word in matched)
+                matches.append((" ".join(word.text for word in matched), left, top, right - left, bottom - top,
+                                sum(word.confidence for word in matched) / len(matched)))
+    return matches
+
+
+def find_text_in_image(screenshot_png, text, regions=None, exact=False, scale=1.0, config=TESSERACT_CONFIG):
+    """
+    Finds text in PNG screenshot bytes.
+
+    Args:
+        screenshot_png (bytes): The screenshot
+        text (str): Word or phrase to look for (case and punctuation are ignored)
+        regions (list, optional): (x, y, width, height) rectangles, in device coordinates, to OCR
+            instead of the whole screen
+        exact (bool): Require whole-word matches
+        scale (float): Screenshot pixels per device coordinate (2.0 or 3.0 on retina iOS screens)
+
+    Returns:
+        list[TextMatch]: Matches in device coordinates, most confident first
+    """
+    screenshot_hash = hashlib.sha1(screenshot_png).hexdigest()
+    image = cv2.imdecode(np.frombuffer(screenshot_png, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError("Screenshot could not be decoded")
+    height, width = image.shape[:2]
+
+    pixel_regions = []
+    for x, y, w, h in regions or [(0, 0, width / scale, height / scale)]:
+        left, top = max(0, int(x * scale)), max(0, int(y * scale))
+        right, bottom = min(width, int((x + w) * scale)), min(height, int((y + h) * scale))
+        if right > left and bottom > top:
+            pixel_regions.append((left, top, right - left, bottom - top))
+
+    matches = []
+    for region in pixel_regions:
+        words = _ocr_region(image, region, screenshot_hash, config)
+        for found, left, top, w, h, confidence in _match_words(words, text, exact):
+            matches.append(TextMatch(found, int(left / scale), int(top / scale), int(w / scale), int(h / scale),
+                                     confidence))
+    return sorted(matches, key=lambda match: match.confidence, reverse=True)
+
+
+def screen_scale(driver, screenshot_png):
+    """Screenshot pixels per device coordinate; the window size is asked once per session"""
+    window_side = getattr(driver, "_ocr_window_side", None)
+    if window_side is None:
+        size = driver.get_window_size()
+        window_side = min(size["width"], size["height"])
+        try:
+            driver._ocr_window_side = window_side
+        except AttributeError:
+            pass
+    # PNG IHDR width and height; the shorter sides keep their ratio when the screen rotates
+    image_side = min(int.from_bytes(screenshot_png[16:20], "big"), int.from_bytes(screenshot_png[20:24], "big"))
+    return image_side / window_side if window_side else 1.0
+
+
+def find_text_on_screen(driver, text, regions=None, exact=False):
+    """
+    Takes a screenshot and finds text on it with OCR; for canvas, game and Unity screens
+    that expose no accessibility tree.
+
+    Usage:
+        match = find_text_on_screen(driver, "POKER", regions=[(0, 800, 1080, 600)])[0]
+        x, y = match.center
+
+    Returns:
+        list[TextMatch]: Matches in device coordinates, most confident first
+    """
+    screenshot_png = driver.get_screenshot_as_png()
+    return find_text_in_image(screenshot_png, text, regions, exact, scale=screen_scale(driver, screenshot_png))
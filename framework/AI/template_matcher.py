@@ -0,0 +1,183 @@
+import threading
+from pathlib import Path
+from typing import NamedTuple
+import cv2
+import numpy as np
+
+# Default confidence for a match (Airtest's Template default)
+THRESHOLD = 0.7
+# Half-size of the record_pos search window, as a fraction of the screen width, added around the template
+SEARCH_MARGIN = 0.12
+# The coarse pass runs at this scale when the template stays at least MIN_COARSE_SIDE pixels wide
+COARSE_SCALE = 0.5
+MIN_COARSE_SIDE = 24
+
+
+class TemplateSpec(NamedTuple):
+    """
+    An image template, described like Airtest's Template.
+
+    record_pos is the template centre relative to the screen centre, divided by the
+    screen width (Airtest's convention); resolution is the screen it was captured on.
+    """
+    path: str
+    record_pos: tuple = None
+    resolution: tuple = None
+    threshold: float = THRESHOLD
+
+
+class TemplateMatch(NamedTuple):
+    x: int
+    y: int
+    width: int
+    height: int
+    confidence: float
+
+    @property
+    def center(self):
+        return self.x + self.width // 2, self.y + self.height // 2
+
+
+def to_gray(image):
+    if isinstance(image, (bytes, bytearray)):
+        image = cv2.imdecode(np.frombuffer(image, dtype=np.uint8), cv2.IMREAD_COLOR)
+    return image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+
+def _best_match(screen, template):
+    if screen.shape[0] < template.shape[0] or screen.shape[1] < template.shape[1]:
+        return -1.0, (0, 0)
+    result = cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED)
+    _, confidence, _, location = cv2.minMaxLoc(result)
+    return confidence, location
+
+
+class TemplateMatcher:
+    """
+    Finds many image templates in one screenshot.
+
+    Templates are loaded once and scaled once per screen resolution. Each search
+    starts in the window around record_pos and widens to the whole screen only
+    when the template is not found there; both use a coarse pass at half
+    resolution followed by a full-resolution refinement around the coarse hit.
+
+    Usage:
+        matcher = TemplateMatcher({"google": TemplateSpec("tpl_google.png", (0.03, 0.65), (1080, 2400))})
+        matches = matcher.find_all(screenshot)          # every template, one screenshot
+        touch(matches["google"].center)
+    """
+
+    def __init__(self, templates, base_dir="."):
+        self.base_dir = Path(base_dir)
+        self.templates = dict(templates)
+        self._originals = {}
+        self._scaled = {}
+        self._lock = threading.Lock()
+
+    def _original(self, name):
+        image = self._originals.get(name)
+        if image is None:
+            path = self.base_dir / self.templates[name].path
+            image = cv2.imread(str(path), cv2.IMREAD_GRAYSCALE)
+            if image is None:
+                raise FileNotFoundError(f"Template image not found: {path}")
+            self._originals[name] = image
+        return image
+
+    def _prepared(self, name, screen_size):
+        """(full-size template, coarse template or None) scaled for screen_size"""
+        key = (name, screen_size)
+        with self._lock:
+            prepared = self._scaled.get(key)
+            if prepared is not None:
+                return prepared
+            template = self._original(name)
+            resolution = self.templates[name].resolution
+            if resolution and resolution[0] != screen_size[0]:
+                scale = screen_size[0] / resolution[0]
+                interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR
+                template = cv2.resize(template, None, fx=scale, fy=scale, interpolation=interpolation)
+            coarse = None
+            if min(template.shape[:2]) * COARSE_SCALE >= MIN_COARSE_SIDE:
+                coarse = cv2.resize(template, None, fx=COARSE_SCALE, fy=COARSE_SCALE, interpolation=cv2.INTER_AREA)
+            prepared = self._scaled[key] = (template, coarse)
+            return prepared
+
+    def _window(self, name, template, screen_size):
+        """Search window (x, y, width, height) around record_pos, or None when there is no hint"""
+        record_pos = self.templates[name].record_pos
+        if not record_pos:
+            return None
+        width, height = screen_size
+        center_x = width / 2 + record_pos[0] * width
+        center_y = height / 2 + record_pos[1] * width
+        margin = SEARCH_MARGIN * width
+        left = int(max(0, center_x - template.shape[1] / 2 - margin))
+        top = int(max(0, center_y - template.shape[0] / 2 - margin))
+        right = int(min(width, center_x + template.shape[1] / 2 + margin))
+        bottom = int(min(height, center_y + template.shape[0] / 2 + margin))
+        if right - left < template.shape[1] or bottom - top < template.shape[0]:
+            return None
+        return left, top, right - left, bottom - top
+
+    @staticmethod
+    def _search(screen, coarse_screen, template, coarse, region, threshold, exhaustive=False):
+        """
+        Coarse-to-fine search inside region; returns (confidence, (x, y)) in screen pixels.
+        With exhaustive, a full-resolution pass over region follows a failed coarse hit.
+        """
+        x, y, width, height = region
+        if coarse is None or coarse_screen is None:
+            confidence, (left, top) = _best_match(screen[y:y + height, x:x + width], template)
+            return confidence, (x + left, y + top)
+
+        cx, cy = int(x * COARSE_SCALE), int(y * COARSE_SCALE)
+        cw, ch = int(width * COARSE_SCALE), int(height * COARSE_SCALE)
+        _, (left, top) = _best_match(coarse_screen[cy:cy + ch, cx:cx + cw], coarse)
+        # Refine at full resolution in a small neighbourhood of the coarse hit
+        pad = int(2 / COARSE_SCALE) + 2
+        fine_x = max(0, x + int(left / COARSE_SCALE) - pad)
+        fine_y = max(0, y + int(top / COARSE_SCALE) - pad)
+        fine = screen[fine_y:fine_y + template.shape[0] + 2 * pad, fine_x:fine_x + template.shape[1] + 2 * pad]
+        confidence, (left, top) = _best_match(fine, template)
+        if confidence < threshold and exhaustive:
+            return TemplateMatcher._search(screen, None, template, None, region, threshold)
+        return confidence, (fine_x + left, fine_y + top)
+
+    def find_all(self, screenshot, names=None):
+        """
+        Searches one screenshot for several templates.
+
+        Args:
+            screenshot (np.ndarray | bytes): BGR/greyscale image (e.g. G.DEVICE.snapshot()) or PNG bytes
+            names (list, optional): Templates to look for (default: all)
+
+        Returns:
+            dict: Template name to TemplateMatch, or None when it is not on screen
+        """
+        screen = to_gray(screenshot)
+        screen_size = (screen.shape[1], screen.shape[0])
+        coarse_screen = None
+        results = {}
+        for name in names or self.templates:
+            template, coarse = self._prepared(name, screen_size)
+            if coarse is not None and coarse_screen is None:
+                coarse_screen = cv2.resize(screen, None, fx=COARSE_SCALE, fy=COARSE_SCALE,
+                                           interpolation=cv2.INTER_AREA)
+            threshold = self.templates[name].threshold
+            # The record_pos window is small enough to finish with a full-resolution pass
+            window = self._window(name, template, screen_size)
+            regions = [(window, True), ((0, 0, screen_size[0], screen_size[1]), False)]
+            results[name] = None
+            for region, exhaustive in regions:
+                if region is None:
+                    continue
+                confidence, (x, y) = self._search(screen, coarse_screen, template, coarse, region,
+                                                  threshold, exhaustive)
+                if confidence >= threshold:
+                    results[name] = TemplateMatch(x, y, template.shape[1], template.shape[0], confidence)
+                    break
+        return results
+
+    def find(self, screenshot, name):
+        return self.find_all(screenshot, [name])[name]
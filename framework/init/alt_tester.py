@@ -0,0 +1,119 @@
+import atexit
+import time
+from colorama import Fore
+from framework.mobile.prints import text_print
+
+# Back-off between connection attempts (seconds)
+FIRST_RETRY_DELAY = 0.5
+MAX_RETRY_DELAY = 5
+# Each AltDriver() attempt gives up after this long, so the overall deadline is honoured
+ATTEMPT_TIMEOUT = 5
+
+NATIVE = "native"
+UNITY = "unity"
+
+
+class AltTesterConnection:
+    """
+    The AltTester (Unity) connection of one test session.
+
+    The AltDriver is created once and reused. use_unity() and use_native() switch the
+    adb reverse port forwarding between the Unity instrumentation and native Appium
+    access; switching to the mode that is already active does nothing, and switching
+    to Unity returns as soon as the game answers instead of after a fixed pause.
+    """
+
+    def __init__(self, host="127.0.0.1", port=13000, app_name="__default__", device_id="", platform="android"):
+        self.host = host
+        self.port = port
+        self.app_name = app_name
+        self.device_id = device_id
+        self.platform = platform.lower()
+        self.driver = None
+        self.mode = None
+
+    def is_healthy(self):
+        """True when the game answers a cheap command on the current connection"""
+        if self.driver is None:
+            return False
+        try:
+            self.driver.get_current_scene()
+            return True
+        except Exception:
+            return False
+
+    def connect(self, timeout=60):
+        """Returns a healthy AltDriver, reconnecting with exponential back-off until timeout"""
+        if self.is_healthy():
+            return self.driver
+        self.close()
+
+        from alttester import AltDriver
+        deadline = time.monotonic() + timeout
+        delay = FIRST_RETRY_DELAY
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                remaining = max(1, int(deadline - time.monotonic()))
+                self.driver = AltDriver(host=self.host, port=self.port, app_name=self.app_name,
+                                        timeout=min(ATTEMPT_TIMEOUT, remaining))
+                text_print(f"AltTester connected on {self.host}:{self.port} (attempt {attempt})", 'green')
+                return self.driver
+            except Exception as e:
+                self.driver = None
+                if time.monotonic() + delay >= deadline:
+                    raise ConnectionError(f"AltTester not reachable on {self.host}:{self.port} "
+                                          f"after {timeout} seconds: {e}")
+                time.sleep(delay)
+                delay = min(delay * 2, MAX_RETRY_DELAY)
+
+    def use_unity(self, timeout=60):
+        """Routes the AltTester port to the game and returns a ready AltDriver"""
+        if self.mode == UNITY and self.is_healthy():
+            return self.driver
+        if self.platform == "android" and self.mode != UNITY:
+            from alttester import AltReversePortForwarding
+            AltReversePortForwarding.reverse_port_forwarding_android(self.port, self.port, device_Id=self.device_id)
+            print("Port Reversed to unity element")
+        self.mode = UNITY
+        return self.connect(timeout)
+
+    def use_native(self):
+        """Releases the AltTester port so native (Appium) access is unobstructed"""
+        if self.mode == NATIVE:
+            return
+        # The connection cannot survive losing its tunnel; it is re-established by use_unity()
+        self.close()
+        if self.platform == "android":
+            from alttester import AltReversePortForwarding
+            AltReversePortForwarding.remove_reverse_port_forwarding_android(self.port, device_Id=self.device_id)
+            print("Port forwarded to native element")
+        self.mode = NATIVE
+
+    def close(self):
+        if self.driver is not None:
+            try:
+                self.driver.stop()
+            except Exception as e:
+                print(Fore.RED + f"Error stopping AltTester driver: {e}")
+            self.driver = None
+
+
+# One connection per test process; created on first use
+_alt_tester_connection = None
+
+
+def get_alt_tester_connection(host="127.0.0.1", port=13000, app_name="__default__", device_id="", platform="android"):
+    global _alt_tester_connection
+    if _alt_tester_connection is None:
+        _alt_tester_connection = AltTesterConnection(host, port, app_name, device_id, platform)
+        atexit.register(shutdown_alt_tester_connection)
+    return _alt_tester_connection
+
+
+def shutdown_alt_tester_connection():
+    global _alt_tester_connection
+    if _alt_tester_connection is not None:
+        _alt_tester_connection.close()
+        _alt_tester_connection = None
@@ -0,0 +1,133 @@
+import atexit
+import json
+import os
+import socket
+import subprocess
+import time
+import urllib.request
+from pathlib import Path
+from colorama import Fore
+from appium.webdriver.appium_service import AppiumService
+from framework.mobile.prints import text_print
+
+# Appium server logs, one file per pytest worker
+LOG_DIR = Path("appium_logs")
+
+
+def find_free_port(host="127.0.0.1"):
+    """Asks the OS for a free TCP port on host"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+def worker_id():
+    """The pytest-xdist worker id ('gw0', 'gw1', ...) or 'main' when not running under xdist"""
+    return os.environ.get("PYTEST_XDIST_WORKER", "main")
+
+
+class AppiumServerManager:
+    """
+    Owns the local Appium server of one pytest worker.
+
+    The server is started once, on a free port (or APPIUM_PORT when set), and is
+    considered ready only when GET /status answers. All drivers created by the
+    worker share it; stop() is called at session end.
+    """
+
+    def __init__(self, host="127.0.0.1", port=None, startup_timeout=60):
+        self.host = host
+        self.port = port
+        self.startup_timeout = startup_timeout
+        self.service = None
+        self._log_file = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def is_running(self):
+        return self.service is not None and self.service.is_running and self.is_ready()
+
+    def start(self):
+        """Starts the server unless it is already up; returns the server URL"""
+        if self.is_running():
+            return self.url
+
+        self.stop()
+        if not self.port:
+            env_port = os.environ.get("APPIUM_PORT")
+            self.port = int(env_port) if env_port else find_free_port(self.host)
+
+        LOG_DIR.mkdir(exist_ok=True)
+        log_path = LOG_DIR / f"appium_{worker_id()}_{self.port}.log"
+        # A file rather than a pipe: nobody drains the pipe, and a full pipe stalls a long-lived server
+        self._log_file = open(log_path, "w", encoding="utf-8")
+
+        print(Fore.GREEN + f"Starting Appium server for worker '{worker_id()}' on port {self.port}...")
+        self.service = AppiumService()
+        self.service.start(
+            args=["--address", self.host, "--port", str(self.port)],
+            stdout=self._log_file,
+            stderr=subprocess.STDOUT,
+            timeout_ms=0,
+        )
+        self.wait_until_ready()
+        text_print(f"Appium server ready at {self.url} (log: {log_path})", "green")
+        return self.url
+
+    def is_ready(self):
+        """True when the server answers /status with ready=true"""
+        try:
+            with urllib.request.urlopen(f"{self.url}/status", timeout=2) as response:
+                payload = json.loads(response.read().decode("utf-8") or "{}")
+            return bool(payload.get("value", {}).get("ready", True))
+        except Exception:
+            return False
+
+    def wait_until_ready(self):
+        deadline = time.monotonic() + self.startup_timeout
+        delay = 0.1
+        while time.monotonic() < deadline:
+            if self.is_ready():
+                return
+            if self.service and not self.service.is_running:
+                self.stop()
+                raise RuntimeError(f"Appium server exited during startup, see {LOG_DIR}")
+            time.sleep(delay)
+            delay = min(delay * 2, 1.0)
+        self.stop()
+        raise TimeoutError(f"Appium server did not answer {self.url}/status within {self.startup_timeout} seconds")
+
+    def stop(self):
+        """Stops the server process; safe to call more than once"""
+        if self.service is not None:
+            try:
+                if self.service.is_running:
+                    print(Fore.GREEN + f"Stopping Appium server on port {self.port}...")
+                self.service.stop()
+            except Exception as e:
+                print(Fore.RED + f"Error stopping Appium server: {e}")
+            self.service = None
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+
+
+# One server per worker process; created on first use
+_appium_server = None
+
+
+def get_appium_server():
+    global _appium_server
+    if _appium_server is None:
+        _appium_server = AppiumServerManager()
+        atexit.register(shutdown_appium_server)
+    return _appium_server
+
+
+def shutdown_appium_server():
+    global _appium_server
+    if _appium_server is not None:
+        _appium_server.stop()
+        _appium_server = None
@@ -0,0 +1,146 @@
+import gzip
+import json
+import os
+import re
+import threading
+from collections import defaultdict, deque
+from pathlib import Path
+from selenium.webdriver.remote.client_config import ClientConfig
+from framework.init.command_executor import InstrumentedConnection, PooledConnection, session_path
+
+# Environment overrides for the cassette settings in TestConfig.json
+CASSETTE_MODE_ENV = "CASSETTE_MODE"
+CASSETTE_DIR_ENV = "CASSETTE_DIR"
+
+OFF = "off"
+RECORD = "record"
+REPLAY = "replay"
+
+
+class CassetteMismatch(Exception):
+    """Raised on replay when the code under test sends a request the cassette never saw"""
+
+
+def cassette_name(default="session"):
+    """
+    File name for the session being created: the running test (PYTEST_CURRENT_TEST)
+    or default, so recording and replay of the same test find the same cassette.
+    """
+    current = os.environ.get("PYTEST_CURRENT_TEST", "")
+    node_id = current.rsplit(" (", 1)[0] if current else default
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", node_id).strip("_") + ".jsonl.gz"
+
+
+def _request_key(method, url, body):
+    """What identifies a request across runs: method, path below the session and JSON body"""
+    path = session_path(url)
+    if path == "session":
+        # A new session is the same session whatever capabilities were asked for
+        return f"{method} session"
+    if body:
+        try:
+            body = json.dumps(json.loads(body), sort_keys=True)
+        except ValueError:
+            pass
+    return f"{method} {path} {body or ''}"
+
+
+class Cassette:
+    """
+    The HTTP exchanges of one driver session, one JSON line per request (gzip).
+
+    Replay serves responses per request key in the order they were recorded: the
+    third "find next_button" gets the third recorded answer, whatever other requests
+    came in between. When a key's answers run out the last one is repeated, so an
+    extra poll still sees the final state.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = None
+        self._lock = threading.Lock()
+        self._responses = None
+
+    def record(self, method, url, body, response):
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = gzip.open(self.path, "wt", encoding="utf-8", compresslevel=1)
+            self._file.write(json.dumps({"key": _request_key(method, url, body), "response": response}) + "\n")
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _load(self):
+        if not self.path.exists():
+            raise FileNotFoundError(f"No cassette recorded for this session: {self.path}")
+        responses = defaultdict(deque)
+        with gzip.open(self.path, "rt", encoding="utf-8") as file:
+            for line in file:
+                entry = json.loads(line)
+                responses[entry["key"]].append(entry["response"])
+        return responses
+
+    def response(self, method, url, body):
+        """The recorded response to a request"""
+        with self._lock:
+            if self._responses is None:
+                self._responses = self._load()
+            key = _request_key(method, url, body)
+            answers = self._responses.get(key)
+            if not answers:
+                raise CassetteMismatch(f"Request not in cassette {self.path.name}: {key[:200]}")
+            return answers.popleft() if len(answers) > 1 else answers[0]
+
+
+class RecordingConnection(PooledConnection):
+    """PooledConnection that also writes every request and its response to a Cassette"""
+
+    cassette = None
+
+    def _request(self, method, url, body=None):
+        response = super()._request(method, url, body=body)
+        if self.cassette is not None:
+            self.cassette.record(method, url, body, response)
+        return response
+
+    def reconnect(self, client_config):
+        connection = super().reconnect(client_config)
+        connection.cassette = self.cassette
+        return connection
+
+    def close(self):
+        super().close()
+        if self.cassette is not None:
+            self.cassette.close()
+
+
+class ReplayConnection(InstrumentedConnection):
+    """
+    Command executor that answers from a Cassette instead of a server: no device,
+    no network, and each command returns as fast as it can be looked up.
+    Commands still land in the CommandTimeline, so replays can be profiled.
+    """
+
+    def __init__(self, cassette):
+        super().__init__(client_config=ClientConfig(remote_server_addr="http://replay.invalid", keep_alive=False))
+        self.cassette = cassette
+
+    def _request(self, method, url, body=None):
+        self._note_request(method, url, body)
+        return self.cassette.response(method, url, body)
+
+    def reconnect(self, client_config):
+        return self
+
+
+def get_cassette_settings(config_reader):
+    """The cassette mode (off, record or replay) and folder, with CASSETTE_MODE/CASSETTE_DIR taking precedence"""
+    settings = config_reader.cassette
+    mode = (os.environ.get(CASSETTE_MODE_ENV) or settings["mode"]).lower()
+    if mode not in (OFF, RECORD, REPLAY):
+        raise ValueError(f"Unsupported cassette mode: '{mode}'. Use '{OFF}', '{RECORD}' or '{REPLAY}'")
+    return {"mode": mode, "dir": os.environ.get(CASSETTE_DIR_ENV) or settings["dir"]}
@@ -0,0 +1,401 @@
+import html
+import json
+import threading
+import socket
+import time
+import weakref
+from typing import NamedTuple
+import urllib3
+from urllib3.connection import HTTPConnection
+from appium.webdriver.appium_connection import AppiumConnection
+from selenium.webdriver.remote.client_config import ClientConfig
+
+# Commands slower than this are highlighted in the waterfall (seconds)
+SLOW_COMMAND = 1.0
+
+
+class CommandRecord(NamedTuple):
+    """One WebDriver command as seen on the wire"""
+    command: str
+    method: str
+    path: str
+    detail: str
+    start: float
+    duration: float
+    request_bytes: int
+    response_bytes: int
+    status: str
+
+
+def _detail(command, params):
+    """The part of the payload that tells commands apart: the locator, script or keys"""
+    if not isinstance(params, dict):
+        return ""
+    if "using" in params and "value" in params:
+        return f"{params['using']}={params['value']}"
+    if "script" in params:
+        return str(params["script"])[:80]
+    if command == "actions":
+        sources = params.get("actions") or []
+        return f"{sum(len(source.get('actions', [])) for source in sources)} actions"
+    return ""
+
+
+def _status(response):
+    """'ok', or the W3C error name / HTTP status of a failed command"""
+    if not isinstance(response, dict):
+        return "ok"
+    value = response.get("value")
+    if isinstance(value, dict) and value.get("error"):
+        return str(value["error"])
+    status = response.get("status")
+    if isinstance(status, int) and status >= 400:
+        # Selenium hands error bodies back unparsed
+        try:
+            return str(json.loads(value)["value"]["error"])
+        except (TypeError, ValueError, KeyError):
+            return str(status)
+    return "ok"
+
+
+def session_path(url):
+    """Path below the session id ("element", "execute/sync"); "session" for the session itself"""
+    path = url.split("/session/", 1)[-1] if "/session/" in url else "session"
+    return path.split("/", 1)[1] if "/" in path else "session"
+
+
+def _response_size(response):
+    value = response.get("value") if isinstance(response, dict) else response
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return len(value)
+    try:
+        return len(json.dumps(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+class CommandTimeline:
+    """
+    Every WebDriver command of the current test, in the order it was sent.
+
+    start() begins a new test; records() and breakdown() tell how much of the test
+    was spent waiting on Appium and how much elsewhere (Python, sleeps, polling gaps).
+
+    Usage:
+        timeline = get_command_timeline()
+        for record in timeline.slowest(5):
+            print(record.command, record.detail, record.duration)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._records = []
+        self.test_name = None
+        self.started = time.monotonic()
+
+    def start(self, test_name=None):
+        with self._lock:
+            self._records = []
+            self.test_name = test_name
+            self.started = time.monotonic()
+
+    def add(self, command, method, path, detail, start, duration, request_bytes, response_bytes, status):
+        record = CommandRecord(command, method, path, detail, start - self.started, duration,
+                               request_bytes, response_bytes, status)
+        with self._lock:
+            self._records.append(record)
+        return record
+
+    def records(self):
+        with self._lock:
+            return list(self._records)
+
+    def slowest(self, count=10):
+        return sorted(self.records(), key=lambda record: record.duration, reverse=True)[:count]
+
+    def summary(self):
+        """
+        Time per command name.
+
+        Returns:
+            dict: command -> {"count", "total", "max"} (seconds), slowest total first
+        """
+        totals = {}
+        for record in self.records():
+            entry = totals.setdefault(record.command, {"count": 0, "total": 0.0, "max": 0.0})
+            entry["count"] += 1
+            entry["total"] += record.duration
+            entry["max"] = max(entry["max"], record.duration)
+        return dict(sorted(totals.items(), key=lambda item: item[1]["total"], reverse=True))
+
+    def breakdown(self):
+        """
+        Returns:
+            dict: wall (since start()), appium (time inside commands) and other seconds, plus the command count
+        """
+        records = self.records()
+        wall = time.monotonic() - self.started
+        appium = sum(record.duration for record in records)
+        return {"wall": wall, "appium": appium, "other": max(0.0, wall - appium), "commands": len(records)}
+
+    def to_json(self):
+        return json.dumps({
+            "test": self.test_name,
+            "breakdown": self.breakdown(),
+            "commands": [record._asdict() for record in self.records()],
+        }, indent=2)
+
+    def render_waterfall(self):
+        """The timeline as a self-contained HTML waterfall (one bar per command)"""
+        records = self.records()
+        breakdown = self.breakdown()
+        span = max([record.start + record.duration for record in records] + [breakdown["wall"], 1e-6])
+        rows = []
+        for record in records:
+            left = 100 * record.start / span
+            width = max(0.2, 100 * record.duration / span)
+            color = "#d9534f" if record.status != "ok" else "#f0ad4e" if record.duration >= SLOW_COMMAND \
+                else "#5b9bd5"
+            rows.append(
+                f"<tr><td>{record.start:.3f}</td><td>{html.escape(record.command)}</td>"
+                f"<td>{html.escape(record.detail)}</td><td>{record.duration * 1000:.0f} ms</td>"
+                f"<td>{record.request_bytes}/{record.response_bytes}</td><td>{html.escape(record.status)}</td>"
+                f"<td class='bar'><div style='margin-left:{left:.2f}%;width:{width:.2f}%;"
+                f"background:{color}'></div></td></tr>")
+        return (
+            "<html><head><meta charset='utf-8'><style>"
+            "body{font:12px sans-serif}table{border-collapse:collapse;width:100%}"
+            "td,th{padding:2px 6px;border-bottom:1px solid #eee;white-space:nowrap;text-align:left}"
+            "td.bar{width:45%}td.bar div{height:10px}"
+            "</style></head><body>"
+            f"<p><b>{html.escape(str(self.test_name or ''))}</b>: {breakdown['commands']} commands, "
+            f"{breakdown['appium']:.2f}s in Appium, {breakdown['other']:.2f}s elsewhere, "
+            f"{breakdown['wall']:.2f}s total</p>"
+            "<table><tr><th>start (s)</th><th>command</th><th>detail</th><th>duration</th>"
+            "<th>bytes out/in</th><th>status</th><th></th></tr>"
+            + "".join(rows) + "</table></body></html>")
+
+    def attach_to_allure(self):
+        """Attaches the waterfall (HTML) and raw timeline (JSON) to the current Allure test"""
+        if not self.records():
+            return
+        import allure
+        from framework.mobile.artifacts import get_artifact_pipeline
+        pipeline = get_artifact_pipeline()
+        pipeline.attach_to_allure(self.render_waterfall().encode("utf-8"), "Command waterfall",
+                                  allure.attachment_type.HTML)
+        pipeline.attach_to_allure(self.to_json().encode("utf-8"), "Command timeline",
+                                  allure.attachment_type.JSON)
+
+
+# One timeline per test process
+_command_timeline = CommandTimeline()
+
+
+def get_command_timeline():
+    return _command_timeline
+
+
+class InstrumentedConnection(AppiumConnection):
+    """
+    AppiumConnection that records every command (name, locator or script, duration,
+    payload sizes and result) into the process' CommandTimeline.
+    """
+
+    _local = threading.local()
+    # Set to False to keep the connection behaviour without the timeline
+    record_commands = True
+
+    def execute(self, command, params):
+        local = self._local
+        # Nested calls (redirects) are part of the outer command
+        if not self.record_commands or getattr(local, "command", None) is not None:
+            return super().execute(command, params)
+        local.command = command
+        local.request_bytes = 0
+        local.method = local.path = ""
+        detail = _detail(command, params)
+        start = time.monotonic()
+        status = "exception"
+        response = None
+        try:
+            response = super().execute(command, params)
+            status = _status(response)
+            return response
+        finally:
+            duration = time.monotonic() - start
+            get_command_timeline().add(command, local.method, local.path, detail, start, duration,
+                                       local.request_bytes, _response_size(response), status)
+            local.command = None
+
+    def _note_request(self, method, url, body):
+        """Fills in the HTTP side of the command being recorded"""
+        local = self._local
+        if getattr(local, "command", None) is not None and not local.method:
+            local.method = method
+            local.path = session_path(url)
+            local.request_bytes = len(body) if body and method in ("POST", "PUT") else 0
+
+    def _request(self, method, url, body=None):
+        self._note_request(method, url, body)
+        return super()._request(method, url, body=body)
+
+    def reconnect(self, client_config):
+        """A connection of the same kind and settings for another server address"""
+        connection = type(self)(client_config=client_config)
+        connection.record_commands = self.record_commands
+        return connection
+
+
+# POST commands that only read state and are safe to send twice
+IDEMPOTENT_POST_COMMANDS = {"findElement", "findElements", "findChildElement", "findChildElements"}
+# Failures that mean the pooled socket died under the request (server restart, idle reset by a proxy)
+CONNECTION_RESET_ERRORS = (urllib3.exceptions.ProtocolError, ConnectionResetError)
+
+
+class PooledConnection(InstrumentedConnection):
+    """
+    InstrumentedConnection with a tuned HTTP pool for remote (cloud) Appium hubs.
+
+    Sockets are kept alive and reused across commands (with TCP keep-alive so idle
+    NAT/proxy hops do not drop them), gzip responses are accepted, and read-only
+    commands are resent on a fresh socket when a pooled one turns out to be reset.
+    connection_stats() tells how many requests reused an open socket.
+    """
+
+    # Accept-Encoding: gzip on every request; urllib3 decompresses transparently
+    accept_gzip = True
+    _connections = weakref.WeakSet()
+    # Counters of connections already closed (quit() clears the pools they were kept in)
+    _closed_totals = {"requests": 0, "connections": 0, "retries": 0}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.idempotent_retries = 2
+        self.retries = 0
+        PooledConnection._connections.add(self)
+
+    @classmethod
+    def get_remote_connection_headers(cls, parsed_url, keep_alive=True):
+        headers = super().get_remote_connection_headers(parsed_url, keep_alive=keep_alive)
+        if cls.accept_gzip:
+            headers["Accept-Encoding"] = "gzip"
+        return headers
+
+    def execute(self, command, params):
+        command_info = self._commands.get(command) or self.extra_commands.get(command)
+        self._local.retryable = bool(command_info) and (
+            command_info[0] == "GET" or command in IDEMPOTENT_POST_COMMANDS)
+        try:
+            return super().execute(command, params)
+        finally:
+            self._local.retryable = False
+
+    def _request(self, method, url, body=None):
+        attempt = 0
+        while True:
+            try:
+                return super()._request(method, url, body=body)
+            except (urllib3.exceptions.MaxRetryError, *CONNECTION_RESET_ERRORS) as e:
+                reset = not isinstance(e, urllib3.exceptions.MaxRetryError) or \
+                    isinstance(e.reason, CONNECTION_RESET_ERRORS)
+                if not reset or not getattr(self._local, "retryable", False) or attempt >= self.idempotent_retries:
+                    raise
+                attempt += 1
+                self.retries += 1
+                time.sleep(0.1 * 2 ** (attempt - 1))
+
+    def reconnect(self, client_config):
+        connection = super().reconnect(client_config)
+        connection.idempotent_retries = self.idempotent_retries
+        return connection
+
+    def close(self):
+        stats = self.connection_stats()
+        for key in PooledConnection._closed_totals:
+            PooledConnection._closed_totals[key] += stats[key]
+        self.retries = 0
+        super().close()
+
+    def connection_stats(self):
+        """
+        Returns:
+            dict: requests sent, connections opened, reuse_ratio (share of requests on an
+            already open socket) and retries of reset idempotent commands
+        """
+        requests = connections = 0
+        pool_manager = getattr(self, "_conn", None)
+        if pool_manager is not None:
+            for key in list(pool_manager.pools.keys()):
+                pool = pool_manager.pools.get(key)
+                if pool is not None:
+                    requests += pool.num_requests
+                    connections += pool.num_connections
+        reuse_ratio = 1 - connections / requests if requests else 0.0
+        return {"requests": requests, "connections": connections, "reuse_ratio": reuse_ratio,
+                "retries": self.retries}
+
+
+def get_connection_stats():
+    """connection_stats() summed over every pooled connection of this process"""
+    totals = dict(PooledConnection._closed_totals)
+    for connection in list(PooledConnection._connections):
+        stats = connection.connection_stats()
+        for key in totals:
+            totals[key] += stats[key]
+    totals["reuse_ratio"] = 1 - totals["connections"] / totals["requests"] if totals["requests"] else 0.0
+    return totals
+
+
+def build_connection(server_url, pool_size=4, keep_alive=True, gzip=True, retries=2, timeout=None,
+                     record_commands=True, connection_class=None):
+    """
+    The command executor DriverFactory hands to webdriver.Remote.
+
+    Args:
+        server_url (str): Appium server or cloud hub URL
+        pool_size (int): Sockets kept open per host
+        keep_alive (bool): Reuse sockets between commands (HTTP and TCP keep-alive)
+        gzip (bool): Accept gzip-compressed responses
+        retries (int): Resends of read-only commands whose socket was reset; connection
+            failures before anything was sent are retried the same number of times for all commands
+        timeout (int, optional): Per-request timeout in seconds (selenium's default when None)
+        record_commands (bool): Add every command to the per-test CommandTimeline
+        connection_class (type, optional): PooledConnection subclass to build (e.g. RecordingConnection)
+    """
+    pool_args = {
+        "maxsize": pool_size,
+        "block": False,
+        # Only failures before the request reached the server are safe to retry for every command
+        "retries": urllib3.util.Retry(total=None, connect=retries, read=0, other=0, status=0, redirect=3,
+                                      backoff_factor=0.1, raise_on_status=False),
+    }
+    if keep_alive:
+        pool_args["socket_options"] = HTTPConnection.default_socket_options + [
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    client_config = ClientConfig(remote_server_addr=server_url, keep_alive=keep_alive, timeout=timeout,
+                                 init_args_for_pool_manager={"init_args_for_pool_manager": pool_args})
+    PooledConnection.accept_gzip = gzip
+    connection = (connection_class or PooledConnection)(client_config=client_config)
+    connection.idempotent_retries = retries
+    connection.record_commands = record_commands
+    return connection
+
+
+def instrument(driver, connection):
+    """
+    Makes sure the driver still talks through connection's kind of executor; Appium's
+    directConnect swaps it for a plain AppiumConnection after session creation.
+    """
+    executor = driver.command_executor
+    if executor is not connection and not isinstance(executor, InstrumentedConnection):
+        config = executor._client_config
+        client_config = ClientConfig(remote_server_addr=config.remote_server_addr,
+                                     keep_alive=connection._client_config.keep_alive,
+                                     timeout=connection._client_config.timeout,
+                                     init_args_for_pool_manager=connection._client_config.init_args_for_pool_manager)
+        driver.command_executor = connection.reconnect(client_config)
+        driver._add_commands()
+    return driver
@@ -0,0 +1,67 @@
+"""
+pytest plugin for data-driven tests.
+
+Usage:
+    @pytest.mark.data_file("fill-test-data.csv")
+    def test_login(driver, data_row):
+        login.enter_phone_number(data_row["phone_number"])
+
+Every row of the file becomes one test case. Collection only counts the rows;
+each test reads its own row through a forward-only cursor, so memory stays flat
+however long the file is. With DATA_SHARD=index/count (device farm --shard-data)
+a worker runs only its share of the rows.
+"""
+import pytest
+from pathlib import Path
+from framework.readers.dataReader import count_rows, get_data_row, get_data_shard
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "data_file(file_name, sheet_name=None, limit=None): run the test once per row of a CSV/XLSX file in files/")
+
+
+def _data_file_args(marker):
+    file_name = marker.args[0] if marker.args else marker.kwargs.get("file_name")
+    if not file_name:
+        raise pytest.UsageError("@pytest.mark.data_file needs a file name")
+    return file_name, marker.kwargs.get("sheet_name"), marker.kwargs.get("limit")
+
+
+def pytest_generate_tests(metafunc):
+    marker = metafunc.definition.get_closest_marker("data_file")
+    if marker is None or "data_row" not in metafunc.fixturenames:
+        return
+    file_name, sheet_name, limit = _data_file_args(marker)
+    row_count = count_rows(file_name, sheet_name)
+    if limit is not None:
+        row_count = min(row_count, limit)
+
+    shard = get_data_shard()
+    start, step = shard if shard else (0, 1)
+    stem = Path(file_name).stem
+    metafunc.parametrize("data_row", range(start, row_count, step), indirect=True,
+                         ids=lambda index: f"{stem}-row{index + 1}")
+
+
+def pytest_collection_modifyitems(config, items):
+    # With sharded data, tests that are not data-driven run on the first shard only
+    shard = get_data_shard()
+    if not shard or shard[0] == 0:
+        return
+    selected = [item for item in items if item.get_closest_marker("data_file")]
+    deselected = [item for item in items if not item.get_closest_marker("data_file")]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+
+@pytest.fixture
+def data_row(request):
+    """The row (dict of column name to value) this test case was generated for"""
+    marker = request.node.get_closest_marker("data_file")
+    if marker is None or not hasattr(request, "param"):
+        raise pytest.UsageError("The data_row fixture needs @pytest.mark.data_file on the test")
+    file_name, sheet_name, _ = _data_file_args(marker)
+    return get_data_row(file_name, request.param, sheet_name)
@@ -0,0 +1,181 @@
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from framework.init.appium_server import find_free_port
+from framework.readers.dataReader import DATA_SHARD_ENV
+from framework.mobile.prints import text_print
+
+# Environment variable carrying the device (and its ports) a farm worker drives
+FARM_DEVICE_ENV = "FARM_DEVICE"
+FARM_LOG_DIR = Path("farm_logs")
+# Failure screenshots of all workers (see conftest); cleared once per farm run
+SCREENSHOT_DIR = Path("screenshots")
+
+# Base ports for per-device driver-side services; device i gets base + i
+SYSTEM_PORT_BASE = 8200         # UiAutomator2 server
+CHROMEDRIVER_PORT_BASE = 9515   # Chromedriver for webviews
+MJPEG_PORT_BASE = 9100          # Screen streaming
+WDA_LOCAL_PORT_BASE = 8100      # WebDriverAgent (iOS)
+
+
+def get_farm_device():
+    """The device assigned to this process by the farm runner, or None outside farm mode"""
+    raw = os.environ.get(FARM_DEVICE_ENV)
+    return json.loads(raw) if raw else None
+
+
+def device_slug(device):
+    name = device.get("udid") or device.get("deviceName") or "device"
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", str(name))
+
+
+def assign_ports(devices):
+    """Gives every device its own Appium port and driver-side ports so workers never collide"""
+    assigned = []
+    for index, device in enumerate(devices):
+        device = dict(device)
+        device.setdefault("appiumPort", find_free_port())
+        device.setdefault("systemPort", SYSTEM_PORT_BASE + index)
+        device.setdefault("chromedriverPort", CHROMEDRIVER_PORT_BASE + index)
+        device.setdefault("mjpegServerPort", MJPEG_PORT_BASE + index)
+        device.setdefault("wdaLocalPort", WDA_LOCAL_PORT_BASE + index)
+        assigned.append(device)
+    return assigned
+
+
+def collect_test_files(paths):
+    """Expands directories into their test_*.py files"""
+    files = []
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            files.extend(sorted(str(p) for p in path.rglob("test_*.py")))
+        else:
+            files.append(str(path))
+    return files
+
+
+def spread_test_files(test_files, worker_count):
+    """
+    Splits test files over the workers, largest first onto the least loaded worker.
+    File size is the cost estimate; it keeps long files from piling up on one device.
+    """
+    buckets = [[] for _ in range(worker_count)]
+    loads = [0] * worker_count
+    for test_file in sorted(test_files, key=lambda f: os.path.getsize(f) if os.path.exists(f) else 0, reverse=True):
+        target = loads.index(min(loads))
+        buckets[target].append(test_file)
+        loads[target] += os.path.getsize(test_file) if os.path.exists(test_file) else 0
+    return buckets
+
+
+def merge_allure_results(worker_dirs, results_dir):
+    """Copies every worker's Allure result files into results_dir (file names are uuids)"""
+    results_dir = Path(results_dir)
+    results_dir.mkdir(parents=True, exist_ok=True)
+    for worker_dir in worker_dirs:
+        worker_dir = Path(worker_dir)
+        if not worker_dir.exists():
+            continue
+        for result_file in worker_dir.iterdir():
+            if result_file.is_file():
+                shutil.copy2(result_file, results_dir / result_file.name)
+        shutil.rmtree(worker_dir, ignore_errors=True)
+
+
+class DeviceFarm:
+    """
+    Runs test files in parallel, one pytest worker per attached device.
+
+    Each worker gets its own Appium server port and driver-side ports through
+    the FARM_DEVICE/APPIUM_PORT environment, writes Allure results to its own
+    directory, and the results are merged once every worker has finished.
+
+    With shard_data, every worker gets all test files and the rows of data-driven
+    tests (@pytest.mark.data_file) are split across the devices instead.
+    """
+
+    def __init__(self, devices, results_dir="results", marker=None, use_allure=False, shard_data=False):
+        if not devices:
+            raise ValueError("Device farm mode needs at least one device in the config")
+        self.devices = assign_ports(devices)
+        self.results_dir = Path(results_dir)
+        self.marker = marker
+        self.use_allure = use_allure
+        self.shard_data = shard_data
+
+    def _worker_results_dir(self, device):
+        return self.results_dir / "farm" / device_slug(device)
+
+    def _build_command(self, device, test_files):
+        cmd = [sys.executable, "-m", "pytest", *test_files]
+        if self.marker:
+            cmd += ["-m", self.marker]
+        if self.use_allure:
+            cmd += ["--alluredir", str(self._worker_results_dir(device))]
+        return cmd
+
+    def _build_env(self, device):
+        env = os.environ.copy()
+        env[FARM_DEVICE_ENV] = json.dumps(device)
+        if self.shard_data:
+            env[DATA_SHARD_ENV] = f"{self.devices.index(device)}/{len(self.devices)}"
+        env["APPIUM_PORT"] = str(device["appiumPort"])
+        env["PYTEST_RUNNER_ACTIVE"] = "1"
+        return env
+
+    def _run_worker(self, device, test_files, exit_codes):
+        slug = device_slug(device)
+        log_path = FARM_LOG_DIR / f"{slug}.log"
+        text_print(f"▶ {slug}: {len(test_files)} file(s) on Appium port {device['appiumPort']} (log: {log_path})", "green")
+        with open(log_path, "w", encoding="utf-8") as log_file:
+            result = subprocess.run(
+                self._build_command(device, test_files),
+                env=self._build_env(device),
+                stdout=log_file,
+                stderr=subprocess.STDOUT,
+            )
+        exit_codes[slug] = result.returncode
+        status = "green" if result.returncode in (0, 5) else "red"
+        text_print(f"■ {slug}: finished with exit code {result.returncode}", status)
+
+    def run(self, test_paths):
+        """Runs the tests across all devices; returns the worst worker exit code"""
+        test_files = collect_test_files(test_paths)
+        if not test_files:
+            raise ValueError(f"No test files found in {test_paths}")
+
+        if self.results_dir.exists():
+            shutil.rmtree(self.results_dir)
+        self.results_dir.mkdir(parents=True)
+        shutil.rmtree(SCREENSHOT_DIR, ignore_errors=True)
+        SCREENSHOT_DIR.mkdir()
+        FARM_LOG_DIR.mkdir(exist_ok=True)
+
+        if self.shard_data:
+            buckets = [test_files] * len(self.devices)
+        else:
+            buckets = spread_test_files(test_files, len(self.devices))
+        exit_codes = {}
+        threads = []
+        for device, files in zip(self.devices, buckets):
+            if not files:
+                continue
+            thread = threading.Thread(target=self._run_worker, args=(device, files, exit_codes), daemon=True)
+            thread.start()
+            threads.append(thread)
+        for thread in threads:
+            thread.join()
+
+        if self.use_allure:
+            merge_allure_results([self._worker_results_dir(d) for d in self.devices], self.results_dir)
+            shutil.rmtree(self.results_dir / "farm", ignore_errors=True)
+
+        # pytest exit code 5 means "no tests collected" for that worker's share
+        failures = [code for code in exit_codes.values() if code not in (0, 5)]
+        return max(failures) if failures else 0
@@ -0,0 +1,355 @@
+import argparse
+import base64
+import json
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from framework.mobile.snapshot import PageSnapshot, UnsupportedSnapshotQuery, TEXT_ATTRIBUTES
+
+# W3C element reference key
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+WINDOW_SIZE = (1080, 2400)
+
+_BOUNDS = re.compile(r"\[(-?\d+),(-?\d+)\]\[(-?\d+),(-?\d+)\]")
+_SESSION_PATH = re.compile(r"^/session/(?P<session>[^/]+)(?P<rest>/.*)?$")
+_ELEMENT_PATH = re.compile(r"^/element/(?P<element>[^/]+)(?P<rest>/.*)?$")
+
+
+class WebDriverError(Exception):
+    """A W3C error response: error name and HTTP status"""
+
+    def __init__(self, error, status=404, message=""):
+        super().__init__(message or error)
+        self.error = error
+        self.status = status
+
+
+def _bounds(node):
+    match = _BOUNDS.match(node.get("bounds", "") or "")
+    if not match:
+        return None
+    left, top, right, bottom = map(int, match.groups())
+    return left, top, right - left, bottom - top
+
+
+class Screen:
+    """
+    One scripted screen: a page source plus the screens that clicks and gestures lead to.
+
+    on_click maps a resource-id, content-desc or text of the clicked node to the next
+    screen; on_actions is the screen any W3C actions request (swipe, scroll, key press)
+    leads to.
+    """
+
+    def __init__(self, name, source, on_click=None, on_actions=None):
+        self.name = name
+        self.source = source
+        self.on_click = dict(on_click or {})
+        self.on_actions = on_actions
+        self.snapshot = PageSnapshot(source)
+        self.nodes = self.snapshot._nodes
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        self._png = None
+
+    def png(self, window_size):
+        """A rendering of the screen: one filled box per node with bounds (cached)"""
+        if self._png is None:
+            import cv2
+            import numpy as np
+            width, height = window_size
+            image = np.full((height, width, 3), 255, dtype=np.uint8)
+            for index, node in enumerate(self.nodes):
+                rect = _bounds(node)
+                if rect is None or rect[2] <= 0 or rect[3] <= 0:
+                    continue
+                x, y, w, h = rect
+                shade = 60 + (index * 37) % 180
+                cv2.rectangle(image, (x, y), (x + w - 1, y + h - 1), (shade, 255 - shade, 128), -1)
+            self._png = cv2.imencode(".png", image)[1].tobytes()
+        return self._png
+
+
+class FakeAppiumServer:
+    """
+    A local WebDriver/Appium HTTP server that answers from scripted page sources.
+
+    Locators are resolved with PageSnapshot (id, accessibility id, class, XPath and
+    simple UiSelector chains), clicks and gestures move between screens, and every
+    command can be delayed to mimic a real device. It is meant for measuring framework
+    overhead without a phone, not for functional testing.
+
+    Usage:
+        script = {"start": "home", "screens": {"home": {"source": "<hierarchy>...</hierarchy>",
+                                                        "on_click": {"com.app:id/next": "pin"}}}}
+        with FakeAppiumServer(script, latency=0.02) as server:
+            driver = webdriver.Remote(server.url, options=options)
+    """
+
+    def __init__(self, script, latency=0.0, host="127.0.0.1", port=0, window_size=WINDOW_SIZE, base_dir="."):
+        """
+        Args:
+            script (dict | str): {"start": name, "screens": {name: {"source" | "source_file", "on_click",
+                "on_actions"}}}, or the path of a JSON file holding it
+            latency (float | dict): Seconds added to every command, or per endpoint keyed by the
+                last path segment ({"element": 0.05, "source": 0.2, "default": 0.01})
+            window_size (tuple): Screen width and height reported to the client
+        """
+        if isinstance(script, (str, Path)):
+            base_dir = Path(script).parent
+            script = json.loads(Path(script).read_text(encoding="utf-8"))
+        self.screens = {}
+        for name, spec in script["screens"].items():
+            source = spec.get("source")
+            if source is None:
+                source = (Path(base_dir) / spec["source_file"]).read_text(encoding="utf-8")
+            self.screens[name] = Screen(name, source, spec.get("on_click"), spec.get("on_actions"))
+        self.start_screen = script.get("start") or next(iter(self.screens))
+        self.latency = latency
+        self.window_size = tuple(window_size)
+        self.host = host
+        self.port = port
+        self.screen = self.screens[self.start_screen]
+        self.values = {}
+        self.commands = 0
+        self._lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        server = self
+
+        class Handler(_Handler):
+            fake = server
+
+        self._httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-appium", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def reset(self, screen=None):
+        """Back to the start screen (or screen) with typed values cleared"""
+        with self._lock:
+            self.screen = self.screens[screen or self.start_screen]
+            self.values = {}
+
+    def go_to(self, name):
+        with self._lock:
+            self.screen = self.screens[name]
+
+    def _delay(self, command):
+        latency = self.latency
+        if isinstance(latency, dict):
+            latency = latency.get(command, latency.get("default", 0.0))
+        if latency:
+            time.sleep(latency)
+
+    # Element ids are "<screen>:<node index>" so ids of a screen that was left become stale
+    def _element_id(self, node):
+        return f"{self.screen.name}:{self.screen.index[node]}"
+
+    def _node(self, element_id):
+        screen_name, _, index = element_id.rpartition(":")
+        if screen_name != self.screen.name:
+            raise WebDriverError("stale element reference")
+        try:
+            return self.screen.nodes[int(index)]
+        except (ValueError, IndexError):
+            raise WebDriverError("no such element")
+
+    def _find(self, params, many):
+        try:
+            nodes = self.screen.snapshot.find_all((params["using"], params["value"]))
+        except (UnsupportedSnapshotQuery, KeyError) as e:
+            raise WebDriverError("invalid selector", 400, str(e))
+        if many:
+            return [{ELEMENT_KEY: self._element_id(node)} for node in nodes]
+        if not nodes:
+            raise WebDriverError("no such element")
+        return {ELEMENT_KEY: self._element_id(nodes[0])}
+
+    def _click(self, node):
+        for key in ("resource-id", "content-desc", "text", "name", "label"):
+            target = self.screen.on_click.get(node.get(key) or "")
+            if target:
+                self.screen = self.screens[target]
+                return
+
+    def _text(self, element_id, node):
+        if element_id in self.values:
+            return self.values[element_id]
+        for name in TEXT_ATTRIBUTES:
+            if node.get(name) is not None:
+                return node.get(name)
+        return ""
+
+    def _element_command(self, method, element_id, rest, params):
+        node = self._node(element_id)
+        if rest == "/click" and method == "POST":
+            self._click(node)
+            return None
+        if rest == "/value" and method == "POST":
+            typed = params.get("text") or "".join(params.get("value", []))
+            self.values[element_id] = self._text(element_id, node) + typed
+            return None
+        if rest == "/clear" and method == "POST":
+            self.values[element_id] = ""
+            return None
+        if rest == "/text":
+            return self._text(element_id, node)
+        if rest == "/displayed":
+            return PageSnapshot.node_is_visible(node)
+        if rest in ("/enabled", "/selected"):
+            return (node.get(rest[1:]) or "true").lower() == "true"
+        if rest.startswith("/attribute/") or rest.startswith("/property/"):
+            name = rest.split("/", 2)[2]
+            return self._text(element_id, node) if name == "text" else node.get(name)
+        if rest == "/name":
+            return node.get("class") or node.tag
+        if rest == "/rect":
+            x, y, width, height = _bounds(node) or (0, 0, 0, 0)
+            return {"x": x, "y": y, "width": width, "height": height}
+        if rest == "/screenshot":
+            import cv2
+            import numpy as np
+            x, y, width, height = _bounds(node) or (0, 0, 1, 1)
+            image = cv2.imdecode(np.frombuffer(self.screen.png(self.window_size), np.uint8), cv2.IMREAD_COLOR)
+            crop = image[max(0, y):y + max(1, height), max(0, x):x + max(1, width)]
+            return base64.b64encode(cv2.imencode(".png", crop)[1].tobytes()).decode("ascii")
+        if rest.startswith("/element"):
+            raise WebDriverError("no such element")
+        return None
+
+    def handle(self, method, path, params):
+        """Answers one command; returns the W3C "value" or raises WebDriverError"""
+        if path.rstrip("/") == "/session" and method == "POST":
+            return {"sessionId": uuid.uuid4().hex, "capabilities": {
+                "platformName": "Android", "automationName": "UiAutomator2", "deviceName": "fake",
+                "deviceModel": "FakeDevice", "platformVersion": "14"}}
+        if path.rstrip("/") == "/status":
+            return {"ready": True, "message": "fake appium"}
+
+        match = _SESSION_PATH.match(path)
+        if not match:
+            raise WebDriverError("unknown command", 404)
+        rest = match.group("rest") or ""
+        if rest == "" and method == "DELETE":
+            return None
+
+        with self._lock:
+            if rest == "/element" and method == "POST":
+                return self._find(params, many=False)
+            if rest == "/elements" and method == "POST":
+                return self._find(params, many=True)
+            element_match = _ELEMENT_PATH.match(rest)
+            if element_match and element_match.group("element") != "active":
+                return self._element_command(method, element_match.group("element"),
+                                             element_match.group("rest") or "", params)
+            if rest == "/source":
+                return self.screen.source
+            if rest == "/screenshot":
+                return base64.b64encode(self.screen.png(self.window_size)).decode("ascii")
+            if rest == "/window/rect":
+                return {"x": 0, "y": 0, "width": self.window_size[0], "height": self.window_size[1]}
+            if rest == "/actions" and method == "POST":
+                if self.screen.on_actions:
+                    self.screen = self.screens[self.screen.on_actions]
+                return None
+            if rest == "/appium/device/current_activity":
+                return f".{self.screen.name}"
+            if rest == "/execute/sync":
+                script = params.get("script", "")
+                if script == "mobile: batteryInfo":
+                    return {"level": 0.8, "state": 2}
+                if script == "mobile: getCurrentActivity":
+                    return f".{self.screen.name}"
+                return None
+        # Timeouts, orientation, keyboard, logs and the rest: accepted and ignored
+        return None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as separate writes; without this each response waits for a delayed ACK
+    disable_nagle_algorithm = True
+    fake = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _respond(self, status, value):
+        body = json.dumps({"value": value}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _dispatch(self, method):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            params = json.loads(raw) if raw else {}
+        except ValueError:
+            params = {}
+        # Tolerate a base path such as /wd/hub
+        path = self.path.split("?", 1)[0]
+        if "/session" in path:
+            path = path[path.index("/session"):]
+        elif path.endswith("/status"):
+            path = "/status"
+        fake = self.fake
+        fake.commands += 1
+        fake._delay(path.rsplit("/", 1)[-1])
+        try:
+            self._respond(200, fake.handle(method, path, params))
+        except WebDriverError as e:
+            self._respond(e.status, {"error": e.error, "message": str(e), "stacktrace": ""})
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a scripted fake Appium server")
+    parser.add_argument("script", help="JSON file with the scripted screens")
+    parser.add_argument("--port", type=int, default=4723)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every command")
+    args = parser.parse_args(argv)
+    server = FakeAppiumServer(args.script, latency=args.latency, port=args.port).start()
+    print(f"Fake Appium server on {server.url} (export APPIUM_SERVER_URL={server.url})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+import atexit
+import json
+import threading
+from colorama import Fore
+from framework.mobile.prints import text_print
+
+
+def quit_session(driver):
+    """Terminates the app under test (best effort) and quits the Appium session"""
+    try:
+        # Attempt to terminate the app before quitting the driver
+        platform = driver.capabilities.get("platformName", "").lower()
+
+        if platform == "android":
+            current_package = driver.current_package
+            driver.terminate_app(current_package)
+
+        elif platform == "ios":
+            # Try to get bundle ID from capabilities or active app
+            bundle_id = driver.capabilities.get("bundleId")
+            if not bundle_id:
+                try:
+                    bundle_id = driver.execute_script("mobile: activeAppInfo").get("bundleId")
+                except Exception as info_err:
+                    print(f"Could not retrieve active bundle ID: {info_err}")
+
+            if bundle_id:
+                driver.terminate_app(bundle_id)
+
+    except Exception as e:
+        print(f"Error during app termination: {e}")
+
+    finally:
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"Error during driver quit: {e}")
+
+
+def capability_key(capabilities):
+    """Stable key for a capability set, used to match pooled sessions"""
+    return json.dumps(capabilities, sort_keys=True, default=str)
+
+
+class PooledSession:
+    def __init__(self, key, driver):
+        self.key = key
+        self.driver = driver
+        self.uses = 0
+        self.app_id = self._detect_app_id()
+
+    def _detect_app_id(self):
+        """Package (Android) or bundle id (iOS) of the app the session was started with"""
+        capabilities = self.driver.capabilities
+        platform = capabilities.get("platformName", "").lower()
+        try:
+            if platform == "android":
+                return capabilities.get("appPackage") or self.driver.current_package
+            if platform == "ios":
+                return capabilities.get("bundleId") or \
+                    self.driver.execute_script("mobile: activeAppInfo").get("bundleId")
+        except Exception as e:
+            print(Fore.RED + f"Could not detect app id for pooled session: {e}")
+        return None
+
+
+class SessionPool:
+    """
+    Keeps Appium sessions warm between tests.
+
+    Sessions are keyed by their capability set. A released session goes back to the
+    pool and the next test with the same capabilities gets it with a freshly reset app.
+    Sessions are quit after max_uses tests or when a health check fails.
+    """
+
+    RESET_STRATEGIES = ("restart", "clear")
+
+    def __init__(self, max_uses=20, reset="restart"):
+        if reset not in self.RESET_STRATEGIES:
+            raise ValueError(f"Unsupported reset strategy: '{reset}'. Use one of {list(self.RESET_STRATEGIES)}")
+        self.max_uses = max_uses
+        self.reset = reset
+        self._idle = {}
+        self._in_use = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, driver_factory):
+        """
+        Returns a driver for the factory's capabilities, reusing an idle session when possible.
+        The factory's driver attribute is set to the returned driver.
+        """
+        key = capability_key(driver_factory.get_capabilities())
+        session = self._take_idle(key)
+
+        if session is not None:
+            try:
+                self.reset_app(session)
+                driver_factory.driver = session.driver
+                text_print(f"Reusing pooled Appium session (use {session.uses + 1}/{self.max_uses})", "green")
+            except Exception:
+                quit_session(session.driver)
+                session = None
+
+        if session is None:
+            driver = driver_factory.init_driver()
+            session = PooledSession(key, driver)
+            text_print("Started new pooled Appium session", "green")
+
+        session.uses += 1
+        with self._lock:
+            self._in_use[id(session.driver)] = session
+        return session.driver
+
+    def release(self, driver):
+        """Returns a driver to the pool, or quits it once it is worn out or unhealthy"""
+        with self._lock:
+            session = self._in_use.pop(id(driver), None)
+        if session is None:
+            quit_session(driver)
+            return
+
+        if session.uses >= self.max_uses or not self.is_healthy(session):
+            text_print(f"Recycling pooled Appium session after {session.uses} use(s)", "yellow")
+            quit_session(driver)
+            return
+
+        with self._lock:
+            self._idle.setdefault(session.key, []).append(session)
+
+    def owns(self, driver):
+        return id(driver) in self._in_use
+
+    def _take_idle(self, key):
+        while True:
+            with self._lock:
+                sessions = self._idle.get(key)
+                if not sessions:
+                    return None
+                session = sessions.pop()
+            if self.is_healthy(session):
+                return session
+            text_print("Discarding unhealthy pooled Appium session", "yellow")
+            quit_session(session.driver)
+
+    @staticmethod
+    def is_healthy(session):
+        """A session is healthy when it still has an id and answers a cheap command"""
+        if not session.driver.session_id:
+            return False
+        try:
+            session.driver.get_window_size()
+            return True
+        except Exception:
+            return False
+
+    def reset_app(self, session):
+        """Brings the app back to a fresh state before the session is handed out again"""
+        if not session.app_id:
+            return
+        driver = session.driver
+        platform = driver.capabilities.get("platformName", "").lower()
+        try:
+            if self.reset == "clear" and platform == "android":
+                driver.execute_script("mobile: clearApp", {"appId": session.app_id})
+            else:
+                driver.terminate_app(session.app_id)
+            driver.activate_app(session.app_id)
+        except Exception as e:
+            print(Fore.RED + f"Error resetting app '{session.app_id}': {e}")
+            raise
+
+    def close_all(self):
+        """Quits every session owned by the pool"""
+        with self._lock:
+            sessions = [s for idle in self._idle.values() for s in idle] + list(self._in_use.values())
+            self._idle.clear()
+            self._in_use.clear()
+        for session in sessions:
+            quit_session(session.driver)
+
+
+# Process-wide pool; created on first use
+_session_pool = None
+
+
+def get_session_pool(max_uses=20, reset="restart"):
+    global _session_pool
+    if _session_pool is None:
+        _session_pool = SessionPool(max_uses=max_uses, reset=reset)
+        atexit.register(shutdown_session_pool)
+    return _session_pool
+
+
+def shutdown_session_pool():
+    """Quits all pooled sessions; safe to call more than once"""
+    global _session_pool
+    if _session_pool is not None:
+        _session_pool.close_all()
+        _session_pool = None
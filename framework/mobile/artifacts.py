@@ -0,0 +1,176 @@
+import atexit
+import base64
+import io
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from pathlib import Path
+from uuid import uuid4
+from framework.mobile.prints import text_print
+
+# Background writers and how many artifacts may wait for them before submit() blocks
+MAX_WORKERS = 2
+MAX_PENDING = 16
+
+
+def _allure_reporter():
+    """The AllureReporter of the running session, or None when Allure is not collecting results"""
+    try:
+        from allure_commons import plugin_manager
+    except ImportError:
+        return None
+    for plugin in plugin_manager.get_plugins():
+        reporter = getattr(plugin, "allure_logger", None)
+        if reporter is not None:
+            return reporter
+    return None
+
+
+class ArtifactPipeline:
+    """
+    Writes test artifacts (screenshots, recordings, device logs, Allure attachments)
+    on background threads so the test thread only pays for fetching the data.
+
+    The queue is bounded: when MAX_PENDING artifacts are waiting, submit() blocks
+    until a writer is free. flush() waits for everything queued so far.
+    """
+
+    def __init__(self, max_workers=MAX_WORKERS, max_pending=MAX_PENDING):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="artifacts")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._pending = set()
+        self._lock = threading.Lock()
+        self.errors = 0
+
+    def submit(self, description, task, *args, **kwargs):
+        """Runs task(*args, **kwargs) in the background; failures are printed, never raised"""
+        self._slots.acquire()
+
+        def run():
+            try:
+                task(*args, **kwargs)
+            except Exception as e:
+                self.errors += 1
+                text_print(f"Error writing {description}: {e}", 'red')
+            finally:
+                self._slots.release()
+
+        future = self._executor.submit(run)
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._discard)
+        return future
+
+    def _discard(self, future):
+        with self._lock:
+            self._pending.discard(future)
+
+    def flush(self, timeout=None):
+        """Blocks until every queued artifact is written; returns True if none is left"""
+        with self._lock:
+            pending = list(self._pending)
+        _, not_done = wait(pending, timeout=timeout)
+        return not not_done
+
+    def shutdown(self):
+        self.flush()
+        self._executor.shutdown(wait=True)
+
+    def attach_to_allure(self, data, name, attachment_type, base64_encoded=False):
+        """
+        Attaches data to the current Allure test without blocking on the write.
+
+        The attachment is registered on the calling (test) thread, where Allure knows
+        which test is running; only decoding and writing the file happen in the background.
+        If the installed allure-pytest lacks the reporter internals this relies on, the
+        attachment is made synchronously with the public allure.attach() instead.
+        """
+        reporter = _allure_reporter()
+        if reporter is None:
+            return None
+        # Same bookkeeping as allure.attach(), minus the synchronous file write
+        try:
+            from allure_commons import plugin_manager
+            file_name = reporter._attach(uuid4(), name=name, attachment_type=attachment_type)
+            report_attached_data = plugin_manager.hook.report_attached_data
+        except (AttributeError, TypeError, ImportError):
+            import allure
+            body = base64.b64decode(data) if base64_encoded else data
+            allure.attach(body, name=name, attachment_type=attachment_type)
+            return None
+
+        def write():
+            body = base64.b64decode(data) if base64_encoded else data
+            report_attached_data(body=body, file_name=file_name)
+
+        return self.submit(f"Allure attachment '{name}'", write)
+
+    def attach_screenshot(self, driver, name):
+        """Takes a screenshot and attaches it to the current Allure test in the background"""
+        import allure
+        screenshot = driver.get_screenshot_as_base64()
+        return self.attach_to_allure(screenshot, name, allure.attachment_type.PNG, base64_encoded=True)
+
+    def save_bytes(self, data, path):
+        """Writes already encoded bytes (e.g. a PNG) to path in the background"""
+        def write():
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "wb") as file:
+                file.write(data)
+
+        return self.submit(str(path), write)
+
+    def save_base64(self, data, path):
+        """Decodes base64 data (e.g. a screen recording) into path in the background"""
+        def write():
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "wb") as file:
+                file.write(base64.b64decode(data))
+
+        return self.submit(str(path), write)
+
+    def save_device_logs(self, logs, path):
+        """Writes logcat entries to path in the background"""
+        def write():
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as file:
+                for log in logs:
+                    file.write(f"{log['timestamp']} {log['level']} {log['message']}\n")
+
+        return self.submit(str(path), write)
+
+    def save_highlighted_screenshot(self, screenshot_base64, rect, path):
+        """Draws a red box at rect on a base64 screenshot and saves it as PNG in the background"""
+        def write():
+            from PIL import Image, ImageDraw
+            image = Image.open(io.BytesIO(base64.b64decode(screenshot_base64)))
+            draw = ImageDraw.Draw(image)
+            draw.rectangle(
+                [rect["x"], rect["y"], rect["x"] + rect["width"], rect["y"] + rect["height"]],
+                outline="red", width=5
+            )
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            image.save(path)
+
+        return self.submit(str(path), write)
+
+
+# One pipeline per test process; created on first use
+_artifact_pipeline = None
+
+
+def get_artifact_pipeline():
+    global _artifact_pipeline
+    if _artifact_pipeline is None:
+        _artifact_pipeline = ArtifactPipeline()
+        atexit.register(shutdown_artifact_pipeline)
+    return _artifact_pipeline
+
+
+def shutdown_artifact_pipeline():
+    global _artifact_pipeline
+    if _artifact_pipeline is not None:
+        _artifact_pipeline.shutdown()
+        if _artifact_pipeline.errors:
+            text_print(f"{_artifact_pipeline.errors} artifact(s) could not be written", 'red')
+        _artifact_pipeline = None
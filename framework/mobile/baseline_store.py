@@ -0,0 +1,162 @@
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+# Content-addressed baseline store, shared by every worker of a run
+STORE_DIR = Path("baselines")
+# Loose PNG baselines from before the store; imported on first use
+LEGACY_DIR = Path("baseline_img")
+# Decoded baselines kept in memory per process
+LRU_SIZE = 32
+
+
+def _slug(value):
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", str(value)) or "unknown"
+
+
+def _atomic_write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class BaselineStore:
+    """
+    Baseline images addressed by content.
+
+    Layout:
+        objects/ab/<sha256>.png   the image, stored once however many baselines share it
+        objects/ab/<sha256>.npy   its decoded pixels, written on first use and memory-mapped after
+        refs/<platform>/<device>/<WxH>/<locator>/<name>.ref   the sha256 a baseline points at
+
+    Decoded arrays are kept in a per-process LRU; other workers map the same .npy
+    file, so a baseline is PNG-decoded once per store rather than once per comparison.
+    """
+
+    def __init__(self, root=STORE_DIR, legacy_dir=LEGACY_DIR, lru_size=LRU_SIZE):
+        self.root = Path(root)
+        self.legacy_dir = Path(legacy_dir)
+        self.lru_size = lru_size
+        self._decoded = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def profile(driver):
+        """(platform, device, resolution) of a driver session, used in every baseline key"""
+        cached = getattr(driver, "_baseline_profile", None)
+        if cached is not None:
+            return cached
+        capabilities = getattr(driver, "capabilities", None) or {}
+        platform = capabilities.get("platformName") or "unknown"
+        device = capabilities.get("deviceModel") or capabilities.get("deviceName") or "unknown"
+        size = driver.get_window_size()
+        profile = (_slug(platform).lower(), _slug(device), f"{size['width']}x{size['height']}")
+        try:
+            driver._baseline_profile = profile
+        except AttributeError:
+            pass
+        return profile
+
+    def _object_path(self, digest, suffix):
+        return self.root / "objects" / digest[:2] / f"{digest}{suffix}"
+
+    def _ref_dir(self, profile):
+        return self.root / "refs" / Path(*profile)
+
+    def _ref_path(self, profile, name, locator=None):
+        return self._ref_dir(profile) / _slug(locator or "fullscreen") / f"{_slug(Path(name).stem)}.ref"
+
+    def put(self, profile, name, png_bytes, locator=None):
+        """
+        Stores png_bytes as the baseline name (for locator, or the full screen).
+
+        Returns:
+            str: The content hash; identical images share one object
+        """
+        digest = hashlib.sha256(png_bytes).hexdigest()
+        object_path = self._object_path(digest, ".png")
+        if not object_path.exists():
+            _atomic_write(object_path, png_bytes)
+        _atomic_write(self._ref_path(profile, name, locator), digest.encode("ascii"))
+        return digest
+
+    def resolve(self, profile, name, locator=None):
+        """
+        The content hash of a baseline, or None.
+        Falls back to importing baseline_img/<name>.png; a baseline stored under another
+        locator is never used, since it would compare against a different element.
+        """
+        ref_path = self._ref_path(profile, name, locator)
+        if ref_path.exists():
+            return ref_path.read_text(encoding="ascii").strip()
+
+        legacy_name = name if name.endswith(".png") else f"{name}.png"
+        legacy_path = self.legacy_dir / legacy_name
+        if legacy_path.exists():
+            return self.put(profile, name, legacy_path.read_bytes(), locator)
+        return None
+
+    def load(self, digest):
+        """Decoded BGR pixels of a stored image (read-only), without decoding the PNG more than once"""
+        with self._lock:
+            image = self._decoded.get(digest)
+            if image is not None:
+                self._decoded.move_to_end(digest)
+                return image
+
+        import numpy as np
+        raw_path = self._object_path(digest, ".npy")
+        if raw_path.exists():
+            image = np.load(raw_path, mmap_mode="r")
+        else:
+            import cv2
+            png_path = self._object_path(digest, ".png")
+            image = cv2.imdecode(np.frombuffer(png_path.read_bytes(), dtype=np.uint8), cv2.IMREAD_COLOR)
+            if image is None:
+                raise ValueError(f"Baseline object could not be decoded: {png_path}")
+            fd, temp_path = tempfile.mkstemp(dir=raw_path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as file:
+                np.save(file, image)
+            os.replace(temp_path, raw_path)
+            image = np.load(raw_path, mmap_mode="r")
+
+        with self._lock:
+            self._decoded[digest] = image
+            while len(self._decoded) > self.lru_size:
+                self._decoded.popitem(last=False)
+        return image
+
+    def get(self, profile, name, locator=None):
+        """
+        Decoded baseline for (profile, locator, name).
+
+        Raises:
+            FileNotFoundError: If there is no such baseline
+        """
+        digest = self.resolve(profile, name, locator)
+        if digest is None:
+            raise FileNotFoundError(
+                f"Baseline image not found: {name} ({'/'.join(profile)}, {locator or 'fullscreen'})")
+        return self.load(digest)
+
+
+# One store per process; created on first use
+_baseline_store = None
+
+
+def get_baseline_store():
+    global _baseline_store
+    if _baseline_store is None:
+        _baseline_store = BaselineStore()
+    return _baseline_store
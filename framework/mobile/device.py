@@ -1,3 +1,6 @@
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.keys import Keys
+from framework.mobile.gestures import Gesture
 from framework.mobile.prints import text_print
 
 class Device:
@@ -82,18 +85,21 @@ class Device:
         try:
             # Check if device is locked
             if self.driver.is_locked():
-                # First unlock the screen
-                self.driver.unlock()
+                platform = (getattr(self.driver, "capabilities", None) or {}).get("platformName", "")
+                if password and platform.lower() == "android":
+                    # UiAutomator2 dismisses the keyguard and enters the PIN in one call
+                    try:
+                        self.driver.execute_script('mobile: unlock', {'key': str(password), 'type': 'pin'})
+                        password = None
+                    except WebDriverException:
+                        self.driver.unlock()
+                else:
+                    # First unlock the screen
+                    self.driver.unlock()
                 
-                # If password provided, enter it using keycode events
+                # If the PIN is still to be entered, type it and confirm in one request
                 if password:
-                    for digit in password:
-                        # Convert string digit to integer keycode (0 = 7, 1 = 8, etc.)
-                        keycode = int(digit) + 7
-                        self.driver.press_keycode(keycode)
-                    
-                    # Press enter/confirm key
-                    self.driver.press_keycode(66)  # KEYCODE_ENTER
+                    Gesture(self.driver).keys(password).key(Keys.ENTER).perform()
                 
                 text_print("Device unlocked successfully", 'green')
             else:
@@ -1,35 +1,47 @@
 import base64
-import json
+import hashlib
 import os
 import sys
 from pathlib import Path
-import config
 from utils.screenshots import highlight_element
-from selenium.webdriver import ActionChains
+from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.actions import interaction
 from selenium.webdriver.common.actions.action_builder import ActionBuilder
 from selenium.webdriver.common.actions.pointer_input import PointerInput
-from selenium.webdriver.support.wait import WebDriverWait
+from framework.mobile.polling import AdaptiveWait, wait_for_stable
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException, NoSuchElementException
 from framework.mobile.prints import text_print
-from framework.init.base import locator_map
+from framework.mobile.locators import load_locators, get_locator
+from framework.mobile.snapshot import PageSnapshot
+from framework.mobile.element_cache import ElementCache
+from framework.mobile.gestures import Gesture, TAP_INTERVAL
+from framework.mobile import profiler
+from framework.mobile.artifacts import get_artifact_pipeline
+from framework.mobile.baseline_store import get_baseline_store
 from framework.readers.fileReader import FileReader
-from selenium.webdriver.common.actions.action_builder import ActionBuilder
+from framework.readers.jsonReader import get_config_reader
 from selenium.webdriver.common.keys import Keys
 import time
+from contextlib import contextmanager
+
+
+class _CachedLookup:
+    """Stands in for the driver so a locator condition is evaluated on an already resolved element"""
+
+    def __init__(self, element):
+        self._element = element
+
+    def find_element(self, by=None, value=None):
+        return self._element
 
-CONFIG_PATH = "config/TestConfig.json"
 
 class Element:
 
     @staticmethod
     def load_config():
-        if not os.path.exists(CONFIG_PATH):
-            print(f"❌ Config file '{CONFIG_PATH}' not found.")
-            sys.exit(1)
-        with open(CONFIG_PATH) as f:
-            return json.load(f)
+        """Returns the parsed TestConfig.json from the shared, mtime-aware config cache"""
+        return get_config_reader().get_config()
 
     def __init__(self, driver, file_path):
         text_print(f"\n Initializing Element class with file_path: {file_path}",'green')  # Debug log
@@ -41,102 +53,147 @@ class Element:
         self.file_path = file_path
         self.locators = self.load_locators()
         self.driver = driver
+        # Opt-in per-screen WebElement cache, see enable_element_cache()
+        self._element_cache = None
         text_print("Element class initialized successfully",'green')  # Debug log
 
     def load_locators(self):
-        try:
-            with open(self.file_path, 'r', encoding='utf-8') as file:
-                locators = json.load(file)
-                return locators
-        except Exception as e:
-            print(f"Error loading locator file: {e}")
-            return {}
+        """Returns the compiled (By, value) locators shared through the locator registry"""
+        return load_locators(self.file_path)
 
     def get_locator(self, locator_name):
-        locator = self.locators.get(locator_name)
-        if not locator:
-            raise ValueError(f"Locator '{locator_name}' not found in the locators file.")
-        return locator
+        return get_locator(self.locators, locator_name)
 
     def _find_element(self, locator):
-        locator_type = locator.get("locator_type").lower()
-        locator_value = locator.get("locator")  # Direct reference to locator
-        
-        by_type = locator_map.get(locator_type)
-        if not by_type:
-            raise ValueError(f"Unsupported locator type: {locator_type}")
-            
-        return self.driver.find_element(by_type, locator_value)
+        start = time.monotonic()
+        try:
+            element = self.driver.find_element(*locator)
+        except NoSuchElementException:
+            profiler.record(locator, time.monotonic() - start, found=False)
+            raise
+        profiler.record(locator, time.monotonic() - start, driver=self.driver)
+        return element
+
+    def enable_element_cache(self, watch_activity=False):
+        """
+        Reuses resolved elements across actions on the same locator until they go stale.
+
+        Args:
+            watch_activity (bool): Also drop cached elements when the Android activity changes
+                (costs one extra call per cached lookup)
+        """
+        self._element_cache = ElementCache(self.driver, watch_activity=watch_activity)
+
+    def disable_element_cache(self):
+        self._element_cache = None
+
+    @contextmanager
+    def cached_elements(self, watch_activity=False):
+        """
+        Scopes the element cache to one screen.
+
+        Usage:
+            with self.element.cached_elements():
+                self.element.enter_text('phone_number_textbox', '9876543210')
+                self.element.clear_text('phone_number_textbox')
+        """
+        previous = self._element_cache
+        self.enable_element_cache(watch_activity=watch_activity)
+        try:
+            yield self._element_cache
+        finally:
+            self._element_cache = previous
+
+    def _locate(self, locator_name, condition, timeout):
+        """Resolves an element through the cache (when enabled) or an adaptive wait on condition"""
+        locator = self.get_locator(locator_name)
+        if self._element_cache is not None:
+            element = self._element_cache.get(locator_name)
+            if element is not None:
+                # The cache skips the lookup, not the condition: a cached button may still be disabled or hidden
+                try:
+                    return AdaptiveWait(_CachedLookup(element), timeout).until(condition(locator))
+                except StaleElementReferenceException:
+                    self._element_cache.invalidate(locator_name)
+        element = AdaptiveWait(self.driver, timeout, key=locator).until(condition(locator))
+        if self._element_cache is not None:
+            self._element_cache.put(locator_name, element)
+        return element
+
+    def _with_element(self, locator_name, condition, timeout, action):
+        """
+        Runs action(element), re-resolving once if a cached element turned out to be stale.
+        """
+        element = self._locate(locator_name, condition, timeout)
+        try:
+            return action(element)
+        except StaleElementReferenceException:
+            if self._element_cache is None:
+                raise
+            self._element_cache.invalidate(locator_name)
+            return action(self._locate(locator_name, condition, timeout))
 
     def tap_on_element(self, locator_name, timeout=10):
         try:
-            locator = self.get_locator(locator_name)
-            locator_type = locator.get("locator_type").lower()
-            locator_value = locator.get("locator")
-            
-            by_type = locator_map.get(locator_type)
-            if not by_type:
-                raise ValueError(f"Unsupported locator type: {locator_type}")
-            
-            # Wait for element to be clickable
-            element = WebDriverWait(self.driver, timeout).until(
-                EC.element_to_be_clickable((by_type, locator_value))
-            )
-            config = self.load_config()
-            use_highlight_element = config["config"].get("hightlight_element", False)
-            if use_highlight_element:
-                # 🔴 Capture screenshot with red box before click
-                highlight_element(self.driver, element, label=locator_name)
+            def tap(element):
+                if get_config_reader().hightlight_element:
+                    # 🔴 Capture screenshot with red box before click
+                    highlight_element(self.driver, element, label=locator_name)
+                element.click()
 
-            element.click()
+            # Wait for element to be clickable
+            self._with_element(locator_name, EC.element_to_be_clickable, timeout, tap)
             text_print(f"Clicked on {locator_name}",'green')
         except TimeoutException:
             raise TimeoutException(f"Element '{locator_name}' not clickable after {timeout} seconds")
 
+    def gesture(self, timeout=10):
+        """
+        Starts a batched input sequence; nothing is sent until perform().
+
+        Taps accept locator names, located (and cached, see cached_elements()) when the
+        step is added. The whole sequence is one W3C actions request.
+
+        Usage:
+            self.element.gesture().tap('pin_field').keys('4321').key(Keys.ENTER).perform()
+        """
+        return Gesture(self.driver, locate=lambda name: self._locate(name, EC.element_to_be_clickable, timeout))
+
     def press_number_keys(self, numbers):
-        key_map = {
-            0: 7, 1: 8, 2: 9, 3: 10, 4: 11,
-            5: 12, 6: 13, 7: 14, 8: 15, 9: 16
-        }
+        """
+        Presses digit keys in one request.
 
+        Args:
+            numbers (str | list): Digits as "123" (non-digits are skipped) or [1, 2, 3]
+        """
         # Support input as string "123" or list [1, 2, 3]
         if isinstance(numbers, str):
             numbers = [int(n) for n in numbers if n.isdigit()]
 
         for number in numbers:
-            keycode = key_map.get(number)
-            if keycode is not None:
-                self.driver.press_keycode(keycode)
-                text_print(f"Pressed key {number}", 'green')
-            else:
+            if number not in range(10):
                 raise ValueError(f"Invalid number: {number}")
+
+        digits = "".join(str(number) for number in numbers)
+        Gesture(self.driver).keys(digits).perform()
+        text_print(f"Pressed keys {digits}", 'green')
     
-    def multi_tap(self, locator_name, tap_count=1, timeout=10):
+    def multi_tap(self, locator_name, tap_count=1, timeout=10, interval=TAP_INTERVAL):
         """
-        Clicks on an element multiple times.
+        Taps on an element multiple times in one request.
 
         Args:
             locator_name (str): Name of the locator in the JSON file
-            tap_count (int): Number of times to click the element (default 1)
+            tap_count (int): Number of times to tap the element (default 1)
             timeout (int): Maximum time to wait for element presence (default 10 seconds)
+            interval (int): Milliseconds between taps; below 300 the taps may be read as a double- or triple-tap
         """
         try:
-            locator = self.get_locator(locator_name)
-            locator_type = locator.get("locator_type").lower()
-            locator_value = locator.get("locator")
-            
-            by_type = locator_map.get(locator_type)
-            if not by_type:
-                raise ValueError(f"Unsupported locator type: {locator_type}")
-            
-            # Wait for element to be clickable
-            element = WebDriverWait(self.driver, timeout).until(
-                EC.element_to_be_clickable((by_type, locator_value))
-            )
-            
-            # Perform multiple clicks
-            for _ in range(tap_count):
-                element.click()
+            def tap_repeatedly(element):
+                Gesture(self.driver).tap(element, count=tap_count, interval=interval).perform()
+
+            # Wait for element to be clickable, then perform multiple taps
+            self._with_element(locator_name, EC.element_to_be_clickable, timeout, tap_repeatedly)
             
             text_print(f"Clicked {tap_count} times on {locator_name}", 'green')
         except TimeoutException:
@@ -154,30 +211,21 @@ class Element:
             timeout (int): Maximum time to wait for element presence (default 10 seconds)
         """
         try:
-            locator = self.get_locator(locator_name)
-            locator_type = locator.get("locator_type").lower()
-            locator_value = locator.get("locator")
-            
-            by_type = locator_map.get(locator_type)
-            if not by_type:
-                raise ValueError(f"Unsupported locator type: {locator_type}")
-            
+            def long_press(element):
+                # Create touch action chain
+                actions = ActionChains(self.driver)
+                touch_input = PointerInput(interaction.POINTER_TOUCH, "touch")
+                actions.w3c_actions = ActionBuilder(self.driver, mouse=touch_input)
+
+                # Perform long press
+                actions.w3c_actions.pointer_action.move_to(element)
+                actions.w3c_actions.pointer_action.click_and_hold()
+                actions.pause(duration / 1000)  # Convert milliseconds to seconds
+                actions.release()
+                actions.perform()
+
             # Wait for element to be clickable
-            element = WebDriverWait(self.driver, timeout).until(
-                EC.element_to_be_clickable((by_type, locator_value))
-            )
-            
-            # Create touch action chain
-            actions = ActionChains(self.driver)
-            touch_input = PointerInput(interaction.POINTER_TOUCH, "touch")
-            actions.w3c_actions = ActionBuilder(self.driver, mouse=touch_input)
-            
-            # Perform long press
-            actions.w3c_actions.pointer_action.move_to(element)
-            actions.w3c_actions.pointer_action.click_and_hold()
-            actions.pause(duration / 1000)  # Convert milliseconds to seconds
-            actions.release()
-            actions.perform()
+            self._with_element(locator_name, EC.element_to_be_clickable, timeout, long_press)
             
             text_print(f"Long pressed on {locator_name} for {duration}ms", 'green')
         except TimeoutException:
@@ -187,25 +235,15 @@ class Element:
 
     def enter_text(self, locator_name, text_to_enter, timeout=10):
         try:
-            locator = self.get_locator(locator_name)
-            locator_type = locator.get("locator_type").lower()
-            locator_value = locator.get("locator")
-            
-            by_type = locator_map.get(locator_type)
-            if not by_type:
-                raise ValueError(f"Unsupported locator type: {locator_type}")
-            
+            def type_text(element):
+                element.clear()
+                element.send_keys(text_to_enter)
+                if get_config_reader().hightlight_element:
+                    # 🔴 Capture screenshot with red box before click
+                    highlight_element(self.driver, element, label=locator_name)
+
             # Wait for element to be present and interactable
-            element = WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located((by_type, locator_value))
-            )
-            element.clear()
-            element.send_keys(text_to_enter)
-            config = self.load_config()
-            use_highlight_element = config["config"].get("hightlight_element", False)
-            if use_highlight_element:
-                # 🔴 Capture screenshot with red box before click
-                highlight_element(self.driver, element, label=locator_name)
+            self._with_element(locator_name, EC.presence_of_element_located, timeout, type_text)
             text_print(f"Entered text in {locator_name}: {text_to_enter}", 'green')
         except TimeoutException:
             raise TimeoutException(f"Element '{locator_name}' not present after {timeout} seconds")
@@ -221,25 +259,14 @@ class Element:
                 timeout (int): Maximum time to wait for element presence (default 10 seconds)
             """
             try:
-                locator = self.get_locator(locator_name)
-                locator_type = locator.get("locator_type").lower()
-                locator_value = locator.get("locator")
-                
-                by_type = locator_map.get(locator_type)
-                if not by_type:
-                    raise ValueError(f"Unsupported locator type: {locator_type}")
-                
+                def replace_text(element):
+                    # Clear existing text, then enter new text
+                    element.clear()
+                    element.send_keys(text_to_enter)
+
                 # Wait for element to be present and interactable
-                element = WebDriverWait(self.driver, timeout).until(
-                    EC.presence_of_element_located((by_type, locator_value))
-                )
-                
-                # Clear existing text
-                element.clear()
+                self._with_element(locator_name, EC.presence_of_element_located, timeout, replace_text)
                 text_print(f"Cleared text from {locator_name}", 'green')
-                
-                # Enter new text
-                element.send_keys(text_to_enter)
                 text_print(f"Entered new text in {locator_name}: {text_to_enter}", 'green')
                 
             except TimeoutException:
@@ -256,18 +283,8 @@ class Element:
             timeout (int): Maximum time to wait for element presence (default 10 seconds)
         """
         try:
-            locator = self.get_locator(locator_name)
-            locator_type = locator.get("locator_type").lower()
-            locator_value = locator.get("locator")
-            by_type = locator_map.get(locator_type)
-            if not by_type:
-                raise ValueError(f"Unsupported locator type: {locator_type}")
-            # Wait for element to be present and interactable
-            element = WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located((by_type, locator_value))
-            )
-            # Clear existing text
-            element.clear()
+            # Wait for element to be present and interactable, then clear existing text
+            self._with_element(locator_name, EC.presence_of_element_located, timeout, lambda element: element.clear())
             text_print(f"Cleared text from {locator_name}", 'green')
 
         except TimeoutException:
@@ -331,13 +348,11 @@ class Element:
         try:
             start_locator = self.get_locator(start_locator_name)
             end_locator = self.get_locator(end_locator_name)
-            start_element = WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located(
-                    (locator_map[start_locator.get("locator_type").lower()], start_locator.get("locator")))
+            start_element = AdaptiveWait(self.driver, timeout, key=start_locator).until(
+                EC.presence_of_element_located(start_locator)
             )
-            end_element = WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located(
-                    (locator_map[end_locator.get("locator_type").lower()], end_locator.get("locator")))
+            end_element = AdaptiveWait(self.driver, timeout, key=end_locator).until(
+                EC.presence_of_element_located(end_locator)
             )
             start_x, start_y = start_element.location['x'], start_element.location['y']
             end_x, end_y = end_element.location['x'], end_element.location['y']
@@ -395,18 +410,8 @@ class Element:
             coords = swipe_coords[direction.lower()]
             
             # Perform swipe
-            action = self.driver.action()
-            if duration:
-                action.press(x=coords['start_x'], y=coords['start_y']) \
-                    .wait(duration) \
-                    .move_to(x=coords['end_x'], y=coords['end_y']) \
-                    .release() \
-                    .perform()
-            else:
-                action.press(x=coords['start_x'], y=coords['start_y']) \
-                    .move_to(x=coords['end_x'], y=coords['end_y']) \
-                    .release() \
-                    .perform()
+            Gesture(self.driver).swipe(coords['start_x'], coords['start_y'], coords['end_x'], coords['end_y'],
+                                       duration=duration or 250).perform()
                 
             text_print(f"Swiped {direction}", 'green')
             
@@ -447,6 +452,44 @@ class Element:
         except Exception as e:
             raise Exception(f"Error performing swipe: {str(e)}")
 
+    def tap_on_text(self, text, regions=None, exact=False, index=0, timeout=10):
+        """
+        Taps on text found on screen with OCR, for canvas, game and Unity screens without locators.
+
+        Args:
+            text (str): Word or phrase to tap (case and punctuation are ignored)
+            regions (list, optional): (x, y, width, height) rectangles to search instead of the whole screen
+            exact (bool): Require whole-word matches
+            index (int): Which match to tap when the text appears more than once (most confident first)
+            timeout (int): Maximum time to wait for the text to appear (default 10 seconds)
+
+        Returns:
+            TextMatch: The match that was tapped
+        """
+        from framework.AI.ocr import find_text_on_screen
+
+        try:
+            matches = AdaptiveWait(self.driver, timeout, key=("ocr", text)).until(
+                lambda driver: find_text_on_screen(driver, text, regions, exact)[index:] or False
+            )
+            match = matches[0]
+            x, y = match.center
+
+            actions = ActionChains(self.driver)
+            touch_input = PointerInput(interaction.POINTER_TOUCH, "touch")
+            actions.w3c_actions = ActionBuilder(self.driver, mouse=touch_input)
+            actions.w3c_actions.pointer_action.move_to_location(x, y)
+            actions.w3c_actions.pointer_action.pointer_down()
+            actions.w3c_actions.pointer_action.pointer_up()
+            actions.perform()
+            text_print(f"Tapped on text '{match.text}' at ({x}, {y})", 'green')
+            return match
+
+        except TimeoutException:
+            raise TimeoutException(f"Text '{text}' not found on screen after {timeout} seconds")
+        except Exception as e:
+            raise Exception(f"Error tapping on text '{text}': {str(e)}")
+
     def get_text(self, locator_name, timeout=10):
         """
         Gets text from the specified element.
@@ -459,21 +502,9 @@ class Element:
             str: Text content of the element
         """
         try:
-            locator = self.get_locator(locator_name)
-            locator_type = locator.get("locator_type").lower()
-            locator_value = locator.get("locator")
-            
-            by_type = locator_map.get(locator_type)
-            if not by_type:
-                raise ValueError(f"Unsupported locator type: {locator_type}")
-            
-            # Wait for element to be present
-            element = WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located((by_type, locator_value))
-            )
-            
-            # Get text from element
-            element_text = element.text
+            # Wait for element to be present, then get its text
+            element_text = self._with_element(locator_name, EC.presence_of_element_located, timeout,
+                                              lambda element: element.text)
             text_print(f"Text from {locator_name}: {element_text}", 'green')
             
             return element_text
@@ -483,6 +514,21 @@ class Element:
         except Exception as e:
             raise Exception(f"Error getting text from '{locator_name}': {str(e)}")
 
+    def get_texts(self, locator_names):
+        """
+        Gets the text of several elements from a single page-source snapshot.
+
+        Args:
+            locator_names (list): Names of the locators in the JSON file
+
+        Returns:
+            dict: Locator name to text (None when the element is not on screen)
+        """
+        snapshot = PageSnapshot.capture(self.driver, self.locators)
+        texts = {name: snapshot.get_text(name) for name in locator_names}
+        text_print(f"Texts from snapshot: {texts}", 'green')
+        return texts
+
     def get_attribute(self, locator_name, attribute_name, timeout=10):
         """
         Gets attribute value from the specified element.
@@ -496,21 +542,9 @@ class Element:
             str: Attribute value of the element
         """
         try:
-            locator = self.get_locator(locator_name)
-            locator_type = locator.get("locator_type").lower()
-            locator_value = locator.get("locator")
-            
-            by_type = locator_map.get(locator_type)
-            if not by_type:
-                raise ValueError(f"Unsupported locator type: {locator_type}")
-            
-            # Wait for element to be present
-            element = WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located((by_type, locator_value))
-            )
-            
-            # Get attribute value from element
-            attribute_value = element.get_attribute(attribute_name)
+            # Wait for element to be present, then get the attribute value
+            attribute_value = self._with_element(locator_name, EC.presence_of_element_located, timeout,
+                                                 lambda element: element.get_attribute(attribute_name))
             text_print(f"Attribute '{attribute_name}' from {locator_name}: {attribute_value}", 'green')
             
             return attribute_value
@@ -520,7 +554,7 @@ class Element:
         except Exception as e:
             raise Exception(f"Error getting attribute '{attribute_name}' from '{locator_name}': {str(e)}")
 
-    def take_element_screenshot(self, locator_name, filename=None, timeout=10):
+    def take_element_screenshot(self, locator_name, filename=None, timeout=10, update_baseline=False):
         """
         Takes a screenshot of the specified element.
 
@@ -528,28 +562,19 @@ class Element:
             locator_name (str): Name of the locator in the JSON file
             filename (str, optional): Name for the screenshot file (default: element_name_timestamp.png)
             timeout (int): Maximum time to wait for element presence (default 10 seconds)
+            update_baseline (bool): Also record the image as this locator's baseline for the
+                current device profile (default False: the capture only goes to captures/)
 
         Returns:
-            str: Path to the saved screenshot file
+            str: Path of the capture in captures/. It is written in the background and exists once
+                get_artifact_pipeline().flush() has returned.
         """
         try:
-            from pathlib import Path
-            
-            # Create baseline_img directory if it doesn't exist
-            baseline_dir = Path("baseline_img")
-            baseline_dir.mkdir(exist_ok=True)
-            
             locator = self.get_locator(locator_name)
-            locator_type = locator.get("locator_type").lower()
-            locator_value = locator.get("locator")
-            
-            by_type = locator_map.get(locator_type)
-            if not by_type:
-                raise ValueError(f"Unsupported locator type: {locator_type}")
             
             # Wait for element to be present
-            element = WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located((by_type, locator_value))
+            element = AdaptiveWait(self.driver, timeout, key=locator).until(
+                EC.presence_of_element_located(locator)
             )
             
             # Generate filename if not provided
@@ -560,11 +585,8 @@ class Element:
             elif not filename.endswith('.png'):
                 filename += '.png'
             
-            # Create full path for the screenshot
-            screenshot_path = baseline_dir / filename
-            
-            # Take screenshot
-            element.screenshot(str(screenshot_path))
+            screenshot = element.screenshot_as_png
+            screenshot_path = self._save_capture(screenshot, filename, locator_name, update_baseline)
             text_print(f"Screenshot saved for {locator_name}: {screenshot_path}", 'green')
             
             return str(screenshot_path)
@@ -574,84 +596,99 @@ class Element:
         except Exception as e:
             raise Exception(f"Error taking screenshot of '{locator_name}': {str(e)}")
 
-    def compare_element_screenshots(self, locator_name, baseline_image, threshold=0.95, timeout=10):
+    def compare_element_screenshots(self, locator_name, baseline_image, threshold=0.95, timeout=10,
+                                    ignore_regions=None):
         """
-        Compares a current element screenshot with a baseline image from baseline_img folder.
+        Compares a current element screenshot with its stored baseline (see take_element_screenshot(update_baseline=True)).
 
         Args:
             locator_name (str): Name of the locator in the JSON file
-            baseline_image (str): Name of the baseline image file in baseline_img folder
+            baseline_image (str): Name the baseline was saved under (loose files in baseline_img are imported)
             threshold (float): Similarity threshold (0.0 to 1.0, default 0.95)
             timeout (int): Maximum time to wait for element presence (default 10 seconds)
+            ignore_regions (list, optional): (x, y, width, height) rectangles, relative to the element,
+                left out of the comparison
 
         Returns:
             bool: True if images match within threshold, False otherwise
         """
         try:
-            from PIL import Image
-            import cv2
-            import numpy as np
-            from pathlib import Path
+            locator = self.get_locator(locator_name)
 
-            # Create and get baseline directory path
-            baseline_dir = Path("baseline_img")
-            baseline_dir.mkdir(exist_ok=True)
-            
-            # Construct full path for baseline image
-            if not baseline_image.endswith('.png'):
-                baseline_image += '.png'
-            baseline_path = baseline_dir / baseline_image
+            # Wait for element to be present
+            element = AdaptiveWait(self.driver, timeout, key=locator).until(
+                EC.presence_of_element_located(locator)
+            )
 
-            # Take current screenshot
-            current_screenshot = self.take_element_screenshot(locator_name, timeout=timeout)
-            
-            # Load images
-            current_img = cv2.imread(current_screenshot)
-            baseline_img = cv2.imread(str(baseline_path))
-            
-            # Verify baseline image exists
-            if not baseline_path.exists():
-                raise FileNotFoundError(f"Baseline image not found: {baseline_path}")
-            
-            # Resize images to same size for comparison
-            baseline_img = cv2.resize(baseline_img, (current_img.shape[1], current_img.shape[0]))
-            
-            # Calculate similarity score
-            similarity = cv2.matchTemplate(current_img, baseline_img, cv2.TM_CCOEFF_NORMED)[0][0]
-            
-            # Compare with threshold
-            matches = similarity >= threshold
-            
-            if matches:
-                text_print(f"Screenshots match for {locator_name} (similarity: {similarity:.2%})", 'green')
+            # The current screenshot stays in memory
+            result = self._compare_with_baseline(element.screenshot_as_png, baseline_image, threshold,
+                                                 ignore_regions or [], label=locator_name,
+                                                 locator_name=locator_name)
+
+            if result.matches:
+                text_print(f"Screenshots match for {locator_name} (similarity: {result.similarity:.2%})", 'green')
             else:
-                text_print(f"Screenshots do not match for {locator_name} (similarity: {similarity:.2%})", 'red')
-            
-            # Clean up temporary screenshot
-            Path(current_screenshot).unlink()
-            
-            return matches
-            
+                text_print(f"Screenshots do not match for {locator_name} (similarity: {result.similarity:.2%}, "
+                           f"{len(result.changed_tiles)} changed tile(s))", 'red')
+
+            return result.matches
+
         except Exception as e:
             raise Exception(f"Error comparing screenshots for '{locator_name}': {str(e)}")
 
-    def take_full_screenshot(self, filename=None):
+    def _save_capture(self, png_bytes, filename, locator_name=None, update_baseline=False):
+        """Writes png_bytes to captures/ in the background; update_baseline also records it in the baseline store"""
+        if update_baseline:
+            store = get_baseline_store()
+            store.put(store.profile(self.driver), filename, png_bytes, locator=locator_name)
+        capture_path = Path("captures") / filename
+        get_artifact_pipeline().save_bytes(png_bytes, capture_path)
+        return capture_path
+
+    def _compare_with_baseline(self, current_png, baseline_image, threshold, ignore_regions, label,
+                               locator_name=None):
+        """Diffs in-memory PNG bytes against a stored baseline; a heatmap is saved when they differ"""
+        from framework.mobile.visual_diff import compare_images, encode_png
+
+        store = get_baseline_store()
+        # Raises FileNotFoundError when there is no baseline for this device profile
+        baseline = store.get(store.profile(self.driver), baseline_image, locator=locator_name)
+
+        result = compare_images(current_png, baseline, threshold=threshold, ignore_regions=ignore_regions)
+        if not result.matches and result.heatmap is not None:
+            import allure
+            heatmap_png = encode_png(result.heatmap)
+            diff_path = Path("visual_diffs") / f"{label}_{Path(baseline_image).stem}_diff.png"
+            pipeline = get_artifact_pipeline()
+            pipeline.save_bytes(heatmap_png, diff_path)
+            pipeline.attach_to_allure(heatmap_png, diff_path.name, allure.attachment_type.PNG)
+            text_print(f"Visual diff heatmap: {diff_path}", 'yellow')
+        return result
+
+    def _status_bar_region(self):
+        """(x, y, width, height) of the Android status bar, or None if the driver cannot tell"""
+        try:
+            status_bar = self.driver.get_system_bars().get("statusBar", {})
+        except Exception:
+            return None
+        if not status_bar.get("visible", True) or not status_bar.get("height"):
+            return None
+        return (status_bar.get("x", 0), status_bar.get("y", 0), status_bar["width"], status_bar["height"])
+
+    def take_full_screenshot(self, filename=None, update_baseline=False):
         """
         Takes a screenshot of the entire screen.
 
         Args:
             filename (str, optional): Name for the screenshot file (default: fullscreen_timestamp.png)
+            update_baseline (bool): Also record the image as the full-screen baseline for the
+                current device profile (default False: the capture only goes to captures/)
 
         Returns:
-            str: Path to the saved screenshot file
+            str: Path of the capture in captures/. It is written in the background and exists once
+                get_artifact_pipeline().flush() has returned.
         """
         try:
-            from pathlib import Path
-            
-            # Create baseline_img directory if it doesn't exist
-            baseline_dir = Path("baseline_img")
-            baseline_dir.mkdir(exist_ok=True)
-            
             # Generate filename if not provided
             if not filename:
                 from datetime import datetime
@@ -660,11 +697,8 @@ class Element:
             elif not filename.endswith('.png'):
                 filename += '.png'
             
-            # Create full path for the screenshot
-            screenshot_path = baseline_dir / filename
-            
-            # Take screenshot
-            self.driver.save_screenshot(str(screenshot_path))
+            screenshot_path = self._save_capture(self.driver.get_screenshot_as_png(), filename,
+                                                 update_baseline=update_baseline)
             text_print(f"Full screenshot saved: {screenshot_path}", 'green')
             
             return str(screenshot_path)
@@ -672,58 +706,39 @@ class Element:
         except Exception as e:
             raise Exception(f"Error taking full screenshot: {str(e)}")
 
-    def compare_full_screenshots(self, baseline_image, threshold=0.95):
+    def compare_full_screenshots(self, baseline_image, threshold=0.95, ignore_regions=None,
+                                 ignore_status_bar=False):
         """
-        Compares a current full screen screenshot with a baseline image from baseline_img folder.
+        Compares a current full screen screenshot with its stored baseline (see take_full_screenshot(update_baseline=True)).
 
         Args:
-            baseline_image (str): Name of the baseline image file in baseline_img folder
+            baseline_image (str): Name the baseline was saved under (loose files in baseline_img are imported)
             threshold (float): Similarity threshold (0.0 to 1.0, default 0.95)
+            ignore_regions (list, optional): (x, y, width, height) rectangles left out of the comparison
+            ignore_status_bar (bool): Leave the status bar (clock, battery, notifications) out of the comparison
 
         Returns:
             bool: True if images match within threshold, False otherwise
         """
         try:
-            from PIL import Image
-            import cv2
-            import numpy as np
-            from pathlib import Path
+            regions = list(ignore_regions or [])
+            if ignore_status_bar:
+                status_bar = self._status_bar_region()
+                if status_bar:
+                    regions.append(status_bar)
+
+            # The current screenshot stays in memory
+            result = self._compare_with_baseline(self.driver.get_screenshot_as_png(), baseline_image,
+                                                 threshold, regions, label="fullscreen")
+
+            if result.matches:
+                text_print(f"Full screenshots match (similarity: {result.similarity:.2%})", 'green')
+            else:
+                text_print(f"Full screenshots do not match (similarity: {result.similarity:.2%}, "
+                           f"{len(result.changed_tiles)} changed tile(s))", 'red')
 
-            # Create and get baseline directory path
-            baseline_dir = Path("baseline_img")
-            baseline_dir.mkdir(exist_ok=True)
-            
-            # Construct full path for baseline image
-            if not baseline_image.endswith('.png'):
-                baseline_image += '.png'
-            baseline_path = baseline_dir / baseline_image
+            return result.matches
 
-            # Take current screenshot
-            current_screenshot = self.take_full_screenshot()
-            
-            # Load images
-            current_img = cv2.imread(current_screenshot)
-            baseline_img = cv2.imread(str(baseline_path))
-            
-            # Verify baseline image exists
-            if not baseline_path.exists():
-                raise FileNotFoundError(f"Baseline image not found: {baseline_path}")
-            
-            # Rest of the comparison logic remains the same
-            baseline_img = cv2.resize(baseline_img, (current_img.shape[1], current_img.shape[0]))
-            similarity = cv2.matchTemplate(current_img, baseline_img, cv2.TM_CCOEFF_NORMED)[0][0]
-            matches = similarity >= threshold
-            
-            if matches:
-                text_print(f"Full screenshots match (similarity: {similarity:.2%})", 'green')
-            else:
-                text_print(f"Full screenshots do not match (similarity: {similarity:.2%})", 'red')
-            
-            # Clean up temporary screenshot
-            Path(current_screenshot).unlink()
-            
-            return matches
-            
         except Exception as e:
             raise Exception(f"Error comparing full screenshots: {str(e)}")
 
@@ -786,10 +801,10 @@ class Element:
             filename (str, optional): Name for the recording file (default: recording_timestamp.mp4)
 
         Returns:
-            str: Path to the saved recording file
+            str: Path of the recording file. It is written in the background and exists once
+                get_artifact_pipeline().flush() has returned (also done when the test session ends).
         """
         try:
-            import base64
             import os
             from pathlib import Path
             
@@ -811,11 +826,10 @@ class Element:
             # Stop recording and get base64 data
             base64_data = self.driver.stop_recording_screen()
             
-            # Decode and save the recording
-            with open(recording_path, "wb") as f:
-                f.write(base64.b64decode(base64_data))
+            # Decode and save the recording in the background
+            get_artifact_pipeline().save_base64(base64_data, recording_path)
             
-            text_print(f"Screen recording saved: {recording_path}", 'green')
+            text_print(f"Screen recording saving to: {recording_path}", 'green')
             return str(recording_path)
             
         except Exception as e:
@@ -829,7 +843,8 @@ class Element:
             filename (str, optional): Name for the log file (default: device_log_timestamp.txt)
         
         Returns:
-            str: Path to the saved log file
+            str: Path of the log file. It is written in the background and exists once
+                get_artifact_pipeline().flush() has returned (also done when the test session ends).
         """
         try:
             from datetime import datetime
@@ -852,12 +867,10 @@ class Element:
             # Get device logs
             logs = self.driver.get_log('logcat')
             
-            # Write logs to file
-            with open(log_path, 'w', encoding='utf-8') as f:
-                for log in logs:
-                    f.write(f"{log['timestamp']} {log['level']} {log['message']}\n")
+            # Write logs to file in the background
+            get_artifact_pipeline().save_device_logs(logs, log_path)
             
-            text_print(f"Device logs saved: {log_path}", 'green')
+            text_print(f"Device logs saving to: {log_path}", 'green')
             return str(log_path)
             
         except Exception as e:
@@ -876,11 +889,8 @@ class Element:
         try:
             # Get element locator and wait for presence
             locator = self.get_locator(locator_name)
-            element = WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located((
-                    locator_map[locator.get("locator_type").lower()],
-                    locator.get("locator")
-                ))
+            element = AdaptiveWait(self.driver, timeout, key=locator).until(
+                EC.presence_of_element_located(locator)
             )
             
             # Get element location and size
@@ -992,13 +1002,8 @@ class Element:
         for attempt in range(max_attempts):
             try:
                 locator = self.get_locator(locator_name)
-                locator_type = locator.get("locator_type").lower()
-                locator_value = locator.get("locator")
-                by_type = locator_map.get(locator_type)
-                if not by_type:
-                    raise ValueError(f"Unsupported locator type: {locator_type}")
-                element = WebDriverWait(self.driver, timeout).until(
-                    EC.presence_of_element_located((by_type, locator_value))
+                element = AdaptiveWait(self.driver, timeout, key=locator).until(
+                    EC.presence_of_element_located(locator)
                 )
                 if element.is_displayed():
                     text_print(f"Element '{locator_name}' is visible after {attempt+1} scroll(s)", 'green')
@@ -1029,6 +1034,45 @@ class Element:
         except Exception as e:
             text_print(f"Could not show keyboard: {e}", 'red')
     
+    CHROME_FIRST_RUN_BUTTONS = (
+        "com.android.chrome:id/terms_accept",
+        "com.android.chrome:id/next_button",
+        "com.android.chrome:id/negative_button",
+    )
+    CHROME_URL_BAR = "com.android.chrome:id/url_bar"
+
+    def _launch_chrome(self, wait_time):
+        """
+        Starts Chrome, clicks through its first-run popups and returns the address bar.
+        Waits on the screen itself instead of fixed sleeps.
+        """
+        from selenium.webdriver.common.by import By
+
+        self.driver.start_activity("com.android.chrome", "com.google.android.apps.chrome.Main")
+
+        def address_bar_or_popup(driver):
+            for btn_id in self.CHROME_FIRST_RUN_BUTTONS:
+                buttons = driver.find_elements(By.ID, btn_id)
+                if buttons:
+                    return buttons[0]
+            bars = driver.find_elements(By.ID, self.CHROME_URL_BAR)
+            return bars[0] if bars else None
+
+        # Each popup click leads to either the next popup or the browser itself
+        for _ in range(len(self.CHROME_FIRST_RUN_BUTTONS) + 1):
+            target = AdaptiveWait(self.driver, wait_time).until(address_bar_or_popup)
+            if target.get_attribute("resourceId") == self.CHROME_URL_BAR:
+                return target
+            target.click()
+            try:
+                AdaptiveWait(self.driver, 3).until(EC.staleness_of(target))
+            except TimeoutException:
+                pass
+
+        return AdaptiveWait(self.driver, wait_time).until(
+            lambda d: d.find_element(By.ID, self.CHROME_URL_BAR)
+        )
+
     def open_url_in_chrome(self, url, wait_time=10):
         """
         Launches Chrome on Android and navigates to the specified URL using Appium.
@@ -1036,37 +1080,8 @@ class Element:
             url (str): The URL to open.
             wait_time (int): Seconds to wait for Chrome address bar (default: 10)
         """
-        from selenium.webdriver.common.by import By
-        from selenium.webdriver.common.keys import Keys
-        import time
         try:
-            # Start Chrome if not already started
-            self.driver.start_activity("com.android.chrome", "com.google.android.apps.chrome.Main")
-            time.sleep(2)  # Wait for Chrome to launch
-
-            # Handle Chrome's first run popups if present
-            try:
-                accept_btn = self.driver.find_elements(By.ID, "com.android.chrome:id/terms_accept")
-                if accept_btn:
-                    accept_btn[0].click()
-                    time.sleep(1)
-                next_btn = self.driver.find_elements(By.ID, "com.android.chrome:id/next_button")
-                if next_btn:
-                    next_btn[0].click()
-                    time.sleep(1)
-                no_thanks_btn = self.driver.find_elements(By.ID, "com.android.chrome:id/negative_button")
-                if no_thanks_btn:
-                    no_thanks_btn[0].click()
-                    time.sleep(1)
-            except Exception:
-                pass  # Ignore if not present
-
-            # Wait for the address bar to be present
-            from selenium.webdriver.support.ui import WebDriverWait
-            from selenium.webdriver.support import expected_conditions as EC
-            address_bar = WebDriverWait(self.driver, wait_time).until(
-                lambda d: d.find_element(By.ID, "com.android.chrome:id/url_bar")
-            )
+            address_bar = self._launch_chrome(wait_time)
             address_bar.click()
             address_bar.clear()
             address_bar.send_keys(url)
@@ -1082,53 +1097,33 @@ class Element:
             url (str): The payment URL to open in Chrome.
             wait_time (int): Seconds to wait for Chrome address bar (default: 10)
         """
-        from selenium.webdriver.common.by import By
-        from selenium.webdriver.support.ui import WebDriverWait
-
-        config = self.load_config()
+        android_config = get_config_reader().get_platform_config("android")
 
         # Save your app's package/activity for later
-        app_activity = config["config"]["android"]["capabilities"]["appActivity"]
-        app_package = config["config"]["android"]["appPath/appPackage"]
+        app_activity = android_config["capabilities"]["appActivity"]
+        app_package = android_config["appPath/appPackage"]
 
         # 1. Launch Chrome and open the payment URL
-        self.driver.start_activity("com.android.chrome", "com.google.android.apps.chrome.Main")
-        time.sleep(2)
-        try:
-            # Handle Chrome's first run popups if present
-            for btn_id in [
-                "com.android.chrome:id/terms_accept",
-                "com.android.chrome:id/next_button",
-                "com.android.chrome:id/negative_button"
-            ]:
-                btns = self.driver.find_elements(By.ID, btn_id)
-                if btns:
-                    btns[0].click()
-                    time.sleep(1)
-        except Exception:
-            pass
-
-        # Open the payment URL
-        address_bar = WebDriverWait(self.driver, wait_time).until(
-            lambda d: d.find_element(By.ID, "com.android.chrome:id/url_bar")
-        )
+        address_bar = self._launch_chrome(wait_time)
         address_bar.click()
         address_bar.clear()
         address_bar.send_keys(url)
         address_bar.send_keys(Keys.ENTER)
-        time.sleep(3)  # Wait for page to load
+        # Wait for page to load: the page source stops changing
+        wait_for_stable(
+            self.driver,
+            lambda driver: hashlib.sha1(driver.page_source.encode("utf-8")).digest(),
+            timeout=wait_time,
+        )
 
         # 2. Automate payment steps in Chrome here
         # Example: find and interact with payment elements using self.driver.find_element...
 
         # 3. After payment, switch back to your app
         self.driver.start_activity(app_package, app_activity)
-        time.sleep(2)
+        AdaptiveWait(self.driver, wait_time).until(lambda d: d.current_package == app_package)
         # Now you are back in your app and can continue automation
 
-        # Optionally, verify you are back in your app
-        # assert self.driver.current_package == app_package
-
     def scroll_by_coordinates(self, start_x, start_y, end_x, end_y, duration=500):
         """
         Scrolls the screen from one coordinate to another using Appium W3C Actions.
@@ -1160,44 +1155,35 @@ class Element:
         try:
 
             locator = self.get_locator(locator_name)
-
-            locator_type = locator.get("locator_type").lower()
-
-            locator_value = locator.get("locator")
-
-            by_type = locator_map.get(locator_type)
-
-            if not by_type:
-                raise ValueError(f"Unsupported locator type: {locator_type}")
-
             # Wait for element to be clickable
 
-            element = WebDriverWait(self.driver, timeout).until(
+            element = AdaptiveWait(self.driver, timeout, key=locator).until(
 
-                EC.element_to_be_clickable((by_type, locator_value))
+                EC.element_to_be_clickable(locator)
 
             )
 
-            config = self.load_config()
-
-            use_highlight_element = config["config"].get("hightlight_element", False)
-
-            if use_highlight_element:
+            if get_config_reader().hightlight_element:
                 highlight_element(self.driver, element, label=locator_name)
 
+            clipboard_before = self.driver.get_clipboard_text()
+
             # 📌 Tap on element
 
             element.click()
 
             text_print(f"Clicked on {locator_name}", 'green')
 
-            # ⏳ Wait a moment to allow clipboard to update
+            # ⏳ Wait until the clipboard changes (at most pause_after_click seconds)
 
-            time.sleep(pause_after_click)
+            def clipboard_changed(driver):
+                text = driver.get_clipboard_text()
+                return text if text != clipboard_before else None
 
-            # 📋 Get clipboard content
-
-            clipboard_text = self.driver.get_clipboard_text()
+            try:
+                clipboard_text = AdaptiveWait(self.driver, pause_after_click).until(clipboard_changed)
+            except TimeoutException:
+                clipboard_text = self.driver.get_clipboard_text()
 
             text_print(f"📋 Clipboard text retrieved: {clipboard_text}", 'blue')
 
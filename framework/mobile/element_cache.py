@@ -0,0 +1,49 @@
+class ElementCache:
+    """
+    Per-screen cache of resolved WebElements, keyed by locator name.
+
+    Entries are dropped when the element goes stale (the caller invalidates on
+    StaleElementReferenceException) and, with watch_activity, when the Android
+    foreground activity differs from the one the element was found on.
+    """
+
+    def __init__(self, driver, watch_activity=False):
+        self.driver = driver
+        self.watch_activity = watch_activity
+        self._elements = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _screen_key(self):
+        if not self.watch_activity:
+            return None
+        try:
+            return self.driver.current_activity
+        except Exception:
+            return None
+
+    def get(self, locator_name):
+        entry = self._elements.get(locator_name)
+        if entry is None:
+            self.misses += 1
+            return None
+        element, screen = entry
+        if self.watch_activity and screen != self._screen_key():
+            # The screen changed; everything found on the old one is suspect
+            self._elements.clear()
+            self.misses += 1
+            return None
+        self.hits += 1
+        return element
+
+    def put(self, locator_name, element):
+        self._elements[locator_name] = (element, self._screen_key())
+
+    def invalidate(self, locator_name=None):
+        if locator_name is None:
+            self._elements.clear()
+        else:
+            self._elements.pop(locator_name, None)
+
+    def __len__(self):
+        return len(self._elements)
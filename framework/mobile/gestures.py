@@ -0,0 +1,138 @@
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webelement import WebElement
+
+# W3C element reference key, as selenium encodes it
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+# Pause between repeated taps (milliseconds). Android reads a press that starts within
+# DOUBLE_TAP_TIMEOUT (300 ms) of the previous release as a double-tap, so this stays above it
+TAP_INTERVAL = 350
+# Pointer press length of a plain tap (milliseconds)
+TAP_DURATION = 50
+
+FINGER = "finger"
+KEYBOARD = "keyboard"
+
+
+class Gesture:
+    """
+    Compiles taps, key presses, swipes and pauses into one W3C actions payload,
+    so a whole input sequence costs a single round trip to Appium.
+
+    Steps run strictly in the order they were added: every step occupies one tick,
+    and the other input source pauses during it.
+
+    Usage:
+        Gesture(driver).keys("9876543210").key(Keys.ENTER).perform()
+        Gesture(driver).tap(element, count=2).pause(300).swipe(500, 1600, 500, 400).perform()
+    """
+
+    def __init__(self, driver, locate=None):
+        """
+        Args:
+            driver: Appium driver
+            locate (callable, optional): Resolves a locator name to a WebElement, so tap()
+                accepts locator names (Element.gesture() passes its own lookup)
+        """
+        self.driver = driver
+        self.locate = locate
+        self.steps = []
+
+    def _add(self, source, action):
+        self.steps.append((source, action))
+        return self
+
+    def _origin(self, target):
+        if isinstance(target, str):
+            if self.locate is None:
+                raise ValueError(f"Cannot resolve locator '{target}' without a locate function")
+            target = self.locate(target)
+        if isinstance(target, WebElement):
+            return {"origin": {ELEMENT_KEY: target.id}, "x": 0, "y": 0}
+        x, y = target
+        return {"origin": "viewport", "x": int(x), "y": int(y)}
+
+    def pause(self, milliseconds):
+        """Waits milliseconds on the device, between two steps"""
+        return self._add(None, {"type": "pause", "duration": int(milliseconds)})
+
+    def tap(self, target, count=1, interval=TAP_INTERVAL):
+        """
+        Taps target count times.
+
+        Args:
+            target: WebElement (tapped at its centre), (x, y) screen coordinates or a locator name
+            count (int): Number of taps
+            interval (int): Milliseconds between taps; below 300 the taps may be read as a double- or triple-tap
+        """
+        origin = self._origin(target)
+        for i in range(count):
+            if i:
+                self.pause(interval)
+            self._add(FINGER, {"type": "pointerMove", "duration": 0, **origin})
+            self._add(FINGER, {"type": "pointerDown", "button": 0})
+            self._add(FINGER, {"type": "pause", "duration": TAP_DURATION})
+            self._add(FINGER, {"type": "pointerUp", "button": 0})
+        return self
+
+    def long_press(self, target, duration=1000):
+        """Presses target for duration milliseconds"""
+        self._add(FINGER, {"type": "pointerMove", "duration": 0, **self._origin(target)})
+        self._add(FINGER, {"type": "pointerDown", "button": 0})
+        self._add(FINGER, {"type": "pause", "duration": int(duration)})
+        return self._add(FINGER, {"type": "pointerUp", "button": 0})
+
+    def swipe(self, start_x, start_y, end_x, end_y, duration=500):
+        """Drags from (start_x, start_y) to (end_x, end_y) over duration milliseconds"""
+        self._add(FINGER, {"type": "pointerMove", "duration": 0, "origin": "viewport",
+                           "x": int(start_x), "y": int(start_y)})
+        self._add(FINGER, {"type": "pointerDown", "button": 0})
+        self._add(FINGER, {"type": "pointerMove", "duration": int(duration), "origin": "viewport",
+                           "x": int(end_x), "y": int(end_y)})
+        return self._add(FINGER, {"type": "pointerUp", "button": 0})
+
+    def key(self, key):
+        """Presses and releases one key: a character, or a selenium Keys value such as Keys.ENTER"""
+        self._add(KEYBOARD, {"type": "keyDown", "value": key})
+        return self._add(KEYBOARD, {"type": "keyUp", "value": key})
+
+    def keys(self, text):
+        """Presses each character of text in turn (e.g. a phone number or a PIN)"""
+        for char in str(text):
+            self.key(char)
+        return self
+
+    def build(self):
+        """
+        The W3C actions payload of the steps added so far.
+
+        Returns:
+            dict: {"actions": [...]} with one input source per kind of step used
+        """
+        used = {source for source, _ in self.steps if source}
+        if not used:
+            # Pauses only; W3C needs a source to carry them
+            used = {FINGER}
+        sources = {}
+        if FINGER in used:
+            sources[FINGER] = {"type": "pointer", "id": FINGER, "parameters": {"pointerType": "touch"},
+                               "actions": []}
+        if KEYBOARD in used:
+            sources[KEYBOARD] = {"type": "key", "id": KEYBOARD, "actions": []}
+
+        for source, action in self.steps:
+            for name, encoded in sources.items():
+                if source == name or (source is None and name == next(iter(sources))):
+                    encoded["actions"].append(action)
+                else:
+                    # Keeps the sources in step: the other device idles through this tick
+                    encoded["actions"].append({"type": "pause", "duration": 0})
+        return {"actions": list(sources.values())}
+
+    def perform(self):
+        """Sends every step in one request and clears the builder"""
+        if not self.steps:
+            return
+        payload = self.build()
+        self.steps = []
+        self.driver.execute(Command.W3C_ACTIONS, payload)
+
@@ -0,0 +1,98 @@
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# What each subsystem imports; every entry is measured in a fresh interpreter
+SUBSYSTEMS = {
+    "core": ["framework.mobile.element", "framework.mobile.verify", "framework.mobile.wait",
+             "framework.mobile.device", "framework.init.base"],
+    "collection": ["conftest"],
+    "data": ["framework.readers.fileReader", "framework.readers.dataReader"],
+    "vision": ["framework.mobile.visual_diff", "framework.AI.template_matcher", "framework.AI.ocr"],
+    "unity": ["framework.init.alt_tester", "alttester"],
+    "airtest": ["airtest.core.api", "poco"],
+}
+
+# Budgets in milliseconds; core and collection are paid by every worker, the rest only on first use
+BUDGETS_MS = {"core": 500, "collection": 300}
+
+# Packages that belong to a lazily loaded subsystem and must not be pulled in by core or collection
+HEAVY_PACKAGES = {"pandas", "openpyxl", "cv2", "numpy", "PIL", "alttester", "airtest", "poco", "pytesseract"}
+EAGER_SUBSYSTEMS = ("core", "collection")
+
+_IMPORT_LINE = re.compile(r"import time:\s*(\d+)\s*\|\s*(\d+)\s*\|(\s*)(\S+)")
+
+
+def measure(module):
+    """
+    Imports a module in a fresh interpreter with -X importtime.
+
+    Returns:
+        tuple: (cumulative milliseconds or None when the import fails, set of top-level packages imported)
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        return None, set()
+    total_us = 0
+    packages = set()
+    started = False
+    for line in result.stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if not match:
+            continue
+        cumulative, indent, name = int(match.group(2)), match.group(3), match.group(4)
+        # Everything up to and including "site" is interpreter startup, paid by any python process
+        if not started:
+            started = name == "site" and len(indent) <= 1
+            continue
+        packages.add(name.split(".")[0])
+        if len(indent) <= 1:
+            total_us += cumulative
+    return total_us / 1000, packages
+
+
+def check(subsystems=None):
+    """
+    Measures every module of the given subsystems (default: all).
+
+    Returns:
+        list: (subsystem, module, milliseconds or None, heavy packages leaked into an eager subsystem)
+    """
+    results = []
+    for subsystem in subsystems or SUBSYSTEMS:
+        for module in SUBSYSTEMS[subsystem]:
+            ms, packages = measure(module)
+            leaked = sorted(packages & HEAVY_PACKAGES) if subsystem in EAGER_SUBSYSTEMS else []
+            results.append((subsystem, module, ms, leaked))
+    return results
+
+
+def report(subsystems=None):
+    """Prints the import-time report and returns the number of budget overruns and heavy-import leaks"""
+    problems = 0
+    for subsystem, module, ms, leaked in check(subsystems):
+        budget = BUDGETS_MS.get(subsystem)
+        timing = "not installed" if ms is None else f"{ms:7.0f} ms"
+        line = f"{subsystem:<10} {module:<35} {timing}"
+        if ms is not None and budget is not None and ms > budget:
+            line += f"  over budget ({budget} ms)"
+            problems += 1
+        if leaked:
+            line += f"  imports {', '.join(leaked)} eagerly"
+            problems += 1
+        print(line)
+    print(f"{problems} import budget problem(s)")
+    return problems
+
+
+if __name__ == "__main__":
+    # Usage: python -m framework.mobile.import_budget [--strict] [subsystems...]
+    arguments = sys.argv[1:]
+    strict = "--strict" in arguments
+    subsystems = [a for a in arguments if a != "--strict"]
+    count = report(subsystems or None)
+    sys.exit(1 if strict and count else 0)
@@ -0,0 +1,104 @@
+import json
+import os
+from types import MappingProxyType
+from typing import NamedTuple
+from appium.webdriver.common.appiumby import AppiumBy
+
+# Maps the "locator_type" used in the page JSON files to Appium strategies
+locator_map = {
+    'xpath': AppiumBy.XPATH,
+    'id': AppiumBy.ID,
+    'path': AppiumBy.XPATH,
+    'content': AppiumBy.ACCESSIBILITY_ID,
+    'uiautomator': AppiumBy.ANDROID_UIAUTOMATOR,
+    'class': AppiumBy.CLASS_NAME
+}
+
+
+class Locator(NamedTuple):
+    """A compiled locator, usable anywhere selenium expects a (By, value) tuple"""
+    by: str
+    value: str
+
+
+# Compiled locator files shared by Element, Verify and Wait: path -> (mtime_ns, locators)
+_registry = {}
+
+
+def compile_locators(raw_locators, file_path):
+    """
+    Validates the raw JSON entries of a locator file and turns them into Locator tuples.
+
+    Args:
+        raw_locators (dict): Parsed content of the locator file
+        file_path (str): Path of the file, used in error messages
+
+    Returns:
+        MappingProxyType: Read-only mapping of locator name to Locator
+
+    Raises:
+        ValueError: If any entry is malformed or uses an unsupported locator type
+    """
+    if not isinstance(raw_locators, dict):
+        raise ValueError(f"Locator file must contain a JSON object: {file_path}")
+
+    compiled = {}
+    for name, entry in raw_locators.items():
+        if not isinstance(entry, dict):
+            raise ValueError(f"Locator '{name}' in {file_path} must be an object")
+
+        locator_type = str(entry.get("locator_type") or "").lower()
+        if not locator_type:
+            raise ValueError(f"Locator type not specified for '{name}' in {file_path}")
+
+        by_type = locator_map.get(locator_type)
+        if not by_type:
+            raise ValueError(
+                f"Unsupported locator type: '{locator_type}' for '{name}' in {file_path}. "
+                f"Supported types are: {list(locator_map.keys())}")
+
+        locator_value = entry.get("locator")
+        if not locator_value:
+            raise ValueError(f"Locator value not specified for '{name}' in {file_path}")
+
+        compiled[name] = Locator(by_type, locator_value)
+    return MappingProxyType(compiled)
+
+
+def load_locators(file_path):
+    """
+    Returns the compiled locators of a JSON locator file.
+    Each file is parsed and validated once per process and again only when its mtime changes.
+
+    Raises:
+        FileNotFoundError: If the locator file does not exist
+        ValueError: If the file is not valid JSON or contains an invalid locator
+    """
+    path = os.path.abspath(str(file_path))
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        _registry.pop(path, None)
+        raise FileNotFoundError(f"Locator file not found: {file_path}")
+
+    cached = _registry.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            raw_locators = json.load(file)
+    except json.JSONDecodeError:
+        raise ValueError(f"Invalid JSON format in file: {file_path}")
+
+    locators = compile_locators(raw_locators, file_path)
+    _registry[path] = (mtime, locators)
+    return locators
+
+
+def get_locator(locators, locator_name):
+    """Looks up a compiled locator by name, raising ValueError if it is missing"""
+    locator = locators.get(locator_name)
+    if locator is None:
+        raise ValueError(f"Locator '{locator_name}' not found in the locators file.")
+    return locator
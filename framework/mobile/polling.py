@@ -0,0 +1,198 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from framework.mobile import profiler
+
+# Polling schedule (seconds): fast first polls that back off exponentially
+MIN_POLL = 0.05
+MAX_POLL = 0.5
+BACKOFF = 1.6
+# Never sleep longer than this before the first re-check, whatever the history says
+MAX_FIRST_DELAY = 2.0
+# Observations kept per locator
+HISTORY_SIZE = 50
+
+
+class LatencyHistogram:
+    """Rolling record of how long a locator took to satisfy its wait condition"""
+
+    def __init__(self, size=HISTORY_SIZE):
+        self._samples = deque(maxlen=size)
+
+    def record(self, seconds):
+        self._samples.append(seconds)
+
+    def percentile(self, pct):
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def __len__(self):
+        return len(self._samples)
+
+
+# Per-locator latency histograms shared by every wait in the process
+_histograms = {}
+_budget = threading.local()
+
+
+def get_histogram(key):
+    histogram = _histograms.get(key)
+    if histogram is None:
+        histogram = _histograms.setdefault(key, LatencyHistogram())
+    return histogram
+
+
+def remaining_budget():
+    """Seconds left in the innermost step_budget, or None when no budget is active"""
+    deadlines = getattr(_budget, "deadlines", None)
+    if not deadlines:
+        return None
+    return max(0.0, deadlines[-1] - time.monotonic())
+
+
+def clamp_to_budget(timeout):
+    """Returns (timeout clamped to the active step_budget, whether the budget was the limit)"""
+    budget = remaining_budget()
+    if budget is None or budget >= timeout:
+        return timeout, False
+    return budget, True
+
+
+@contextmanager
+def step_budget(seconds):
+    """
+    Caps the total time every wait inside the block may spend.
+
+    Usage:
+        with step_budget(15):
+            login.enter_phone_number()
+            login.tap_on_continue_button()
+    """
+    deadlines = getattr(_budget, "deadlines", None)
+    if deadlines is None:
+        deadlines = _budget.deadlines = []
+    deadline = time.monotonic() + seconds
+    # A nested budget can only shorten the outer one
+    if deadlines:
+        deadline = min(deadline, deadlines[-1])
+    deadlines.append(deadline)
+    try:
+        yield
+    finally:
+        deadlines.pop()
+
+
+class AdaptiveWait:
+    """
+    Drop-in replacement for selenium's WebDriverWait with adaptive polling.
+
+    Instead of a fixed 500 ms interval, it polls fast and backs off exponentially.
+    When a key (usually the Locator) is given, the first re-check is delayed according
+    to how long that locator has taken before, and the observed latency is recorded.
+    The timeout is clamped to the active step_budget.
+    """
+
+    def __init__(self, driver, timeout, key=None, ignored_exceptions=None):
+        self._driver = driver
+        self._timeout = float(timeout)
+        self._key = key
+        exceptions = [NoSuchElementException]
+        if ignored_exceptions:
+            try:
+                exceptions.extend(iter(ignored_exceptions))
+            except TypeError:
+                exceptions.append(ignored_exceptions)
+        self._ignored_exceptions = tuple(exceptions)
+
+    def _first_delay(self):
+        if self._key is None:
+            return MIN_POLL
+        histogram = _histograms.get(self._key)
+        if not histogram:
+            return MIN_POLL
+        # Sleep through the part of the wait where the element has never appeared so far
+        typical = histogram.percentile(25)
+        return min(max(typical, MIN_POLL), MAX_FIRST_DELAY)
+
+    def _poll(self, method, message, negate=False):
+        timeout, budget_limited = clamp_to_budget(self._timeout)
+        start = time.monotonic()
+        deadline = start + timeout
+        delay = self._first_delay()
+        next_delay = MIN_POLL
+        screen = stacktrace = None
+        attempts = 0
+        # When the previous check came back empty (seconds since start)
+        last_miss = None
+
+        while True:
+            try:
+                attempts += 1
+                value = method(self._driver)
+                if negate and not value:
+                    return value
+                if not negate and value:
+                    if self._key is not None:
+                        elapsed = time.monotonic() - start
+                        # After a miss the element appeared somewhere between the two checks; recording
+                        # the later check would include the first-delay sleep and ratchet p25 upwards
+                        latency = elapsed if last_miss is None else (last_miss + elapsed) / 2
+                        get_histogram(self._key).record(latency)
+                        profiler.record(self._key, elapsed, attempts, driver=self._driver)
+                    return value
+            except self._ignored_exceptions as exc:
+                if negate:
+                    return True
+                screen = getattr(exc, "screen", None)
+                stacktrace = getattr(exc, "stacktrace", None)
+
+            now = time.monotonic()
+            last_miss = now - start
+            if now >= deadline:
+                break
+            time.sleep(min(delay, deadline - now))
+            delay = next_delay
+            next_delay = min(next_delay * BACKOFF, MAX_POLL)
+
+        if self._key is not None and not negate:
+            profiler.record(self._key, time.monotonic() - start, attempts, found=False)
+        if budget_limited:
+            message = f"{message} (step time budget exhausted)" if message else "Step time budget exhausted"
+        raise TimeoutException(message, screen, stacktrace)
+
+    def until(self, method, message=""):
+        """Polls method(driver) until it returns a truthy value, then returns that value"""
+        return self._poll(method, message)
+
+    def until_not(self, method, message=""):
+        """Polls method(driver) until it returns a falsy value"""
+        return self._poll(method, message, negate=True)
+
+
+def wait_for_stable(driver, sample, timeout=10, quiet_period=0.5, message=""):
+    """
+    Waits until sample(driver) returns the same value for quiet_period seconds.
+    Used for page-source and screenshot stability; returns the stable value.
+    """
+    timeout, _ = clamp_to_budget(timeout)
+    deadline = time.monotonic() + timeout
+    previous = sample(driver)
+    stable_since = time.monotonic()
+    delay = MIN_POLL
+    while True:
+        now = time.monotonic()
+        if now - stable_since >= quiet_period:
+            return previous
+        if now >= deadline:
+            raise TimeoutException(message or f"Screen did not settle within {timeout} seconds")
+        time.sleep(min(delay, max(0.0, deadline - now)))
+        delay = min(delay * BACKOFF, MAX_POLL)
+        current = sample(driver)
+        if current != previous:
+            previous = current
+            stable_since = time.monotonic()
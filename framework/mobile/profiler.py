@@ -0,0 +1,311 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+from appium.webdriver.common.appiumby import AppiumBy
+from framework.mobile.locators import Locator, load_locators, locator_map
+from framework.mobile.prints import text_print
+from framework.mobile.snapshot import PageSnapshot, UnsupportedSnapshotQuery
+from framework.readers.jsonReader import get_config_reader
+
+# Relative cost of each strategy on UiAutomator2/XCUITest; lower is faster
+STRATEGY_COST = {
+    AppiumBy.ID: 0,
+    AppiumBy.ACCESSIBILITY_ID: 0,
+    AppiumBy.ANDROID_UIAUTOMATOR: 1,
+    AppiumBy.CLASS_NAME: 1,
+    AppiumBy.XPATH: 2,
+}
+
+# Appium strategy -> "locator_type" written in the page JSON files
+LOCATOR_TYPES = {
+    AppiumBy.ID: "id",
+    AppiumBy.ACCESSIBILITY_ID: "content",
+    AppiumBy.ANDROID_UIAUTOMATOR: "uiautomator",
+    AppiumBy.CLASS_NAME: "class",
+    AppiumBy.XPATH: "xpath",
+}
+
+
+class LocatorStats:
+    """Resolution time and retry counts of one locator"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.attempts = 0
+        self.timeouts = 0
+
+    def add(self, seconds, attempts, found):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.attempts += attempts
+        if not found:
+            self.timeouts += 1
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def retries(self):
+        """Average number of extra polls needed before the lookup succeeded"""
+        return max(0.0, self.attempts / self.count - 1) if self.count else 0.0
+
+    def to_dict(self):
+        return {"count": self.count, "total": self.total, "max": self.max,
+                "attempts": self.attempts, "timeouts": self.timeouts}
+
+    def merge(self, data):
+        self.count += data["count"]
+        self.total += data["total"]
+        self.max = max(self.max, data["max"])
+        self.attempts += data["attempts"]
+        self.timeouts += data["timeouts"]
+
+
+# Locator -> LocatorStats for every lookup made by this process
+_stats = {}
+# Locator -> page source captured the first time a slow locator resolved
+_sources = {}
+_lock = threading.Lock()
+_settings = None
+
+
+def _profile_settings():
+    global _settings
+    if _settings is None:
+        try:
+            _settings = get_config_reader().locator_profile
+        except (FileNotFoundError, ValueError):
+            _settings = {"enabled": False, "capture_page_source": False, "output_dir": "locator_profile"}
+    return _settings
+
+
+def record(locator, seconds, attempts=1, found=True, driver=None):
+    """
+    Records one lookup of locator; called by AdaptiveWait and Element._find_element.
+    When page-source capture is enabled, the screen is saved the first time an XPath resolves.
+    """
+    settings = _profile_settings()
+    # Only compiled locators are profiled; other wait keys (activities, OCR text, templates) are not lookups
+    if not settings["enabled"] or not isinstance(locator, Locator):
+        return
+    with _lock:
+        stats = _stats.get(locator)
+        if stats is None:
+            stats = _stats[locator] = LocatorStats()
+        stats.add(seconds, attempts, found)
+        capture = (found and driver is not None and settings["capture_page_source"]
+                   and STRATEGY_COST.get(locator.by, 0) > 0 and locator not in _sources)
+        if capture:
+            _sources[locator] = None  # claim it so concurrent lookups don't capture twice
+    if capture:
+        try:
+            _sources[locator] = driver.page_source
+        except Exception:
+            _sources.pop(locator, None)
+
+
+def get_stats():
+    with _lock:
+        return dict(_stats)
+
+
+def reset():
+    with _lock:
+        _stats.clear()
+        _sources.clear()
+
+
+def _source_name(locator):
+    return hashlib.sha1(f"{locator.by}|{locator.value}".encode("utf-8")).hexdigest()[:16] + ".xml"
+
+
+def dump_stats(output_dir=None):
+    """
+    Writes this process's stats (and captured page sources) to output_dir.
+    Every pytest process writes its own file, so farm and xdist workers never overwrite each other.
+
+    Returns:
+        Path: The stats file, or None when nothing was recorded
+    """
+    with _lock:
+        stats = dict(_stats)
+        sources = {locator: source for locator, source in _sources.items() if source}
+    if not stats:
+        return None
+
+    output_dir = Path(output_dir or _profile_settings()["output_dir"])
+    (output_dir / "sources").mkdir(parents=True, exist_ok=True)
+    entries = []
+    for locator, locator_stats in stats.items():
+        entry = {"by": locator.by, "value": locator.value, **locator_stats.to_dict()}
+        if locator in sources:
+            entry["page_source"] = _source_name(locator)
+            (output_dir / "sources" / entry["page_source"]).write_text(sources[locator], encoding="utf-8")
+        entries.append(entry)
+
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+    stats_path = output_dir / f"locator_stats_{worker}_{os.getpid()}.json"
+    with open(stats_path, "w", encoding="utf-8") as file:
+        json.dump(entries, file, indent=2)
+    return stats_path
+
+
+def load_stats(output_dir):
+    """Merges every stats file in output_dir; returns (Locator -> LocatorStats, Locator -> [source paths])"""
+    output_dir = Path(output_dir)
+    stats = {}
+    sources = {}
+    for stats_path in sorted(output_dir.glob("locator_stats_*.json")):
+        with open(stats_path, "r", encoding="utf-8") as file:
+            for entry in json.load(file):
+                locator = Locator(entry["by"], entry["value"])
+                stats.setdefault(locator, LocatorStats()).merge(entry)
+                if entry.get("page_source"):
+                    sources.setdefault(locator, []).append(output_dir / "sources" / entry["page_source"])
+    return stats, sources
+
+
+def _unique(snapshot, locator, node):
+    try:
+        return snapshot.find_all(locator) == [node]
+    except UnsupportedSnapshotQuery:
+        return False
+
+
+def _quote(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def suggest_faster_locator(snapshot, locator):
+    """
+    Finds a cheaper locator that matches exactly the same element in a page snapshot.
+
+    Args:
+        snapshot (PageSnapshot): A captured page source
+        locator (Locator): The locator currently used
+
+    Returns:
+        Locator: The suggested locator, or None when the element is not uniquely on this
+            screen or nothing cheaper identifies it
+    """
+    try:
+        matches = snapshot.find_all(locator)
+    except UnsupportedSnapshotQuery:
+        return None
+    if len(matches) != 1:
+        return None
+    node = matches[0]
+
+    candidates = []
+    if node.get("resource-id"):
+        candidates.append(Locator(AppiumBy.ID, node.get("resource-id")))
+    for attribute in ("content-desc", "name"):
+        if node.get(attribute):
+            candidates.append(Locator(AppiumBy.ACCESSIBILITY_ID, node.get(attribute)))
+    if node.get("resource-id") and node.get("text"):
+        # Android only: UiAutomator text lookups are still far cheaper than XPath
+        candidates.append(Locator(AppiumBy.ANDROID_UIAUTOMATOR, f'new UiSelector().text("{_quote(node.get("text"))}")'))
+
+    current_cost = STRATEGY_COST.get(locator.by, 0)
+    for candidate in candidates:
+        if STRATEGY_COST[candidate.by] < current_cost and _unique(snapshot, candidate, node):
+            return candidate
+    return None
+
+
+def _load_snapshots(paths):
+    snapshots = []
+    for path in paths:
+        try:
+            snapshots.append(PageSnapshot(Path(path).read_bytes()))
+        except Exception as e:
+            text_print(f"Skipping page source {path}: {e}", "yellow")
+    return snapshots
+
+
+def build_report(page_files, stats, sources=None, extra_sources=()):
+    """
+    Ranks the measured locators of every page JSON file, slowest first.
+
+    Returns:
+        dict: page file -> list of row dicts (name, locator, stats, suggestion)
+    """
+    sources = sources or {}
+    extra_snapshots = _load_snapshots(extra_sources)
+    report = {}
+    for page_file in page_files:
+        try:
+            locators = load_locators(page_file)
+        except (FileNotFoundError, ValueError) as e:
+            text_print(f"Skipping {page_file}: {e}", "yellow")
+            continue
+        rows = []
+        for name, locator in locators.items():
+            locator_stats = stats.get(locator)
+            if locator_stats is None:
+                continue
+            suggestion = None
+            if STRATEGY_COST.get(locator.by, 0) > 0:
+                for snapshot in _load_snapshots(sources.get(locator, [])) + extra_snapshots:
+                    suggestion = suggest_faster_locator(snapshot, locator)
+                    if suggestion:
+                        break
+            rows.append({"name": name, "locator": locator, "stats": locator_stats, "suggestion": suggestion})
+        rows.sort(key=lambda row: row["stats"].mean, reverse=True)
+        if rows:
+            report[page_file] = rows
+    return report
+
+
+def print_report(report, top=10):
+    if not report:
+        text_print("No locator timings recorded yet; run the tests first.", "yellow")
+        return
+    for page_file, rows in report.items():
+        text_print(f"\n📄 {page_file}", "cyan")
+        for row in rows[:top]:
+            locator, locator_stats = row["locator"], row["stats"]
+            color = "red" if STRATEGY_COST.get(locator.by, 0) > 1 else "green"
+            text_print(
+                f"  {row['name']:<35} {LOCATOR_TYPES.get(locator.by, locator.by):<12} "
+                f"mean {locator_stats.mean * 1000:8.1f} ms  max {locator_stats.max * 1000:8.1f} ms  "
+                f"lookups {locator_stats.count:<4} retries {locator_stats.retries:4.1f}  "
+                f"timeouts {locator_stats.timeouts}", color)
+            if row["suggestion"]:
+                suggestion = row["suggestion"]
+                text_print(
+                    f"      💡 use {{\"locator_type\": \"{LOCATOR_TYPES[suggestion.by]}\", "
+                    f"\"locator\": {json.dumps(suggestion.value)}}}", "yellow")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank the slowest locators and suggest faster strategies")
+    parser.add_argument("pages", nargs="*", default=["pages"], help="Page folders or locator JSON files")
+    parser.add_argument("--stats-dir", default=None, help="Folder with the locator_stats_*.json files")
+    parser.add_argument("--page-source", nargs="*", default=[], help="Extra page-source XML files to match against")
+    parser.add_argument("--top", type=int, default=10, help="Locators shown per page file")
+    args = parser.parse_args(argv)
+
+    page_files = []
+    for path in args.pages:
+        if os.path.isdir(path):
+            page_files.extend(sorted(glob.glob(os.path.join(path, "**", "*.json"), recursive=True)))
+        else:
+            page_files.append(path)
+
+    stats, sources = load_stats(args.stats_dir or _profile_settings()["output_dir"])
+    print_report(build_report(page_files, stats, sources, args.page_source), top=args.top)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+import ast
+import sys
+from pathlib import Path
+
+# Calls that pause unconditionally: Wait.wait_for_seconds, time.sleep and airtest's sleep
+SLEEP_CALLS = {"wait_for_seconds", "sleep"}
+DEFAULT_PATHS = ["pages", "framework", "test"]
+
+
+class _SleepFinder(ast.NodeVisitor):
+    """
+    Collects sleep calls, skipping the two places where sleeping is the point:
+    inside loops (polling between condition checks) and inside wait_for_seconds itself.
+    """
+
+    def __init__(self, file):
+        self.file = file
+        self.findings = []
+        self._functions = []
+        self._loops = 0
+
+    def visit_FunctionDef(self, node):
+        self._functions.append(node.name)
+        # A loop outside the function does not make the function body a polling loop
+        loops, self._loops = self._loops, 0
+        self.generic_visit(node)
+        self._loops = loops
+        self._functions.pop()
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_While(self, node):
+        self._loops += 1
+        self.generic_visit(node)
+        self._loops -= 1
+
+    visit_For = visit_While
+
+    def visit_Call(self, node):
+        func = node.func
+        name = func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", None)
+        in_wait_for_seconds = bool(self._functions) and self._functions[-1] == "wait_for_seconds"
+        if name in SLEEP_CALLS and not in_wait_for_seconds and (name == "wait_for_seconds" or not self._loops):
+            seconds = None
+            if node.args and isinstance(node.args[0], ast.Constant) and isinstance(node.args[0].value, (int, float)):
+                seconds = node.args[0].value
+            self.findings.append((self.file, node.lineno, name, seconds))
+        self.generic_visit(node)
+
+
+def find_hard_sleeps(paths=None):
+    """
+    Lists unconditional sleeps in the given files or folders.
+
+    Returns:
+        list: (file, line, call, seconds) tuples; seconds is None when not a literal
+    """
+    findings = []
+    for root in paths or DEFAULT_PATHS:
+        root = Path(root)
+        files = [root] if root.is_file() else sorted(root.rglob("*.py"))
+        for file in files:
+            try:
+                tree = ast.parse(file.read_text(encoding="utf-8"), filename=str(file))
+            except (SyntaxError, UnicodeDecodeError):
+                continue
+            finder = _SleepFinder(str(file))
+            finder.visit(tree)
+            findings.extend(sorted(finder.findings, key=lambda f: f[1]))
+    return findings
+
+
+def report(paths=None):
+    """Prints the lint report and returns the number of hard sleeps found"""
+    findings = find_hard_sleeps(paths)
+    total = 0.0
+    for file, line, name, seconds in findings:
+        print(f"{file}:{line}: {name}({seconds if seconds is not None else '?'})")
+        total += seconds or 0
+    print(f"{len(findings)} hard sleep(s), at least {total:g} s of fixed waiting per pass")
+    return len(findings)
+
+
+if __name__ == "__main__":
+    # Usage: python -m framework.mobile.sleep_lint [--strict] [paths...]
+    arguments = sys.argv[1:]
+    strict = "--strict" in arguments
+    paths = [a for a in arguments if a != "--strict"]
+    count = report(paths or None)
+    sys.exit(1 if strict and count else 0)
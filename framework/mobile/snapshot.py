@@ -0,0 +1,189 @@
+import re
+from collections import defaultdict
+from lxml import etree
+from appium.webdriver.common.appiumby import AppiumBy
+from framework.mobile.locators import get_locator
+
+# Attribute names differ between UiAutomator2 (Android) and XCUITest (iOS) page sources
+ID_ATTRIBUTES = ("resource-id", "name")
+ACCESSIBILITY_ATTRIBUTES = ("content-desc", "name", "accessibility-id")
+TEXT_ATTRIBUTES = ("text", "label", "value")
+CLASS_ATTRIBUTES = ("class", "type")
+VISIBLE_ATTRIBUTES = ("displayed", "visible")
+
+# new UiSelector().text("x").instance(2) -> [("text", "x"), ("instance", 2)]
+_UI_SELECTOR_CALL = re.compile(r'\.(\w+)\(\s*(?:"((?:[^"\\]|\\.)*)"|(\d+)|(true|false))?\s*\)')
+
+
+class UnsupportedSnapshotQuery(Exception):
+    """Raised when a locator cannot be answered from a page-source snapshot"""
+
+
+def parse_ui_selector(expression):
+    """
+    Parses a simple UiSelector chain into (method, argument) pairs.
+    Nested selectors (childSelector, fromParent) and UiScrollable are not supported.
+    """
+    expression = expression.strip()
+    if not expression.startswith("new UiSelector()") or "UiScrollable" in expression:
+        raise UnsupportedSnapshotQuery(f"Unsupported UiSelector expression: {expression}")
+    body = expression[len("new UiSelector()"):].rstrip(";")
+    calls = []
+    position = 0
+    for match in _UI_SELECTOR_CALL.finditer(body):
+        if match.start() != position:
+            break
+        method, text, number, flag = match.groups()
+        if text is not None:
+            argument = text.replace('\\"', '"')
+        elif number is not None:
+            argument = int(number)
+        elif flag is not None:
+            argument = flag == "true"
+        else:
+            argument = None
+        calls.append((method, argument))
+        position = match.end()
+    if position != len(body):
+        raise UnsupportedSnapshotQuery(f"Unsupported UiSelector expression: {expression}")
+    return calls
+
+
+def _attribute(node, names):
+    for name in names:
+        value = node.get(name)
+        if value is not None:
+            return value
+    return None
+
+
+_UI_SELECTOR_PREDICATES = {
+    "text": lambda node, arg: node.get("text") == arg,
+    "textContains": lambda node, arg: arg in (node.get("text") or ""),
+    "textStartsWith": lambda node, arg: (node.get("text") or "").startswith(arg),
+    "textMatches": lambda node, arg: re.fullmatch(arg, node.get("text") or "") is not None,
+    "resourceId": lambda node, arg: node.get("resource-id") == arg,
+    "resourceIdMatches": lambda node, arg: re.fullmatch(arg, node.get("resource-id") or "") is not None,
+    "description": lambda node, arg: node.get("content-desc") == arg,
+    "descriptionContains": lambda node, arg: arg in (node.get("content-desc") or ""),
+    "descriptionStartsWith": lambda node, arg: (node.get("content-desc") or "").startswith(arg),
+    "descriptionMatches": lambda node, arg: re.fullmatch(arg, node.get("content-desc") or "") is not None,
+    "className": lambda node, arg: (node.get("class") or node.tag) == arg,
+    "packageName": lambda node, arg: node.get("package") == arg,
+    "index": lambda node, arg: node.get("index") == str(arg),
+    "clickable": lambda node, arg: node.get("clickable") == str(arg).lower(),
+    "enabled": lambda node, arg: node.get("enabled") == str(arg).lower(),
+    "checked": lambda node, arg: node.get("checked") == str(arg).lower(),
+    "selected": lambda node, arg: node.get("selected") == str(arg).lower(),
+    "focused": lambda node, arg: node.get("focused") == str(arg).lower(),
+    "scrollable": lambda node, arg: node.get("scrollable") == str(arg).lower(),
+}
+
+
+class PageSnapshot:
+    """
+    One page_source fetch, parsed into an indexed in-memory tree.
+
+    Answers presence, visibility and text queries for many locators locally,
+    so a screen check costs a single round trip to the Appium server.
+
+    Usage:
+        snapshot = verify.snapshot()
+        snapshot.is_present('next_button')
+        snapshot.get_text('your_phone_number_title')
+    """
+
+    def __init__(self, page_source, locators=None):
+        if isinstance(page_source, str):
+            page_source = page_source.encode("utf-8")
+        parser = etree.XMLParser(huge_tree=True, recover=True)
+        self.root = etree.fromstring(page_source, parser=parser)
+        self.locators = locators or {}
+        self._nodes = [node for node in self.root.iter() if isinstance(node.tag, str)]
+        self._by_id = self._index(ID_ATTRIBUTES, short_ids=True)
+        self._by_accessibility_id = self._index(ACCESSIBILITY_ATTRIBUTES)
+        self._by_class = defaultdict(list)
+        for node in self._nodes:
+            for name in {node.tag, _attribute(node, CLASS_ATTRIBUTES)}:
+                if name:
+                    self._by_class[name].append(node)
+
+    @classmethod
+    def capture(cls, driver, locators=None):
+        """Fetches the page source once and builds the snapshot"""
+        return cls(driver.page_source, locators)
+
+    def _index(self, attributes, short_ids=False):
+        index = defaultdict(list)
+        for node in self._nodes:
+            for attribute in attributes:
+                value = node.get(attribute)
+                if not value:
+                    continue
+                index[value].append(node)
+                # UiAutomator2 accepts 'foo' for 'com.app:id/foo'
+                if short_ids and ":id/" in value:
+                    index[value.split(":id/", 1)[1]].append(node)
+        return index
+
+    def _resolve(self, locator):
+        if isinstance(locator, str):
+            return get_locator(self.locators, locator)
+        return locator
+
+    def find_all(self, locator):
+        """
+        Returns every node matching a locator name or (By, value) tuple.
+
+        Raises:
+            UnsupportedSnapshotQuery: If the strategy cannot be evaluated offline
+        """
+        by, value = self._resolve(locator)
+        if by == AppiumBy.XPATH:
+            return [node for node in self.root.xpath(value) if isinstance(node, etree._Element)]
+        if by == AppiumBy.ID:
+            return list(dict.fromkeys(self._by_id.get(value, [])))
+        if by == AppiumBy.ACCESSIBILITY_ID:
+            return list(dict.fromkeys(self._by_accessibility_id.get(value, [])))
+        if by == AppiumBy.CLASS_NAME:
+            return list(self._by_class.get(value, []))
+        if by == AppiumBy.ANDROID_UIAUTOMATOR:
+            return self._find_ui_selector(value)
+        raise UnsupportedSnapshotQuery(f"Locator strategy '{by}' is not supported by page snapshots")
+
+    def _find_ui_selector(self, expression):
+        instance = None
+        predicates = []
+        for method, argument in parse_ui_selector(expression):
+            if method == "instance":
+                instance = argument
+                continue
+            predicate = _UI_SELECTOR_PREDICATES.get(method)
+            if predicate is None:
+                raise UnsupportedSnapshotQuery(f"UiSelector.{method}() is not supported by page snapshots")
+            predicates.append((predicate, argument))
+        matches = [node for node in self._nodes if all(p(node, arg) for p, arg in predicates)]
+        if instance is not None:
+            return matches[instance:instance + 1]
+        return matches
+
+    def find(self, locator):
+        matches = self.find_all(locator)
+        return matches[0] if matches else None
+
+    def is_present(self, locator):
+        return self.find(locator) is not None
+
+    @staticmethod
+    def node_is_visible(node):
+        visible = _attribute(node, VISIBLE_ATTRIBUTES)
+        return visible is None or visible.lower() == "true"
+
+    def is_visible(self, locator):
+        return any(self.node_is_visible(node) for node in self.find_all(locator))
+
+    def get_text(self, locator):
+        node = self.find(locator)
+        if node is None:
+            return None
+        return _attribute(node, TEXT_ATTRIBUTES) or ""
@@ -1,11 +1,10 @@
 import time
-from selenium.webdriver.support.wait import WebDriverWait
+from framework.mobile.polling import AdaptiveWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
-from appium.webdriver.common.appiumby import AppiumBy
-import json
 from framework.mobile.prints import text_print
-from framework.init.base import locator_map
+from framework.mobile.locators import load_locators, get_locator
+from framework.mobile.snapshot import PageSnapshot
 class Verify:
     def __init__(self, driver, file_path):
         self.driver = driver
@@ -14,37 +13,69 @@ class Verify:
 
     def load_locators(self):
         """
-        Load locators from a JSON file.
+        Load the compiled locators of the JSON file from the shared locator registry.
         """
-        try:
-            with open(self.file_path, 'r') as file:
-                return json.load(file)
-        except FileNotFoundError:
-            raise FileNotFoundError(f"Locator file not found: {self.file_path}")
-        except json.JSONDecodeError:
-            raise ValueError(f"Invalid JSON format in file: {self.file_path}")
+        return load_locators(self.file_path)
+
+    def snapshot(self):
+        """
+        Fetches the page source once and returns a PageSnapshot bound to this page's locators,
+        for answering many presence/visibility/text checks without further round trips.
+        """
+        return PageSnapshot.capture(self.driver, self.locators)
+
+    def _wait_for_snapshot(self, locator_names, check, timeout):
+        """Polls page snapshots until check(snapshot, name) holds for every locator"""
+        for name in locator_names:
+            get_locator(self.locators, name)
+        missing = list(locator_names)
+
+        def all_match(driver):
+            snapshot = PageSnapshot.capture(driver, self.locators)
+            missing[:] = [name for name in locator_names if not check(snapshot, name)]
+            return snapshot if not missing else None
 
-    def element_visible(self, locator_name, timeout=10):
         try:
-            locator = self.locators.get(locator_name)
-            if not locator:
-                raise ValueError(f"Locator '{locator_name}' not found in locators file")
+            return AdaptiveWait(self.driver, timeout).until(all_match)
+        except TimeoutException:
+            raise TimeoutException(f"Elements {missing} not found after {timeout} seconds")
+
+    def elements_present(self, locator_names, timeout=10):
+        """
+        Verifies several elements are present using one page-source fetch per poll.
+
+        Args:
+            locator_names (list): Names of the locators in the JSON file
+            timeout (int): Maximum time to wait for all elements (default 10 seconds)
+
+        Returns:
+            PageSnapshot: The snapshot in which every element was present
+        """
+        snapshot = self._wait_for_snapshot(locator_names, PageSnapshot.is_present, timeout)
+        text_print(f"Elements {list(locator_names)} are present", "green")
+        return snapshot
 
-            locator_type = locator.get("locator_type", "").lower()
-            if not locator_type:
-                raise ValueError(f"Locator type not specified for '{locator_name}'")
+    def elements_visible(self, locator_names, timeout=10):
+        """
+        Verifies several elements are visible using one page-source fetch per poll.
 
-            by_type = locator_map.get(locator_type)
-            if not by_type:
-                raise ValueError(
-                    f"Unsupported locator type: '{locator_type}'. Supported types are: {list(locator_map.keys())}")
+        Args:
+            locator_names (list): Names of the locators in the JSON file
+            timeout (int): Maximum time to wait for all elements (default 10 seconds)
 
-            locator_value = locator.get("locator")
-            if not locator_value:
-                raise ValueError(f"Locator value not specified for '{locator_name}'")
+        Returns:
+            PageSnapshot: The snapshot in which every element was visible
+        """
+        snapshot = self._wait_for_snapshot(locator_names, PageSnapshot.is_visible, timeout)
+        text_print(f"Elements {list(locator_names)} are visible", "green")
+        return snapshot
 
-            WebDriverWait(self.driver, timeout).until(
-                EC.visibility_of_element_located((by_type, locator_value))
+    def element_visible(self, locator_name, timeout=10):
+        try:
+            locator = get_locator(self.locators, locator_name)
+
+            AdaptiveWait(self.driver, timeout, key=locator).until(
+                EC.visibility_of_element_located(locator)
             )
             text_print(f"Element '{locator_name}' is visible", "green")
             return True
@@ -53,25 +84,10 @@ class Verify:
 
     def element_not_visible(self, locator_name, timeout=10):
         try:
-            locator = self.locators.get(locator_name)
-            if not locator:
-                raise ValueError(f"Locator '{locator_name}' not found in locators file")
-
-            locator_type = locator.get("locator_type", "").lower()
-            if not locator_type:
-                raise ValueError(f"Locator type not specified for '{locator_name}'")
-
-            by_type = locator_map.get(locator_type)
-            if not by_type:
-                raise ValueError(
-                    f"Unsupported locator type: '{locator_type}'. Supported types are: {list(locator_map.keys())}")
-
-            locator_value = locator.get("locator")
-            if not locator_value:
-                raise ValueError(f"Locator value not specified for '{locator_name}'")
+            locator = get_locator(self.locators, locator_name)
     
-            WebDriverWait(self.driver, timeout).until(
-                EC.invisibility_of_element_located((by_type, locator_value))
+            AdaptiveWait(self.driver, timeout).until(
+                EC.invisibility_of_element_located(locator)
             )
             text_print(f"Element '{locator_name}' is not visible", "green")
             return True
@@ -98,25 +114,10 @@ class Verify:
             :param self:
         """
         try:
-            locator = self.locators.get(locator_name)
-            if not locator:
-                raise ValueError(f"Locator '{locator_name}' not found in locators file")
-
-            locator_type = locator.get("locator_type", "").lower()
-            if not locator_type:
-                raise ValueError(f"Locator type not specified for '{locator_name}'")
+            locator = get_locator(self.locators, locator_name)
 
-            by_type = locator_map.get(locator_type)
-            if not by_type:
-                raise ValueError(
-                    f"Unsupported locator type: '{locator_type}'. Supported types are: {list(locator_map.keys())}")
-
-            locator_value = locator.get("locator")
-            if not locator_value:
-                raise ValueError(f"Locator value not specified for '{locator_name}'")
-
-            WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located((by_type, locator_value))
+            AdaptiveWait(self.driver, timeout, key=locator).until(
+                EC.presence_of_element_located(locator)
             )
             text_print(f"Element '{locator_name}' is present", "green")
             return True
@@ -138,17 +139,11 @@ class Verify:
             bool: True if verification passes, False otherwise
         """
         try:
-            locator = self.locators.get(locator_name)
-            locator_type = locator.get("locator_type").lower()
-            locator_value = locator.get("locator")
-
-            by_type = locator_map.get(locator_type)
-            if not by_type:
-                raise ValueError(f"Unsupported locator type: {locator_type}")
+            locator = get_locator(self.locators, locator_name)
 
             # Wait for element to be present
-            element = WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located((by_type, locator_value))
+            element = AdaptiveWait(self.driver, timeout, key=locator).until(
+                EC.presence_of_element_located(locator)
             )
 
             # Get text from element
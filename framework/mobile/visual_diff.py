@@ -0,0 +1,156 @@
+from typing import NamedTuple
+import cv2
+import numpy as np
+
+# Tile edge in pixels; only tiles with changed pixels get an SSIM pass
+TILE_SIZE = 64
+# Per-pixel grey-level difference treated as encoder/antialiasing noise
+PIXEL_TOLERANCE = 8
+# Lowest SSIM any single changed tile may have; a local change (a missing button) fails the
+# comparison even when the area-weighted similarity of the whole screen stays above threshold
+TILE_FLOOR = 0.8
+# dhash grid; two screens with the same 16x16 gradient hash are taken as matching
+HASH_SIZE = 16
+
+# SSIM constants for 8-bit images (Wang et al. 2004)
+_C1 = (0.01 * 255) ** 2
+_C2 = (0.03 * 255) ** 2
+
+
+class DiffResult(NamedTuple):
+    """Outcome of a visual comparison"""
+    matches: bool
+    similarity: float        # area-weighted SSIM over the unmasked screen, 0.0 to 1.0
+    hash_distance: int       # dhash Hamming distance between the two images
+    changed_tiles: list      # (x, y, width, height) of every tile that differs
+    heatmap: object          # BGR image highlighting the differences, or None on a hash match
+
+
+def decode_image(data):
+    """Decodes PNG/JPEG bytes (or passes through an already decoded BGR array)"""
+    if isinstance(data, np.ndarray):
+        return data
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError("Image data could not be decoded")
+    return image
+
+
+def encode_png(image):
+    ok, buffer = cv2.imencode(".png", image)
+    if not ok:
+        raise ValueError("Image could not be encoded as PNG")
+    return buffer.tobytes()
+
+
+def dhash(gray, hash_size=HASH_SIZE):
+    """Difference hash: one bit per horizontal gradient on a hash_size grid"""
+    small = cv2.resize(gray, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int("".join("1" if bit else "0" for bit in bits), 2)
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+def build_mask(shape, ignore_regions=()):
+    """Boolean mask of the pixels that take part in the comparison"""
+    mask = np.ones(shape[:2], dtype=bool)
+    for x, y, width, height in ignore_regions or ():
+        mask[max(0, int(y)):max(0, int(y + height)), max(0, int(x)):max(0, int(x + width))] = False
+    return mask
+
+
+def ssim_map(a, b):
+    """Per-pixel SSIM of two greyscale images of the same size"""
+    a = a.astype(np.float32)
+    b = b.astype(np.float32)
+    blur = lambda image: cv2.GaussianBlur(image, (11, 11), 1.5)
+    mu_a, mu_b = blur(a), blur(b)
+    mu_a2, mu_b2, mu_ab = mu_a * mu_a, mu_b * mu_b, mu_a * mu_b
+    sigma_a2 = blur(a * a) - mu_a2
+    sigma_b2 = blur(b * b) - mu_b2
+    sigma_ab = blur(a * b) - mu_ab
+    return ((2 * mu_ab + _C1) * (2 * sigma_ab + _C2)) / ((mu_a2 + mu_b2 + _C1) * (sigma_a2 + sigma_b2 + _C2))
+
+
+def compare_images(current, baseline, threshold=0.95, ignore_regions=(), tile_size=TILE_SIZE,
+                   pixel_tolerance=PIXEL_TOLERANCE, tile_floor=TILE_FLOOR):
+    """
+    Compares two screenshots in memory.
+
+    The images are first compared by perceptual hash; an identical hash is an
+    immediate match. Otherwise the screen is cut into tiles, unchanged tiles
+    (no pixel differing by more than pixel_tolerance) count as identical, and
+    SSIM is computed only for the changed ones. The images match when the
+    area-weighted similarity reaches threshold and no changed tile falls below tile_floor.
+
+    Args:
+        current (bytes | np.ndarray): Current screenshot (PNG bytes or BGR image)
+        baseline (bytes | np.ndarray): Baseline screenshot; resized to the current size if needed
+        threshold (float): Minimum similarity for a match (0.0 to 1.0, default 0.95)
+        ignore_regions (list): (x, y, width, height) rectangles excluded from the comparison,
+            e.g. the status bar clock
+        tile_size (int): Tile edge in pixels
+        tile_floor (float): Minimum SSIM of every single tile (default TILE_FLOOR)
+
+    Returns:
+        DiffResult: Match flag, similarity, hash distance, changed tiles and heatmap
+    """
+    current = decode_image(current)
+    baseline = decode_image(baseline)
+    if baseline.shape[:2] != current.shape[:2]:
+        baseline = cv2.resize(baseline, (current.shape[1], current.shape[0]))
+
+    mask = build_mask(current.shape, ignore_regions)
+    current_gray = cv2.cvtColor(current, cv2.COLOR_BGR2GRAY)
+    baseline_gray = cv2.cvtColor(baseline, cv2.COLOR_BGR2GRAY)
+    # Masked pixels take the same value in both images so they never register as a change
+    current_gray[~mask] = 0
+    baseline_gray[~mask] = 0
+
+    distance = hamming(dhash(current_gray), dhash(baseline_gray))
+    if distance == 0 and np.array_equal(current_gray[::8, ::8], baseline_gray[::8, ::8]):
+        return DiffResult(True, 1.0, 0, [], None)
+
+    difference = cv2.absdiff(current_gray, baseline_gray)
+    height, width = current_gray.shape
+    heat = np.zeros((height, width), dtype=np.float32)
+    changed_tiles = []
+    weighted_score = 0.0
+    total_area = 0
+    worst_tile = 1.0
+    for y in range(0, height, tile_size):
+        for x in range(0, width, tile_size):
+            tile_mask = mask[y:y + tile_size, x:x + tile_size]
+            area = int(tile_mask.sum())
+            if area == 0:
+                continue
+            total_area += area
+            if difference[y:y + tile_size, x:x + tile_size].max() <= pixel_tolerance:
+                weighted_score += area
+                continue
+            tile_ssim = ssim_map(current_gray[y:y + tile_size, x:x + tile_size],
+                                 baseline_gray[y:y + tile_size, x:x + tile_size])
+            tile_score = float(tile_ssim[tile_mask].mean())
+            weighted_score += tile_score * area
+            worst_tile = min(worst_tile, tile_score)
+            heat[y:y + tile_size, x:x + tile_size] = np.clip(1.0 - tile_ssim, 0.0, 1.0) * tile_mask
+            changed_tiles.append((x, y, tile_ssim.shape[1], tile_ssim.shape[0]))
+
+    similarity = weighted_score / total_area if total_area else 1.0
+    matches = similarity >= threshold and worst_tile >= tile_floor
+    return DiffResult(matches, similarity, distance, changed_tiles,
+                      render_heatmap(current, heat, changed_tiles))
+
+
+def render_heatmap(image, heat, changed_tiles):
+    """Overlays the dissimilarity map on the current screenshot and outlines the changed tiles"""
+    colored = cv2.applyColorMap((heat * 255).astype(np.uint8), cv2.COLORMAP_JET)
+    overlay = image.copy()
+    changed = heat > 0
+    overlay[changed] = cv2.addWeighted(image, 0.4, colored, 0.6, 0)[changed]
+    for x, y, width, height in changed_tiles:
+        cv2.rectangle(overlay, (x, y), (x + width - 1, y + height - 1), (0, 0, 255), 2)
+    return overlay
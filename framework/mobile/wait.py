@@ -1,18 +1,10 @@
+import hashlib
 import time
-from selenium.webdriver.support.wait import WebDriverWait
+from framework.mobile.polling import AdaptiveWait, wait_for_stable
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
-from appium.webdriver.common.appiumby import AppiumBy
-import json
 from framework.mobile.prints import text_print
-locator_map = {
-            'xpath': AppiumBy.XPATH,
-            'id': AppiumBy.ID,
-            'path': AppiumBy.XPATH,
-            'content': AppiumBy.ACCESSIBILITY_ID,
-            'uiautomator':AppiumBy.ANDROID_UIAUTOMATOR,
-            'class': AppiumBy.CLASS_NAME
-}
+from framework.mobile.locators import load_locators, get_locator
 class Wait:
     def __init__(self, driver, file_path):
         self.driver = driver
@@ -20,45 +12,108 @@ class Wait:
         self.locators = self.load_locators()
 
     def load_locators(self):
-        try:
-            with open(self.file_path, 'r') as file:
-                return json.load(file)
-        except Exception as e:
-            print(f"Error loading locators from {self.file_path}: {str(e)}")
-            return {}
+        return load_locators(self.file_path)
 
 
     def wait_until_element_is_visible(self, locator_name):
         try:
-            locator = self.locators.get(locator_name)
-            if not locator:
-                raise ValueError(f"Locator '{locator_name}' not found in locators file")
-
-            locator_type = locator.get("locator_type", "").lower()
-            if not locator_type:
-                raise ValueError(f"Locator type not specified for '{locator_name}'")
-
-            by_type = locator_map.get(locator_type)
-            if not by_type:
-                raise ValueError(
-                    f"Unsupported locator type: '{locator_type}'. Supported types are: {list(locator_map.keys())}")
+            locator = get_locator(self.locators, locator_name)
 
-            locator_value = locator.get("locator")
-            if not locator_value:
-                raise ValueError(f"Locator value not specified for '{locator_name}'")
-
-            WebDriverWait(self.driver, 30).until(
-                EC.visibility_of_element_located((by_type, locator_value))
+            AdaptiveWait(self.driver, 30, key=locator).until(
+                EC.visibility_of_element_located(locator)
             )
         except TimeoutException:
             raise TimeoutException(f"Element '{locator_name}' not visible after 30 seconds")
         except ValueError as e:
             raise ValueError(str(e))
         
+    def wait_for_any_of(self, locator_names, timeout=30):
+        """
+        Waits until any one of several elements is visible.
+
+        Args:
+            locator_names (list): Names of the locators in the JSON file
+            timeout (int): Maximum time to wait (default 30 seconds)
+
+        Returns:
+            str: Name of the first locator that became visible
+        """
+        locators = [(name, get_locator(self.locators, name)) for name in locator_names]
+
+        def any_visible(driver):
+            for name, locator in locators:
+                # find_elements never raises for a missing element, so one pass costs one call per locator
+                if any(element.is_displayed() for element in driver.find_elements(*locator)):
+                    return name
+            return None
+
+        try:
+            found = AdaptiveWait(self.driver, timeout, key=tuple(locator_names)).until(any_visible)
+        except TimeoutException:
+            raise TimeoutException(f"None of {locator_names} visible after {timeout} seconds")
+        text_print(f"Element '{found}' is visible", "green")
+        return found
+
+    def wait_for_activity(self, activity, timeout=30):
+        """
+        Waits until the given Android activity is in the foreground.
+
+        Args:
+            activity (str): Activity name, e.g. '.MainActivity' or 'com.example.MainActivity'
+            timeout (int): Maximum time to wait (default 30 seconds)
+        """
+        def activity_is_current(driver):
+            current = driver.current_activity or ""
+            return bool(current) and (current == activity or current.endswith(activity))
+
+        try:
+            AdaptiveWait(self.driver, timeout, key=("activity", activity)).until(activity_is_current)
+        except TimeoutException:
+            raise TimeoutException(f"Activity '{activity}' not shown after {timeout} seconds")
+        text_print(f"Activity '{activity}' is in the foreground", "green")
+
+    def wait_for_page_source_stability(self, timeout=10, quiet_period=0.5):
+        """
+        Waits until the UI hierarchy stops changing (screen transitions, lists loading).
+
+        Args:
+            timeout (int): Maximum time to wait (default 10 seconds)
+            quiet_period (float): Seconds the page source must stay unchanged (default 0.5)
+        """
+        wait_for_stable(
+            self.driver,
+            lambda driver: hashlib.sha1(driver.page_source.encode("utf-8")).digest(),
+            timeout=timeout,
+            quiet_period=quiet_period,
+            message=f"Page source still changing after {timeout} seconds",
+        )
+        text_print("Page source is stable", "green")
+
+    def wait_for_ui_idle(self, timeout=10, quiet_period=0.5):
+        """
+        Waits until nothing moves on screen (animations, spinners, transitions).
+        Compares consecutive screenshots, so it also covers canvas/Unity content
+        that never shows up in the page source.
+
+        Args:
+            timeout (int): Maximum time to wait (default 10 seconds)
+            quiet_period (float): Seconds the screen must stay unchanged (default 0.5)
+        """
+        wait_for_stable(
+            self.driver,
+            lambda driver: hashlib.sha1(driver.get_screenshot_as_png()).digest(),
+            timeout=timeout,
+            quiet_period=quiet_period,
+            message=f"Screen still changing after {timeout} seconds",
+        )
+        text_print("UI is idle", "green")
+
     def wait_for_seconds(self, seconds):
         """
         Pauses the execution for the specified number of seconds.
-        
+        Prefer one of the condition-based waits above; remaining calls are listed by
+        python -m framework.mobile.sleep_lint.
+
         Args:
             seconds (int/float): The number of seconds to wait
         """
@@ -0,0 +1,135 @@
+import csv
+import itertools
+import os
+from pathlib import Path
+
+# Data files live in project_root/files, like the ones FileReader reads
+FILES_PATH = Path(__file__).parent.parent.parent / 'files'
+# Rows pandas parses at a time when streaming a CSV
+CSV_CHUNK_SIZE = 5000
+# "index/count": run only every count-th data row, starting at index (set by the device farm)
+DATA_SHARD_ENV = "DATA_SHARD"
+
+
+def resolve_data_file(file_name):
+    path = Path(file_name)
+    return path if path.is_absolute() else FILES_PATH / path
+
+
+def stream_csv_rows(file_path, chunk_size=CSV_CHUNK_SIZE):
+    """Yields the rows of a CSV file as dicts, parsing at most chunk_size rows at a time"""
+    import pandas as pd
+    with pd.read_csv(file_path, chunksize=chunk_size) as reader:
+        for chunk in reader:
+            # NaN (empty cell) becomes None so the rows read like the Excel ones
+            chunk = chunk.astype(object).where(chunk.notna(), None)
+            yield from chunk.to_dict("records")
+
+
+def stream_excel_rows(file_path, sheet_name=None, header_row=1):
+    """
+    Yields the rows below header_row of an Excel sheet as dicts keyed by the header.
+    The workbook is opened read-only, so only the current row is held in memory.
+    Rows without any value are skipped.
+    """
+    import openpyxl
+    wb = openpyxl.load_workbook(file_path, read_only=True)
+    try:
+        sheet = wb[sheet_name] if sheet_name else wb.worksheets[0]
+        rows = sheet.iter_rows(min_row=header_row, values_only=True)
+        headers = next(rows, None)
+        if headers is None:
+            return
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            yield {header: value for header, value in zip(headers, row) if header is not None}
+    finally:
+        wb.close()
+
+
+def stream_rows(file_name, sheet_name=None):
+    """
+    Yields the data rows of a CSV or Excel file lazily.
+
+    Args:
+        file_name (str): File name relative to the files folder, or an absolute path
+        sheet_name (str): Sheet of an Excel file (defaults to the first sheet)
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If the file is neither CSV nor Excel
+    """
+    file_path = resolve_data_file(file_name)
+    if not file_path.exists():
+        raise FileNotFoundError(f"Data file not found: {file_path}")
+    extension = file_path.suffix.lower()
+    if extension == '.csv':
+        return stream_csv_rows(file_path)
+    if extension in ('.xlsx', '.xlsm'):
+        return stream_excel_rows(file_path, sheet_name)
+    raise ValueError(f"Unsupported data file extension: {extension}")
+
+
+def count_rows(file_name, sheet_name=None):
+    """
+    Counts the data rows of a file without keeping them in memory.
+    CSV files are counted with the csv module, so collecting data-driven tests does not load pandas;
+    blank and whitespace-only lines are skipped, as pandas does.
+    """
+    file_path = resolve_data_file(file_name)
+    if file_path.suffix.lower() == '.csv' and file_path.exists():
+        with open(file_path, newline='', encoding='utf-8') as file:
+            reader = csv.reader(file)
+            if next(reader, None) is None:
+                return 0
+            return sum(1 for row in reader if row and not (len(row) == 1 and not row[0].strip()))
+    return sum(1 for _ in stream_rows(file_name, sheet_name))
+
+
+def get_data_shard():
+    """(index, count) from the DATA_SHARD environment variable, or None when rows are not sharded"""
+    raw = os.environ.get(DATA_SHARD_ENV)
+    if not raw:
+        return None
+    index, count = (int(part) for part in raw.split("/"))
+    return index, count
+
+
+class RowCursor:
+    """
+    Forward-only reader over the rows of one data file.
+
+    Parametrized tests ask for rows in increasing order, so each row is read once
+    and only the current position is kept. Asking for an earlier row re-opens the file.
+    """
+
+    def __init__(self, file_name, sheet_name=None):
+        self.file_name = file_name
+        self.sheet_name = sheet_name
+        self._rows = None
+        self._position = 0
+
+    def get(self, index):
+        if self._rows is None or index < self._position:
+            self._rows = stream_rows(self.file_name, self.sheet_name)
+            self._position = 0
+        row = next(itertools.islice(self._rows, index - self._position, None), None)
+        if row is None:
+            self._rows = None
+            raise IndexError(f"Row {index} not found in {self.file_name}")
+        self._position = index + 1
+        return row
+
+
+# One cursor per data file and sheet in each worker process
+_cursors = {}
+
+
+def get_data_row(file_name, index, sheet_name=None):
+    """Returns data row index (0-based, header not counted) through the worker's shared cursor"""
+    key = (str(resolve_data_file(file_name)), sheet_name)
+    cursor = _cursors.get(key)
+    if cursor is None:
+        cursor = _cursors[key] = RowCursor(file_name, sheet_name)
+    return cursor.get(index)
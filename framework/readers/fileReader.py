@@ -1,68 +1,299 @@
-import openpyxl
-import pandas as pd
+import atexit
+import os
+import tempfile
+import threading
 import re
 from pathlib import Path
 from framework.mobile.prints import text_print
-from openpyxl.utils import column_index_from_string
+
+# Parsed workbooks shared by every reader in the process: path -> (mtime_ns, {sheet name: rows})
+_workbook_cache = {}
+# Buffered Excel writes: path -> {sheet name: {cell name: value}}, applied by FileReader.flush_writes()
+_pending_excel_writes = {}
+_writes_lock = threading.Lock()
+# Parsed CSV files: path -> (mtime_ns, DataFrame); the cached frames are never modified in place
+_csv_cache = {}
+# CSV files with unflushed writes: path -> modified copy of the DataFrame
+_dirty_csv = {}
+
+
+def _load_workbook_values(excel_file_path):
+    """
+    Return {sheet name: list of row tuples} for a workbook.
+    The file is parsed once in read-only mode and again only when its mtime changes.
+    """
+    path = str(excel_file_path)
+    mtime = os.stat(path).st_mtime_ns
+    cached = _workbook_cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    import openpyxl
+    wb = openpyxl.load_workbook(path, read_only=True)
+    try:
+        sheets = {ws.title: [tuple(row) for row in ws.iter_rows(values_only=True)] for ws in wb.worksheets}
+    finally:
+        wb.close()
+    _workbook_cache[path] = (mtime, sheets)
+    return sheets
+
+
+def _load_csv(csv_path):
+    """
+    Return the DataFrame of a CSV file, including writes that are not flushed yet.
+    The file is parsed once (pandas infers a dtype per column) and again only when its mtime changes.
+    """
+    path = str(csv_path)
+    with _writes_lock:
+        dirty = _dirty_csv.get(path)
+    if dirty is not None:
+        return dirty
+
+    mtime = os.stat(path).st_mtime_ns
+    cached = _csv_cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    import pandas as pd
+    df = pd.read_csv(path)
+    _csv_cache[path] = (mtime, df)
+    return df
+
+
+def _set_csv_value(csv_path, row_index, column, value, positional=False):
+    """Applies one write to the in-memory copy of a CSV file; the file itself is written by flush_writes()"""
+    path = str(csv_path)
+    df = _load_csv(path)
+    with _writes_lock:
+        if path not in _dirty_csv:
+            _dirty_csv[path] = df.copy()
+        df = _dirty_csv[path]
+        column = df.columns[column] if positional else column
+        # A value of another type (e.g. text in a numeric column) would be coerced or rejected by pandas
+        if column in df.columns and df[column].dtype != object:
+            import pandas as pd
+            value_dtype = pd.Series([value]).dtype
+            if value_dtype != df[column].dtype and not (value_dtype.kind in "iub" and df[column].dtype.kind == "f"):
+                df[column] = df[column].astype(object)
+        df.at[row_index, column] = value
+
+
+def _parse_cell_name(cellname):
+    """'B2' -> (row 1, column 1), both 0-based"""
+    match = re.match(r"([A-Za-z]+)([0-9]+)", cellname)
+    if not match:
+        raise ValueError(f"Invalid cell name: {cellname}")
+    col_letters, row_number = match.groups()
+    from openpyxl.utils import column_index_from_string
+    try:
+        return int(row_number) - 1, column_index_from_string(col_letters) - 1
+    except ValueError:
+        raise ValueError(f"Invalid cell name format: {cellname}")
+
+
+def _cell_from_rows(rows, row_index, col_index):
+    """Value at 0-based (row, column) of a materialized sheet; empty cells are None, like openpyxl"""
+    if row_index < len(rows) and col_index < len(rows[row_index]):
+        return rows[row_index][col_index]
+    return None
+
 
 class FileReader:
     _base_files_path = Path(__file__).parent.parent.parent / 'files' # Assumes 'files' is at project root
 
+    @staticmethod
+    def _get_sheet_rows(excel_file_path, sheet_name):
+        """Materialized rows of a sheet, or None (with an error printed) if the file or sheet is missing"""
+        if not excel_file_path.exists():
+            text_print(f"Error: Excel file not found at {excel_file_path}")
+            return None
+        sheets = _load_workbook_values(excel_file_path)
+        if sheet_name not in sheets:
+            text_print(f"Error: Sheet '{sheet_name}' not found in {excel_file_path}. Available sheets: {list(sheets)}")
+            return None
+        return sheets[sheet_name]
+
+    @staticmethod
+    def _pending_value(excel_file_path, sheet_name, cell_name):
+        """(True, value) if the cell has a buffered write that is not flushed yet"""
+        with _writes_lock:
+            cells = _pending_excel_writes.get(str(excel_file_path), {}).get(sheet_name, {})
+            if cell_name.upper() in cells:
+                return True, cells[cell_name.upper()]
+        return False, None
+
     @staticmethod
     def get_cell_value_from_excel(file_name, sheet_name, cell_name):
         excel_file_path = FileReader._base_files_path / file_name
-        # print(f"[DEBUG] Excel file path being accessed for reading: {excel_file_path}") # Optional debug print
         try:
-            if not excel_file_path.exists():
-                text_print(f"Error: Excel file not found at {excel_file_path}")
-                return None
-            
-            wb = openpyxl.load_workbook(excel_file_path)
-            if sheet_name not in wb.sheetnames:
-                text_print(f"Error: Sheet '{sheet_name}' not found in {excel_file_path}. Available sheets: {wb.sheetnames}")
-                wb.close()
+            buffered, value = FileReader._pending_value(excel_file_path, sheet_name, cell_name)
+            if buffered:
+                return value
+
+            rows = FileReader._get_sheet_rows(excel_file_path, sheet_name)
+            if rows is None:
                 return None
-            
-            sheet = wb[sheet_name]
-            # openpyxl handles invalid cell names by raising a KeyError or similar, 
-            # so direct check might be redundant unless specific pre-validation is needed.
-            value = sheet[cell_name].value
-            wb.close()
-            return value
+            from openpyxl.utils.cell import column_index_from_string, coordinate_from_string
+            col_letters, row_number = coordinate_from_string(cell_name)
+            return _cell_from_rows(rows, row_number - 1, column_index_from_string(col_letters) - 1)
         except Exception as e:
             text_print(f"Error reading cell '{cell_name}' from sheet '{sheet_name}' in {excel_file_path}: {e}")
-            if 'wb' in locals() and wb is not None:
-                wb.close()
             return None
 
     @staticmethod
-    def set_cell_value_in_excel(file_name, sheet_name, cell_name, value_to_enter):
+    def get_range(file_name, sheet_name, cell_range):
+        """
+        Reads a block of cells from an Excel sheet in one go.
+
+        Args:
+            file_name (str): The name of the Excel file (relative to _base_files_path).
+            sheet_name (str): The sheet to read.
+            cell_range (str): Excel-style range (e.g., 'A1:C3').
+
+        Returns:
+            list or None: One list of values per row, or None if the file or sheet is missing.
+        """
         excel_file_path = FileReader._base_files_path / file_name
-        # print(f"[DEBUG] Excel file path being accessed for writing: {excel_file_path}") # Optional debug print
         try:
-            if not excel_file_path.exists():
-                text_print(f"Error: Excel file not found at {excel_file_path}. Cannot write value.")
-                return False
+            rows = FileReader._get_sheet_rows(excel_file_path, sheet_name)
+            if rows is None:
+                return None
+            from openpyxl.utils.cell import column_index_from_string, coordinate_from_string, range_boundaries
+            min_col, min_row, max_col, max_row = range_boundaries(cell_range)
+            values = [[_cell_from_rows(rows, r - 1, c - 1) for c in range(min_col, max_col + 1)]
+                      for r in range(min_row, max_row + 1)]
+            # Buffered writes win over what is on disk
+            with _writes_lock:
+                cells = dict(_pending_excel_writes.get(str(excel_file_path), {}).get(sheet_name, {}))
+            for cell, value in cells.items():
+                col_letters, row_number = coordinate_from_string(cell)
+                col = column_index_from_string(col_letters)
+                if min_row <= row_number <= max_row and min_col <= col <= max_col:
+                    values[row_number - min_row][col - min_col] = value
+            return values
+        except Exception as e:
+            text_print(f"Error reading range '{cell_range}' from sheet '{sheet_name}' in {excel_file_path}: {e}")
+            return None
 
-            wb = openpyxl.load_workbook(excel_file_path)
+    @staticmethod
+    def get_row_as_dict(file_name, sheet_name, row_number, header_row=1):
+        """
+        Reads one data row of an Excel sheet keyed by the header row.
 
-            if sheet_name not in wb.sheetnames:
-                text_print(f"Info: Sheet '{sheet_name}' not found in {excel_file_path}. Creating new sheet.")
-                sheet = wb.create_sheet(title=sheet_name)
-            else:
-                sheet = wb[sheet_name]
-            
-            sheet[cell_name] = value_to_enter
-            wb.save(excel_file_path)  # Save the changes to the workbook
-            wb.close()
-            text_print(f"Successfully wrote '{value_to_enter}' to cell '{cell_name}' in sheet '{sheet_name}' of {excel_file_path}")
-            return True
+        Args:
+            file_name (str): The name of the Excel file (relative to _base_files_path).
+            sheet_name (str): The sheet to read.
+            row_number (int): 1-based row number of the data row.
+            header_row (int): 1-based row number holding the column names. Defaults to 1.
+
+        Returns:
+            dict or None: Column name to value, or None if the file or sheet is missing.
+        """
+        excel_file_path = FileReader._base_files_path / file_name
+        rows = FileReader._get_sheet_rows(excel_file_path, sheet_name)
+        if rows is None:
+            return None
+        width = max((len(row) for row in rows), default=0)
+        if width == 0:
+            return {}
+        from openpyxl.utils import get_column_letter
+        last_column = get_column_letter(width)
+        block = FileReader.get_range(file_name, sheet_name, f"A{header_row}:{last_column}{header_row}")
+        values = FileReader.get_range(file_name, sheet_name, f"A{row_number}:{last_column}{row_number}")
+        return {header: value for header, value in zip(block[0], values[0]) if header is not None}
+
+    @staticmethod
+    def set_cell_value_in_excel(file_name, sheet_name, cell_name, value_to_enter):
+        """
+        Buffers a cell write; buffered writes are saved together by flush_writes(),
+        which the test session calls once after every test.
+        """
+        excel_file_path = FileReader._base_files_path / file_name
+        if not excel_file_path.exists():
+            text_print(f"Error: Excel file not found at {excel_file_path}. Cannot write value.")
+            return False
+        try:
+            from openpyxl.utils.cell import coordinate_from_string
+            coordinate_from_string(cell_name)
         except Exception as e:
             text_print(f"Error writing to cell '{cell_name}' in sheet '{sheet_name}' of {excel_file_path}: {e}")
-            if 'wb' in locals() and wb is not None:
-                wb.close()
             return False
 
+        with _writes_lock:
+            sheets = _pending_excel_writes.setdefault(str(excel_file_path), {})
+            sheets.setdefault(sheet_name, {})[cell_name.upper()] = value_to_enter
+        text_print(f"Buffered '{value_to_enter}' for cell '{cell_name}' in sheet '{sheet_name}' of {excel_file_path}")
+        return True
+
+    @staticmethod
+    def flush_writes():
+        """
+        Saves every buffered Excel and CSV write, writing each file once.
+
+        Returns:
+            bool: True if all files were saved
+        """
+        excel_saved = FileReader._flush_excel_writes()
+        csv_saved = FileReader._flush_csv_writes()
+        return excel_saved and csv_saved
+
+    @staticmethod
+    def _flush_csv_writes():
+        with _writes_lock:
+            pending = dict(_dirty_csv)
+            _dirty_csv.clear()
+
+        success = True
+        for csv_path, df in pending.items():
+            # Write next to the target and swap it in, so readers never see a half-written file
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(csv_path), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", newline="", encoding="utf-8") as temp_file:
+                    df.to_csv(temp_file, index=False)
+                os.chmod(temp_path, os.stat(csv_path).st_mode)  # mkstemp creates 0600 files
+                os.replace(temp_path, csv_path)
+                _csv_cache[csv_path] = (os.stat(csv_path).st_mtime_ns, df)
+                text_print(f"Successfully wrote buffered changes to {csv_path}")
+            except Exception as e:
+                text_print(f"Error writing buffered changes to CSV file {csv_path}: {e}")
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                _csv_cache.pop(csv_path, None)
+                success = False
+        return success
+
+    @staticmethod
+    def _flush_excel_writes():
+        with _writes_lock:
+            pending = dict(_pending_excel_writes)
+            _pending_excel_writes.clear()
+
+        success = True
+        for excel_file_path, sheets in pending.items():
+            wb = None
+            try:
+                import openpyxl
+                wb = openpyxl.load_workbook(excel_file_path)
+                for sheet_name, cells in sheets.items():
+                    if sheet_name not in wb.sheetnames:
+                        text_print(f"Info: Sheet '{sheet_name}' not found in {excel_file_path}. Creating new sheet.")
+                        sheet = wb.create_sheet(title=sheet_name)
+                    else:
+                        sheet = wb[sheet_name]
+                    for cell_name, value in cells.items():
+                        sheet[cell_name] = value
+                wb.save(excel_file_path)  # Save the changes to the workbook
+                cell_count = sum(len(cells) for cells in sheets.values())
+                text_print(f"Successfully wrote {cell_count} cell(s) to {excel_file_path}")
+            except Exception as e:
+                text_print(f"Error writing buffered cells to {excel_file_path}: {e}")
+                success = False
+            finally:
+                if wb is not None:
+                    wb.close()
+                _workbook_cache.pop(excel_file_path, None)
+        return success
+
         # df = pd.read_csv(csv_path)
         # text_print(f"CSV file found at {df}")
         # val = df.at[0, 'phone_number']
@@ -76,8 +307,7 @@ class FileReader:
             if not csv_path.exists():
                 text_print(f"Error: CSV file not found at {csv_path}")
                 return None
-            df = pd.read_csv(csv_path)
-            value = df.at[row_index, column_name]
+            value = _load_csv(csv_path).at[row_index, column_name]
             return str(value) if value is not None else None
         except Exception as e:
             text_print(f"Error reading CSV file: {e}")
@@ -103,20 +333,11 @@ class FileReader:
         file_path = FileReader._base_files_path / filename
 
         # Convert cell reference like "B2" → row 1, column 1
-        match = re.match(r"([A-Za-z]+)([0-9]+)", cellname)
-        if not match:
-            raise ValueError(f"Invalid cell name: {cellname}")
+        row_index, col_index = _parse_cell_name(cellname)
 
-        col_letters, row_number = match.groups()
         try:
-            col_index = column_index_from_string(col_letters) - 1  # 0-based
-            row_index = int(row_number) - 1  # 0-based
-        except ValueError:
-             raise ValueError(f"Invalid cell name format: {cellname}")
-
-        try:
-            # Read CSV
-            df = pd.read_csv(file_path)
+            # Served from the in-memory dataset
+            df = _load_csv(file_path)
 
             # Safely return value if it exists
             if row_index < len(df.index) and col_index < len(df.columns):
@@ -151,17 +372,10 @@ class FileReader:
         filepath = FileReader._base_files_path / filename
 
         # Convert cell reference like "B2" → row 1, column 1
-        match = re.match(r"([A-Za-z]+)([0-9]+)", cellname)
-        if not match:
-            raise ValueError(f"Invalid cell name: {cellname}")
-
-        col_letters, row_number = match.groups()
-        col_index = column_index_from_string(col_letters) - 1  # 0-based
-        row_index = int(row_number) - 1  # 0-based
+        row_index, col_index = _parse_cell_name(cellname)
 
         try:
-            # Read CSV
-            df = pd.read_csv(filepath)
+            df = _load_csv(filepath)
 
             # Check if row and column are within bounds
             if row_index >= len(df.index) or col_index >= len(df.columns):
@@ -169,11 +383,8 @@ class FileReader:
                  # For now, raising an error for out of bounds write
                  raise ValueError(f"Cell {cellname} is out of bounds for CSV file {filename}")
 
-            # Update the value
-            df.iat[row_index, col_index] = value
-
-            # Write the modified DataFrame back to CSV
-            df.to_csv(filepath, index=False)
+            # Update the in-memory dataset; the file is rewritten once by flush_writes()
+            _set_csv_value(filepath, row_index, col_index, value, positional=True)
 
         except FileNotFoundError:
             raise FileNotFoundError(f"CSV file not found: {filepath}")
@@ -187,14 +398,62 @@ class FileReader:
             if not csv_path.exists():
                 text_print(f"Error: CSV file not found at {csv_path}")
                 return False
-            df = pd.read_csv(csv_path)
-            df.at[row_index, column_name] = value_to_enter
-            df.to_csv(csv_path, index=False)
-            text_print(f"Updated {column_name} at row {row_index} to '{new_value}' in {file_name}")
+            _set_csv_value(csv_path, row_index, column_name, value_to_enter)
+            text_print(f"Updated {column_name} at row {row_index} to '{value_to_enter}' in {file_name}")
             return True
         except Exception as e:
             text_print(f"Error writing to CSV file: {e}")
-            return False# Example usage (optional, for testing directly in this file):
+            return False
+
+    @staticmethod
+    def get_csv_row(file_name, row_index):
+        """
+        Reads one data row of a CSV file.
+
+        Args:
+            file_name (str): The name of the CSV file (relative to _base_files_path).
+            row_index (int): 0-based index of the data row (the header is not counted).
+
+        Returns:
+            dict: Column name to value.
+
+        Raises:
+            FileNotFoundError: If the specified file does not exist.
+            IndexError: If the row does not exist.
+        """
+        csv_path = FileReader._base_files_path / file_name
+        if not csv_path.exists():
+            raise FileNotFoundError(f"CSV file not found: {csv_path}")
+        df = _load_csv(csv_path)
+        if not 0 <= row_index < len(df.index):
+            raise IndexError(f"Row {row_index} is out of bounds for CSV file {file_name} ({len(df.index)} rows)")
+        return df.iloc[row_index].to_dict()
+
+    @staticmethod
+    def get_csv_column(file_name, column_name):
+        """
+        Reads every value of one CSV column.
+
+        Raises:
+            FileNotFoundError: If the specified file does not exist.
+            KeyError: If the column does not exist.
+        """
+        csv_path = FileReader._base_files_path / file_name
+        if not csv_path.exists():
+            raise FileNotFoundError(f"CSV file not found: {csv_path}")
+        df = _load_csv(csv_path)
+        if column_name not in df.columns:
+            raise KeyError(f"Column '{column_name}' not found in {file_name}. Available columns: {list(df.columns)}")
+        return df[column_name].tolist()
+
+    @staticmethod
+    def get_csv_row_count(file_name):
+        """Number of data rows in a CSV file (the header is not counted)"""
+        csv_path = FileReader._base_files_path / file_name
+        if not csv_path.exists():
+            raise FileNotFoundError(f"CSV file not found: {csv_path}")
+        return len(_load_csv(csv_path).index)
 
 
-        
\ No newline at end of file
+# Writes buffered outside a pytest session (plain scripts) still reach the disk
+atexit.register(FileReader.flush_writes)
@@ -1,24 +1,124 @@
 import json
-# D:\\Projects\\python-mobile\\config\\TestConfig.json
+import os
+from pathlib import Path
+
+# Default location of the framework configuration (project_root/config/TestConfig.json)
+CONFIG_PATH = Path(__file__).resolve().parent.parent.parent / "config" / "TestConfig.json"
+
+# Parsed config files shared by every reader in the process: path -> (mtime_ns, config)
+_config_cache = {}
+
+
+def _load_cached(file_path):
+    """
+    Return the parsed JSON for file_path.
+    The file is only opened and parsed again when its mtime changes.
+    """
+    path = str(file_path)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        _config_cache.pop(path, None)
+        raise FileNotFoundError(f"Config file not found at: {path}")
+
+    cached = _config_cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    try:
+        with open(path, 'r') as file:
+            config = json.load(file)
+    except json.JSONDecodeError:
+        raise ValueError(f"Invalid JSON format in config file: {path}")
+
+    _config_cache[path] = (mtime, config)
+    return config
+
+
 class ConfigReader:
     def __init__(self, file_path):
         self.file_path = file_path
-        self.config = self._read_config()
+        # Parse eagerly so a missing or broken file fails at construction time
+        self._read_config()
 
     def _read_config(self):
-        """Read and parse the JSON config file"""
-        try:
-            with open(self.file_path, 'r') as file:
-                return json.load(file)
-        except FileNotFoundError:
-            raise FileNotFoundError(f"Config file not found at: {self.file_path}")
-        except json.JSONDecodeError:
-            raise ValueError(f"Invalid JSON format in config file: {self.file_path}")
+        """Read and parse the JSON config file (served from the process-wide cache)"""
+        return _load_cached(self.file_path)
+
+    @property
+    def config(self):
+        """The parsed config, reloaded only when the file changes on disk"""
+        return self._read_config()
 
     def get_config(self):
         """Get the complete config"""
         return self.config
 
+    def get_setting(self, key, default=None):
+        """Get a value from the top-level 'config' section"""
+        return self.config.get("config", {}).get(key, default)
+
+    @property
+    def hightlight_element(self):
+        """Whether elements are highlighted in a screenshot before they are tapped"""
+        return bool(self.get_setting("hightlight_element", False))
+
+    @property
+    def report(self):
+        """Whether an Allure report is generated after the run"""
+        return bool(self.get_setting("report", False))
+
+    @property
+    def session_pool(self):
+        """Session pool settings: enabled, max_uses (tests per session) and reset strategy"""
+        settings = self.get_setting("session_pool", {}) or {}
+        return {
+            "enabled": bool(settings.get("enabled", False)),
+            "max_uses": int(settings.get("max_uses", 20)),
+            "reset": settings.get("reset", "restart"),
+        }
+
+    @property
+    def locator_profile(self):
+        """Locator profiler settings: enabled, capture_page_source (for XPath advice) and output_dir"""
+        settings = self.get_setting("locator_profile", {}) or {}
+        return {
+            "enabled": bool(settings.get("enabled", False)),
+            "capture_page_source": bool(settings.get("capture_page_source", False)),
+            "output_dir": settings.get("output_dir", "locator_profile"),
+        }
+
+    @property
+    def command_timeline(self):
+        """Per-test WebDriver command timeline settings: enabled and attach_to_allure (waterfall)"""
+        settings = self.get_setting("command_timeline", {}) or {}
+        return {
+            "enabled": bool(settings.get("enabled", True)),
+            "attach_to_allure": bool(settings.get("attach_to_allure", True)),
+        }
+
+    @property
+    def http_pool(self):
+        """Command executor HTTP settings: pool_size, keep_alive, gzip, retries (idempotent commands) and timeout"""
+        settings = self.get_setting("http_pool", {}) or {}
+        timeout = settings.get("timeout")
+        return {
+            "pool_size": int(settings.get("pool_size", 4)),
+            "keep_alive": bool(settings.get("keep_alive", True)),
+            "gzip": bool(settings.get("gzip", True)),
+            "retries": int(settings.get("retries", 2)),
+            "timeout": int(timeout) if timeout else None,
+        }
+
+    @property
+    def cassette(self):
+        """Session record/replay settings: mode (off, record or replay) and dir (see framework/init/cassette.py)"""
+        settings = self.get_setting("cassette", {}) or {}
+        return {
+            "mode": str(settings.get("mode", "off")),
+            "dir": settings.get("dir", "cassettes"),
+        }
+
     def get_platform_config(self, platform=None):
         """
         Get platform-specific configuration
@@ -43,6 +143,17 @@ class ConfigReader:
         except Exception as e:
             raise ValueError(f"Error getting platform config: {str(e)}")
 
+    def get_devices(self, platform=None):
+        """
+        Get the devices/emulators of a platform for device-farm runs.
+        Falls back to the single deviceName when no 'devices' list is configured.
+        """
+        platform_config = self.get_platform_config(platform)
+        devices = platform_config.get("devices") or []
+        if not devices:
+            devices = [{"deviceName": platform_config.get("deviceName")}]
+        return devices
+
     def get_run_platform(self):
         """Get the current run platform from config"""
         return self.config.get("run")
@@ -50,4 +161,19 @@ class ConfigReader:
     def get_capabilities(self, platform=None):
         """Get capabilities for specific platform"""
         platform_config = self.get_platform_config(platform)
-        return platform_config.get("capabilities", {})
\ No newline at end of file
+        return platform_config.get("capabilities", {})
+
+
+# Shared reader for the default TestConfig.json
+_default_reader = None
+
+
+def get_config_reader():
+    """
+    Get the process-wide ConfigReader for config/TestConfig.json.
+    The file is parsed once per process and re-read only when its mtime changes.
+    """
+    global _default_reader
+    if _default_reader is None:
+        _default_reader = ConfigReader(str(CONFIG_PATH))
+    return _default_reader
@@ -1,6 +1,5 @@
-import time
-
-from alttester import By, AltReversePortForwarding
+from alttester import By
+from framework.init.alt_tester import get_alt_tester_connection
 from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.support import expected_conditions as ec
 
@@ -49,15 +48,14 @@ def verify_element_contains(alt_driver, locator_type, locator_value, wait, expec
     print(f"Parameter: '{expected_text}' is found in the element located by {locator_type}.")
 
 def access_appium_drive():
+    # No-op when native access is already active
     print("Port forwarding to native element")
-    AltReversePortForwarding.remove_reverse_port_forwarding_android()
-    print("Port forwarded to native element")
+    get_alt_tester_connection().use_native()
 
-def access_alt_tester_drive():
-    time.sleep(15)
+def access_alt_tester_drive(timeout=60):
+    # Returns as soon as the game answers on the AltTester port (no-op when already connected)
     print("Reverse port forwarding android")
-    AltReversePortForwarding.reverse_port_forwarding_android()
-    print("Port Reversed to unity element")
+    return get_alt_tester_connection().use_unity(timeout)
 
 
 
@@ -21,10 +21,10 @@ class LoginPage:
         self.device.get_device_battery_level()
         #self.device.rotate_device('LANDSCAPE')
         self.element.start_screen_recording(quality='medium')
-        self.element.take_element_screenshot('splash_screen_next_button','splash_screen_next_button.png')
-        self.element.take_full_screenshot('home_screen_full.png')
+        self.element.take_element_screenshot('splash_screen_next_button','splash_screen_next_button.png',
+                                             update_baseline=True)
+        self.element.take_full_screenshot('home_screen_full.png', update_baseline=True)
         self.element.compare_full_screenshots('home_screen_full.png')
-        self.element.compare_full_screenshots('splash_screen_next_button.png')
         self.element.compare_element_screenshots('splash_screen_next_button','splash_screen_next_button.png')
         self.element.tap_on_element('splash_screen_next_button')
         self.element.take_element_screenshot('get_started_button', 'get_started_button.png')
@@ -43,11 +43,13 @@ class LoginPage:
         self.element.multi_tap('next_button', 2)
         self.element.get_text('your_phone_number_title')
         self.verify.element_present('your_phone_number_title')
-        self.element.long_press_element('phone_number_textbox', duration=5000)
-        self.element.enter_text('phone_number_textbox', '9876543210')
-        self.element.clear_text('phone_number_textbox')
+        # The phone number box is resolved once for the whole chain
+        with self.element.cached_elements():
+            self.element.long_press_element('phone_number_textbox', duration=5000)
+            self.element.enter_text('phone_number_textbox', '9876543210')
+            self.element.clear_text('phone_number_textbox')
         self.element.enter_text_from_file(locator_name='phone_number_textbox', file_name='fill-test-data.csv', cell_reference='A1', sheet_name = '')
-        self.wait.wait_for_seconds(5)
+        self.wait.wait_for_page_source_stability()
         self.element.clear_and_enter_text('phone_number_textbox', '9876543210')
 
     def tap_on_next_button(self):
@@ -22,7 +22,7 @@ class LoginPage:
         self.element.enter_text('first_textbox','10')
         self.element.enter_text('second_textbox', '20')
         self.element.tap_on_element('sum_button')
-        self.element.take_element_screenshot('sum_value','sum_value.png')
+        self.element.take_element_screenshot('sum_value','sum_value.png', update_baseline=True)
         #self.element.take_full_screenshot('home_screen_full.png')
         self.element.compare_full_screenshots('home_screen_full.png')
         self.element.compare_element_screenshots('sum_value','sum_value.png')
@@ -21,7 +21,8 @@ class LoginPage:
         self.element.tap_on_element('continue_text_ui_button',20)
 
     def enter_password(self):
-        self.wait.wait_for_seconds(5)
+        # The password screen reuses the EditText locator, so wait for its own button first
+        self.wait.wait_for_any_of(['login_with_password_button'], timeout=10)
         self.element.tap_on_element('password_textbox',5)
         self.element.enter_text('password_textbox','QA123456')
 
@@ -29,6 +30,4 @@ class LoginPage:
         self.element.tap_on_element('login_with_password_button')
 
     def verify_a_user_logged_in_successfully(self):
-        self.wait.wait_for_seconds(5)
-        self.verify.element_visible('profile_name')
-        self.wait.wait_for_seconds(10)
\ No newline at end of file
+        self.verify.element_visible('profile_name', timeout=15)
\ No newline at end of file
@@ -2,77 +2,99 @@
 __author__ = "UNITY_105"
 
 import pytest
-from airtest.core.api import *
-from airtest.cli.parser import cli_setup
+from pathlib import Path
+from framework.AI.template_matcher import TemplateMatcher, TemplateSpec
+from framework.mobile.polling import AdaptiveWait
+
+# Templates recorded with AirtestIDE on a 1080x2400 screen; loaded and scaled once per resolution
+TEMPLATES = {
+    "facebook_login_button": TemplateSpec("tpl1738847569050.png", (0.026, 0.481), (1080, 2400)),
+    "google_login_button": TemplateSpec("tpl1738847577568.png", (0.031, 0.654), (1080, 2400)),
+    "sign_in_button": TemplateSpec("tpl1738847595911.png", (0.003, 0.989), (1080, 2400)),
+    "google_login_button_tap": TemplateSpec("tpl1738847648178.png", (0.028, 0.654), (1080, 2400)),
+    "google_email": TemplateSpec("tpl1738847697875.png", (-0.11, 0.526), (1080, 2400)),
+    "email_id": TemplateSpec("tpl1738847711778.png", (-0.072, 0.524), (1080, 2400)),
+    "burger_menu": TemplateSpec("tpl1738847783748.png", (-0.444, -0.956), (1080, 2400)),
+    "username_in_slider": TemplateSpec("tpl1738847798223.png", (-0.077, -0.892), (1080, 2400)),
+    "settings_button": TemplateSpec("tpl1738847862492.png", (-0.263, 0.924), (1080, 2400)),
+    "logout_button": TemplateSpec("tpl1738847880490.png", (-0.015, 0.305), (1080, 2400)),
+    "google_login_after_logout": TemplateSpec("tpl1738847908114.png", (0.008, 0.654), (1080, 2400)),
+}
+matcher = TemplateMatcher(TEMPLATES, Path(__file__).resolve().parents[2] / "test" / "login_with_google")
+
 
 class LogInWithGoogle:
 
+    def _snapshot(self):
+        from airtest.core.helper import G
+        return G.DEVICE.snapshot()
+
+    def _assert_exists(self, *names, msg=""):
+        """Checks every template against a single screenshot"""
+        matches = matcher.find_all(self._snapshot(), names)
+        missing = [name for name, match in matches.items() if match is None]
+        assert not missing, f"{msg} (not found: {', '.join(missing)})"
+        return matches
+
+    def _wait(self, name, timeout=20):
+        from airtest.core.helper import G
+        return AdaptiveWait(G.DEVICE, timeout, key=("template", name)).until(
+            lambda device: matcher.find(device.snapshot(), name),
+            f"Template '{name}' not found within {timeout} seconds")
+
+    def _touch(self, name, timeout=20):
+        from airtest.core.api import touch
+        touch(self._wait(name, timeout).center)
 
+    def verify_login_options(self):
+        self._assert_exists("facebook_login_button", "google_login_button", "sign_in_button",
+                            msg="Verify: 'Facebook', 'Google' and 'Sign In' login buttons displayed.")
 
     def verify_facebook_login_button(self):
-        assert_exists(
-                Template(r"../../test/login_with_google/tpl1738847569050.png", record_pos=(0.026, 0.481), resolution=(1080, 2400)),
-                "Verify: 'Facebook' login button displayed.")
+        self._assert_exists("facebook_login_button", msg="Verify: 'Facebook' login button displayed.")
 
-    
     def verify_google_login_button(self):
-        assert_exists(
-            Template(r"tpl1738847577568.png", record_pos=(0.031, 0.654), resolution=(1080, 2400)),
-            "Verify: 'Google' login button displayed."
-        )
+        self._assert_exists("google_login_button", msg="Verify: 'Google' login button displayed.")
 
     def verify_sign_in_button(self):
-        assert_exists(
-            Template(r"tpl1738847595911.png", record_pos=(0.003, 0.989), resolution=(1080, 2400)),
-            "Verify: 'Sign In' login button displayed."
-        )
+        self._assert_exists("sign_in_button", msg="Verify: 'Sign In' login button displayed.")
 
     def click_google_login_button(self):
-        touch(Template(r"tpl1738847648178.png", record_pos=(0.028, 0.654), resolution=(1080, 2400)))
+        self._touch("google_login_button_tap")
 
     def wait_for_google_email(self):
-        wait(Template(r"tpl1738847697875.png", record_pos=(-0.11, 0.526), resolution=(1080, 2400)), 
-             timeout=60, interval=3)
+        self._wait("google_email", timeout=60)
 
     def verify_google_email_present(self):
-        assert_exists(
-            Template(r"tpl1738847697875.png", record_pos=(-0.11, 0.526), resolution=(1080, 2400)),
-            "Verify: Google email ID in present on the screen"
-        )
+        self._assert_exists("google_email", msg="Verify: Google email ID in present on the screen")
 
     def click_email_id(self):
-        touch(Template(r"tpl1738847711778.png", record_pos=(-0.072, 0.524), resolution=(1080, 2400)))
+        self._touch("email_id")
         print("Tapped on login email ID ")
 
     def wait_for_burger_menu(self):
-        wait(Template(r"tpl1738847783748.png", record_pos=(-0.444, -0.956), resolution=(1080, 2400)), 
-             timeout=60, interval=3)
+        self._wait("burger_menu", timeout=60)
 
     def click_burger_menu(self):
-        touch(Template(r"tpl1738847783748.png", record_pos=(-0.444, -0.956), resolution=(1080, 2400)))
+        self._touch("burger_menu")
         print("Tapped on burger menu ")
 
     def verify_username_in_slider(self):
-        assert_exists(
-            Template(r"tpl1738847798223.png", record_pos=(-0.077, -0.892), resolution=(1080, 2400)),
-            "Verify: User name in slider"
-        )
+        self._assert_exists("username_in_slider", msg="Verify: User name in slider")
 
     def click_settings_button(self):
-        touch(Template(r"tpl1738847862492.png", record_pos=(-0.263, 0.924), resolution=(1080, 2400)))
+        self._touch("settings_button")
         print("Tapped on setting button")
 
     def click_logout_button(self):
-        touch(Template(r"tpl1738847880490.png", record_pos=(-0.015, 0.305), resolution=(1080, 2400)))
+        self._touch("logout_button")
         print("Tapped on logout button")
-        sleep(3.0)
 
     def verify_google_login_after_logout(self):
-        wait(Template(r"tpl1738847908114.png", record_pos=(0.008, 0.654), resolution=(1080, 2400)))
-        assert_exists(
-            Template(r"tpl1738847908114.png", record_pos=(0.008, 0.654), resolution=(1080, 2400)),
-            "Verify: Google login button is displayed after logout"
-        )
+        # Waits for the logged-out screen instead of a fixed pause after tapping logout
+        self._wait("google_login_after_logout", timeout=30)
+        self._assert_exists("google_login_after_logout",
+                            msg="Verify: Google login button is displayed after logout")
 
 
 
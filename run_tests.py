@@ -1,10 +1,11 @@
-import json
 import subprocess
 import os
 import sys
 import platform
 import psutil
 import argparse
+from framework.readers.jsonReader import CONFIG_PATH, get_config_reader
+from framework.init.device_farm import DeviceFarm
 # import webbrowser
 
 
@@ -13,8 +14,9 @@ parser = argparse.ArgumentParser(description="Run pytest with optional Allure re
 parser.add_argument(
     "--test-file",
     type=str,
+    nargs="+",
     required=True,
-    help="Path to the test file to run (e.g., test/demo_simple_test/login/test_login.py)"
+    help="Path(s) to the test files or folders to run (e.g., test/demo_simple_test/login/test_login.py)"
 )
 parser.add_argument(
     "-m", "--marker",
@@ -22,33 +24,50 @@ parser.add_argument(
     required=False,
     help="Pytest marker to filter tests (e.g., smokey, regression)"
 )
+parser.add_argument(
+    "--farm",
+    action="store_true",
+    help="Run in parallel on every device listed under 'devices' in the config (one worker per device)"
+)
+parser.add_argument(
+    "--shard-data",
+    action="store_true",
+    help="With --farm, split the rows of data-driven tests across the devices instead of splitting test files"
+)
 args = parser.parse_args()
 TEST_FILE = args.test_file
 MARKER = args.marker
-CONFIG_PATH = "config/TestConfig.json"
+FARM = args.farm
+SHARD_DATA = args.shard_data
 RESULTS_DIR = "results"
 REPORT_DIR = "reports/allure"
 
 
 def load_config():
-    if not os.path.exists(CONFIG_PATH):
+    try:
+        return get_config_reader()
+    except FileNotFoundError:
         print(f"❌ Config file '{CONFIG_PATH}' not found.")
         sys.exit(1)
-    with open(CONFIG_PATH) as f:
-        return json.load(f)
 
 def run_tests(use_allure: bool):
     print("📦 Running tests...")
     print(f"✅ TEST_FILE: {TEST_FILE}")
-    cmd = ["pytest", TEST_FILE]
+    cmd = ["pytest", *TEST_FILE]
     if MARKER:
         print(f"✅ Using marker: {MARKER}")
-        cmd = ["pytest", "-m", MARKER, TEST_FILE]
+        cmd = ["pytest", "-m", MARKER, *TEST_FILE]
     if use_allure:
         print(f"✅ RESULTS_DIR: {RESULTS_DIR}")
         cmd += ["--alluredir", RESULTS_DIR]
     print(f"✅ Allure cmd: {cmd}")
-    subprocess.run(cmd)
+    return subprocess.run(cmd).returncode
+
+def run_tests_on_farm(config, use_allure: bool):
+    devices = config.get_devices()
+    print(f"📱 Device farm: {len(devices)} device(s)")
+    farm = DeviceFarm(devices, results_dir=RESULTS_DIR, marker=MARKER, use_allure=use_allure, shard_data=SHARD_DATA)
+    return farm.run(TEST_FILE)
 
 def detect_terminal():
     # On Windows, COMSPEC is usually set
@@ -127,14 +146,20 @@ def generate_allure_report():
 
 def main():
     config = load_config()
-    use_allure = config["config"].get("report", False)
+    use_allure = config.report
     print(f"✅ use_allure: {use_allure}")
-    run_tests(use_allure)
+    if FARM:
+        exit_code = run_tests_on_farm(config, use_allure)
+    else:
+        exit_code = run_tests(use_allure)
 
     if use_allure:
         generate_allure_report()
         print(f"✅ Allure report generated at: http://127.0.0.1:5500/reports/allure/index.html")
         #webbrowser.open(f"{REPORT_DIR}/index.html")
 
+    # The report is generated either way; the exit code still tells CI whether the tests passed
+    sys.exit(exit_code)
+
 if __name__ == "__main__":
     main()
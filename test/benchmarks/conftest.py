@@ -0,0 +1,59 @@
+"""
+Framework overhead benchmarks against the local fake Appium server (no device needed).
+
+    pytest test/benchmarks --benchmark-autosave              # store this commit's numbers
+    pytest test/benchmarks --benchmark-compare --benchmark-compare-fail=mean:15%
+
+The server answers instantly by default, so the numbers are pure framework cost
+(HTTP client, waits, locator handling, image work). BENCH_LATENCY=0.05 adds a fixed
+per-command delay to see how the framework behaves against a slow device.
+"""
+import os
+from pathlib import Path
+import pytest
+from appium import webdriver
+from appium.options.common import AppiumOptions
+from framework.init.command_executor import build_connection, get_command_timeline
+from framework.init.fake_appium import FakeAppiumServer
+
+BENCH_DIR = Path(__file__).parent
+SCREENS = BENCH_DIR / "fake_screens.json"
+
+
+@pytest.fixture(scope="session")
+def fake_server():
+    server = FakeAppiumServer(SCREENS, latency=float(os.environ.get("BENCH_LATENCY", "0")))
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture(scope="session")
+def driver(fake_server):
+    options = AppiumOptions()
+    options.set_capability("platformName", "Android")
+    options.set_capability("automationName", "UiAutomator2")
+    executor = build_connection(fake_server.url)
+    driver = webdriver.Remote(command_executor=executor, options=options)
+    yield driver
+    driver.quit()
+
+
+@pytest.fixture(autouse=True)
+def bench_state(fake_server, tmp_path, monkeypatch):
+    # Captures, baselines and diffs of one benchmark stay in its own folder
+    monkeypatch.chdir(tmp_path)
+    fake_server.reset()
+    get_command_timeline().start()
+    yield
+
+
+@pytest.fixture
+def commands_per_round(fake_server, benchmark):
+    """Call with the number of rounds after the benchmark; stores HTTP commands per action in the results"""
+    start = fake_server.commands
+
+    def record(rounds):
+        benchmark.extra_info["commands_per_round"] = round((fake_server.commands - start) / max(rounds, 1), 2)
+
+    return record
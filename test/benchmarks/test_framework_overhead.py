@@ -0,0 +1,78 @@
+from pathlib import Path
+import pytest
+from framework.init.base import DriverFactory
+from framework.mobile.element import Element
+from framework.mobile.verify import Verify
+
+LOCATORS = str(Path(__file__).parent / "bench_locators.json")
+ROUNDS = 50
+
+
+@pytest.fixture
+def element(driver):
+    return Element(driver, LOCATORS)
+
+
+@pytest.fixture
+def verify(driver):
+    return Verify(driver, LOCATORS)
+
+
+def test_tap_on_element(benchmark, fake_server, element, commands_per_round):
+    benchmark.pedantic(element.tap_on_element, args=("next_button",),
+                       setup=lambda: fake_server.reset("login"), rounds=ROUNDS)
+    commands_per_round(ROUNDS)
+    assert fake_server.screen.name == "pin"
+
+
+def test_enter_text(benchmark, fake_server, element, commands_per_round):
+    benchmark.pedantic(element.enter_text, args=("phone_number_textbox", "9876543210"),
+                       setup=fake_server.reset, rounds=ROUNDS)
+    commands_per_round(ROUNDS)
+    assert element.get_text("phone_number_textbox") == "9876543210"
+
+
+def test_element_visible(benchmark, verify, commands_per_round):
+    benchmark.pedantic(verify.element_visible, args=("your_phone_number_title",), rounds=ROUNDS)
+    commands_per_round(ROUNDS)
+
+
+def test_elements_present_snapshot(benchmark, verify, commands_per_round):
+    names = ["your_phone_number_title", "phone_number_textbox", "next_button"]
+    benchmark.pedantic(verify.elements_present, args=(names,), rounds=ROUNDS)
+    commands_per_round(ROUNDS)
+
+
+def test_scroll_until_visible(benchmark, fake_server, element, commands_per_round):
+    # The target appears after two scrolls; timeout=0 checks once per scroll
+    benchmark.pedantic(element.scroll_until_visible, args=("settings_item",), kwargs={"timeout": 0},
+                       setup=lambda: fake_server.reset("list_1"), rounds=ROUNDS)
+    commands_per_round(ROUNDS)
+
+
+def test_compare_element_screenshots(benchmark, element, commands_per_round):
+    element.take_element_screenshot("next_button", "next_button.png", update_baseline=True)
+    result = benchmark.pedantic(element.compare_element_screenshots, args=("next_button", "next_button.png"),
+                                rounds=ROUNDS)
+    commands_per_round(ROUNDS)
+    assert result
+
+
+def test_compare_full_screenshots(benchmark, element, commands_per_round):
+    element.take_full_screenshot("login.png", update_baseline=True)
+    result = benchmark.pedantic(element.compare_full_screenshots, args=("login.png",), rounds=ROUNDS)
+    commands_per_round(ROUNDS)
+    assert result
+
+
+def test_driver_factory_session(benchmark, fake_server, monkeypatch, commands_per_round):
+    monkeypatch.setenv("APPIUM_SERVER_URL", fake_server.url)
+
+    def new_session():
+        factory = DriverFactory()
+        # An installed package instead of an .apk, so no app file is needed
+        factory.app = "org.simple.clinic.staging"
+        factory.init_driver().quit()
+
+    benchmark.pedantic(new_session, rounds=ROUNDS // 5)
+    commands_per_round(ROUNDS // 5)
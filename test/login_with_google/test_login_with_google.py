@@ -18,9 +18,7 @@ def poco_driver():
 @pytest.mark.login
 def test_verify_login_functionality(poco_driver):
     login = LogInWithGoogle()
-    login.verify_facebook_login_button()
-    login.verify_google_login_button()
-    login.verify_sign_in_button()
+    login.verify_login_options()
     login.click_google_login_button()
     login.wait_for_google_email()
     login.verify_google_email_present()
@@ -1,23 +1,14 @@
-from PIL import Image, ImageDraw
-import io
-import os
 from datetime import datetime
+from framework.mobile.artifacts import get_artifact_pipeline
 
 def highlight_element(driver, element, label="tap"):
-    location = element.location
-    size = element.size
+    # One round trip for location and size
+    rect = element.rect
 
-    screenshot = driver.get_screenshot_as_png()
-    image = Image.open(io.BytesIO(screenshot))
-
-    draw = ImageDraw.Draw(image)
-    draw.rectangle(
-        [location["x"], location["y"], location["x"] + size["width"], location["y"] + size["height"]],
-        outline="red", width=5
-    )
+    screenshot = driver.get_screenshot_as_base64()
 
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"screenshots/{label}_{timestamp}.png"
-    os.makedirs("screenshots", exist_ok=True)
-    image.save(filename)
-    print(f"📸 Highlighted screenshot saved to {filename}")
+    # Decoding, drawing and PNG encoding happen on the artifact writer threads
+    get_artifact_pipeline().save_highlighted_screenshot(screenshot, rect, filename)
+    print(f"📸 Highlighted screenshot queued for {filename}")